@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of SkymelECGraphNodeForExternalApiCall against the bundled local stub backend.
+
+Drives N concurrent graph executions, each graph holding one external API call node, and reports executions per
+second, latency percentiles and the number of connections the stub backend saw opened. Runs offline and, with a
+fixed --seed, reproducibly, so pooling, batching and retry changes can be compared run against run.
+
+Examples:
+    python benchmark_external_api.py --mode http --concurrency 64 --executions 5000
+    python benchmark_external_api.py --mode websocket --latency-distribution lognormal --latency-jitter-ms 20
+    python benchmark_external_api.py --mode websocket --persistent-websocket --concurrency 64
+    python benchmark_external_api.py --mode http --request-batching --error-rate 0.05 --max-retries 2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+
+from skymel import (
+    SkymelECGraph,
+    SkymelECGraphNodeForExternalApiCall,
+    SkymelApiStubBackend,
+    SkymelHttpClientPool,
+    SkymelWebSocketConnectionManager
+)
+
+MODE_TO_ENDPOINT_PATH = {'http': '/json', 'sse': '/sse', 'websocket': '/ws'}
+
+
+def make_api_call_node_config(arguments, base_url: str) -> dict:
+    """Build the configuration of the benchmarked external API call node."""
+    node_config = {
+        'nodeId': 'stub',
+        'nodeInputNames': ['external.value', 'external.attachment'],
+        'nodeOutputNames': ['echo'],
+        'nodeSubroutine': 'process_data',
+        'endpointUrl': base_url + MODE_TO_ENDPOINT_PATH[arguments.mode],
+        'isEndpointWebSocketUrl': arguments.mode == 'websocket',
+        'nodeInputNameToBackendInputNameMap': {'external.value': 'value', 'external.attachment': 'attachment'},
+        'maxRetries': arguments.max_retries,
+        'retryDelay': 0.01,
+        'requestTimeout': 30.0
+    }
+    if arguments.mode == 'websocket':
+        # The stub backend answers failed WebSocket messages with an error reply instead of an HTTP status
+        node_config['webSocketErrorKey'] = 'error'
+        node_config['usePersistentWebSocketConnection'] = arguments.persistent_websocket
+    if arguments.mode == 'sse':
+        node_config['streamResponseConfig'] = {'format': 'sse'}
+    if arguments.request_batching:
+        node_config['requestBatchingConfig'] = {'maxBatchSize': arguments.max_batch_size, 'maxBatchWaitMs': 2.0}
+    if arguments.warm_up:
+        node_config['warmUpConfig'] = {'connectionCount': arguments.concurrency}
+    return node_config
+
+
+def make_graph(arguments, base_url: str, graph_index: int) -> SkymelECGraph:
+    """Build one graph holding the benchmarked node."""
+    graph = SkymelECGraph({'graphId': f"benchmark_{graph_index}",
+                           'externalInputNames': ['external.value', 'external.attachment']})
+    graph.add_node(SkymelECGraphNodeForExternalApiCall(make_api_call_node_config(arguments, base_url)))
+    return graph
+
+
+def get_percentile(sorted_values: list, percentile: float) -> float:
+    """Get the nearest-rank percentile of sorted values."""
+    if len(sorted_values) == 0:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(percentile / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_benchmark(arguments) -> dict:
+    """Run the benchmark and return its report."""
+    stub_backend = SkymelApiStubBackend(
+        latency_distribution=arguments.latency_distribution,
+        latency_ms=arguments.latency_ms,
+        latency_jitter_ms=arguments.latency_jitter_ms,
+        error_rate=arguments.error_rate,
+        response_payload_bytes=arguments.response_bytes,
+        seed=arguments.seed
+    )
+    base_url = await stub_backend.start()
+    attachment = 'a' * arguments.request_bytes
+
+    graphs = [make_graph(arguments, base_url, graph_index) for graph_index in range(arguments.concurrency)]
+    next_execution_index = 0
+    latencies_ms = []
+    failed_execution_count = 0
+
+    async def run_worker(graph: SkymelECGraph):
+        nonlocal next_execution_index, failed_execution_count
+        while next_execution_index < arguments.executions:
+            execution_index = next_execution_index
+            next_execution_index += 1
+            start_time = time.perf_counter()
+            succeeded = await graph.execute_graph({'externalInputNamesToValuesDict': {
+                'external.value': execution_index, 'external.attachment': attachment}})
+            latencies_ms.append((time.perf_counter() - start_time) * 1000)
+            if not succeeded:
+                failed_execution_count += 1
+
+    try:
+        if arguments.warm_up:
+            await asyncio.gather(*[graph.warm_up() for graph in graphs])
+        start_time = time.perf_counter()
+        await asyncio.gather(*[run_worker(graph) for graph in graphs])
+        elapsed_seconds = time.perf_counter() - start_time
+    finally:
+        await SkymelHttpClientPool.close_process_wide_pool()
+        await SkymelWebSocketConnectionManager.close_process_wide_manager()
+        await stub_backend.stop()
+
+    latencies_ms.sort()
+    stub_statistics = stub_backend.get_stub_statistics()
+    return {
+        'mode': arguments.mode,
+        'concurrency': arguments.concurrency,
+        'executions': len(latencies_ms),
+        'failed_executions': failed_execution_count,
+        'elapsed_seconds': round(elapsed_seconds, 3),
+        'executions_per_second': round(len(latencies_ms) / elapsed_seconds, 1) if elapsed_seconds > 0 else 0,
+        'latency_p50_ms': round(get_percentile(latencies_ms, 50), 2),
+        'latency_p95_ms': round(get_percentile(latencies_ms, 95), 2),
+        'latency_p99_ms': round(get_percentile(latencies_ms, 99), 2),
+        'backend_requests': stub_statistics['request_count'],
+        'backend_errors': stub_statistics['error_count'],
+        'connections_opened': stub_statistics['connection_count']
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=sorted(MODE_TO_ENDPOINT_PATH), default='http')
+    parser.add_argument('--concurrency', type=int, default=32, help='Number of concurrently executing graphs')
+    parser.add_argument('--executions', type=int, default=2000, help='Total number of graph executions')
+    parser.add_argument('--latency-distribution', choices=SkymelApiStubBackend.LATENCY_DISTRIBUTIONS,
+                        default='constant')
+    parser.add_argument('--latency-ms', type=float, default=10.0, help='Typical stub backend latency')
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0, help='Spread of the stub backend latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of an injected backend error')
+    parser.add_argument('--request-bytes', type=int, default=0, help='Size of the attachment sent with each request')
+    parser.add_argument('--response-bytes', type=int, default=0, help='Size of the padding of each reply')
+    parser.add_argument('--max-retries', type=int, default=0)
+    parser.add_argument('--persistent-websocket', action='store_true',
+                        help='Multiplex WebSocket calls over one persistent connection per endpoint')
+    parser.add_argument('--request-batching', action='store_true', help='Batch concurrent calls into one request')
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--warm-up', action='store_true', help='Warm up the graphs before timing executions')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the stub backend latencies and errors')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(run_benchmark(parse_arguments())), indent=2))
@@ -12,7 +12,26 @@ from .skymelEcGraph import SkymelECGraph
 from .skymelECGraphNode import SkymelECGraphNode
 from .skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
 from .skymelECGraphNodeForExternalApiCall import SkymelECGraphNodeForExternalApiCall
+from .skymelECGraphNodeForFusedDataProcessing import SkymelECGraphNodeForFusedDataProcessing
 from .skymelExecutionGraphLoader import SkymelExecutionGraphLoader
+from .skymelECGraphResourceLimiter import SkymelECGraphResourceLimiter
+from .skymelECGraphNodeExecutionPolicy import SkymelECGraphNodeExecutionPolicy
+from .skymelECGraphNodeHedgingPolicy import SkymelECGraphNodeHedgingPolicy, SkymelECGraphNodeHedgeBudget
+from .skymelECGraphMicroBatcher import SkymelECGraphMicroBatcher
+from .skymelECGraphNodeInputSchema import SkymelECGraphNodeInputSchema
+from .skymelHttpClientPool import SkymelHttpClientPool
+from .skymelWebSocketConnectionManager import SkymelWebSocketConnectionManager
+from .skymelApiCallSingleFlight import SkymelApiCallSingleFlight
+from .skymelApiResponseCache import SkymelApiResponseCache
+from .skymelApiEndpointRateLimiter import SkymelApiEndpointRateLimiter
+from .skymelApiCircuitBreaker import SkymelApiCircuitBreaker
+from .skymelApiPayloadSerializer import SkymelApiPayloadSerializer
+from .skymelApiProtobufCodec import SkymelApiProtobufCodec
+from .skymelApiRetryBudget import SkymelApiRetryBudget
+from .skymelTokenRatioBudget import SkymelTokenRatioBudget
+from .skymelApiStubBackend import SkymelApiStubBackend
+from .skymelApiEndpointMetrics import SkymelApiEndpointMetrics
+from .skymelApiCallError import SkymelApiCallError, SkymelApiCircuitOpenError
 
 # Utility classes
 from .skymelECGraphUtils import SkymelECGraphUtils
@@ -27,7 +46,28 @@ __all__ = [
     'SkymelECGraphNode',
     'SkymelECGraphNodeForDataProcessing',
     'SkymelECGraphNodeForExternalApiCall',
+    'SkymelECGraphNodeForFusedDataProcessing',
     'SkymelExecutionGraphLoader',
+    'SkymelECGraphResourceLimiter',
+    'SkymelECGraphNodeExecutionPolicy',
+    'SkymelECGraphNodeHedgingPolicy',
+    'SkymelECGraphNodeHedgeBudget',
+    'SkymelECGraphMicroBatcher',
+    'SkymelECGraphNodeInputSchema',
+    'SkymelHttpClientPool',
+    'SkymelWebSocketConnectionManager',
+    'SkymelApiCallSingleFlight',
+    'SkymelApiResponseCache',
+    'SkymelApiEndpointRateLimiter',
+    'SkymelApiCircuitBreaker',
+    'SkymelApiPayloadSerializer',
+    'SkymelApiProtobufCodec',
+    'SkymelApiRetryBudget',
+    'SkymelTokenRatioBudget',
+    'SkymelApiStubBackend',
+    'SkymelApiEndpointMetrics',
+    'SkymelApiCallError',
+    'SkymelApiCircuitOpenError',
     'SkymelECGraphUtils',
     'CommonValidators',
     'CommonGraphAlgorithms',
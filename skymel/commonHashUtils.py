@@ -1,5 +1,6 @@
 import time
 import uuid
+import json
 import hashlib
 from .commonUtils import generate_unique_string_key
 
@@ -45,6 +46,28 @@ class CommonHashUtils:
             return hash_hex[:max_length]
         return hash_hex
 
+    @staticmethod
+    def generate_canonical_json_hash(input_data, max_length=None):
+        """
+        Generates a hash of JSON-serializable data which does not depend on dictionary key order.
+        
+        Args:
+            input_data: JSON-serializable data to hash
+            max_length (int, optional): Maximum length of returned hash
+            
+        Returns:
+            str: Hash string
+            
+        Raises:
+            TypeError: If the data is not JSON-serializable
+        """
+        canonical_json = json.dumps(input_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        hash_hex = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        
+        if max_length is not None:
+            return hash_hex[:max_length]
+        return hash_hex
+
     @staticmethod
     def generate_uuid(max_length=None):
         """
@@ -20,7 +20,8 @@ class SkymelAgent:
                  agent_definition_string: str = "",
                  agent_restrictions_string: str = "",
                  developer_configuration_string: str = "",
-                 is_mcp_enabled: bool = False):
+                 is_mcp_enabled: bool = False,
+                 use_graph_template_cache: bool = False):
         """
         Initialize a SkymelAgent instance.
         
@@ -33,6 +34,8 @@ class SkymelAgent:
             agent_restrictions_string: Restrictions for the agent
             developer_configuration_string: Developer-specific configuration
             is_mcp_enabled: Whether MCP (Model Context Protocol) is enabled
+            use_graph_template_cache: Whether workflow graphs are cloned from cached templates of their configuration
+                instead of being loaded from scratch on every run
         """
         self.api_key = api_key
         self.agent_developer_configuration_string = self.get_developer_configuration_string(
@@ -44,6 +47,7 @@ class SkymelAgent:
         self.agent_creation_endpoint_url = agent_creation_endpoint_url
         self.agent_creation_endpoint_url_is_websocket_url = agent_creation_endpoint_url_is_websocket_url
         self.is_mcp_enabled = is_mcp_enabled
+        self.use_graph_template_cache = use_graph_template_cache
         
         self.agentic_workflow_id_to_json_config = {}
 
@@ -338,7 +342,7 @@ class SkymelAgent:
         """
         # Load the workflow graph
         agentic_workflow_skymel_ec_graph = SkymelExecutionGraphLoader.load_graph_from_json_object(
-            agentic_workflow_graph_json_config
+            agentic_workflow_graph_json_config, use_template_cache=self.use_graph_template_cache
         )
         
         if not isinstance(agentic_workflow_skymel_ec_graph, SkymelECGraph):
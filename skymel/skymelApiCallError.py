@@ -0,0 +1,41 @@
+from typing import Optional
+
+
+class SkymelApiCallError(RuntimeError):
+    """
+    Error raised by external API call nodes for failed calls.
+
+    Carries the HTTP status code of the failed response, if there was one, and the delay the backend asked for in a
+    ``Retry-After`` header, so callers such as rate limiters and retry loops can react to the kind of failure.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after_seconds: Optional[float] = None):
+        """
+        Initialize an API call error.
+
+        Args:
+            message: Error message
+            status_code: HTTP status code of the failed response, or None if no response was received
+            retry_after_seconds: Delay requested by the backend before calling again, or None
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after_seconds = retry_after_seconds
+
+    def is_throttling_error(self) -> bool:
+        """Check if the backend rejected the call because it is overloaded or rate limiting."""
+        return self.status_code in (429, 503)
+
+
+class SkymelApiCircuitOpenError(SkymelApiCallError):
+    """Error raised without calling the backend while the endpoint's circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after_seconds: Optional[float] = None):
+        """
+        Initialize a circuit-open error.
+
+        Args:
+            message: Error message
+            retry_after_seconds: Time until the circuit breaker lets a probe call through
+        """
+        super().__init__(message, status_code=None, retry_after_seconds=retry_after_seconds)
@@ -0,0 +1,77 @@
+import asyncio
+import copy
+import weakref
+from typing import Any, Callable, Dict
+
+
+class SkymelApiCallSingleFlight:
+    """
+    Coalesces identical concurrent API calls into one call.
+
+    The first caller for a key starts the call; callers arriving with the same key while it is in flight wait for the
+    same call instead of starting their own. Every caller receives an independent deep copy of the result, so callers
+    may modify their response freely. The shared call is cancelled only once every caller waiting on it is cancelled.
+
+    One instance is shared by the whole process (see ``get_process_wide_single_flight``).
+    """
+
+    _process_wide_single_flight = None
+
+    def __init__(self):
+        self._event_loop_to_key_to_in_flight_call = weakref.WeakKeyDictionary()
+        self.call_count = 0
+        self.coalesced_call_count = 0
+
+    @staticmethod
+    def get_process_wide_single_flight() -> 'SkymelApiCallSingleFlight':
+        """Get the single-flight layer shared by every node in this process."""
+        if SkymelApiCallSingleFlight._process_wide_single_flight is None:
+            SkymelApiCallSingleFlight._process_wide_single_flight = SkymelApiCallSingleFlight()
+        return SkymelApiCallSingleFlight._process_wide_single_flight
+
+    async def run(self, key: str, call_callable: Callable[[], Any]) -> Any:
+        """
+        Run a call, or join the identical call already in flight.
+
+        Args:
+            key: Key identifying identical calls, e.g. endpoint plus canonical payload hash
+            call_callable: Zero-argument callable returning the awaitable making the call
+
+        Returns:
+            An independent copy of the call result
+        """
+        key_to_in_flight_call = self._event_loop_to_key_to_in_flight_call.get(asyncio.get_running_loop(), None)
+        if key_to_in_flight_call is None:
+            key_to_in_flight_call = {}
+            self._event_loop_to_key_to_in_flight_call[asyncio.get_running_loop()] = key_to_in_flight_call
+
+        in_flight_call = key_to_in_flight_call.get(key, None)
+        if in_flight_call is None:
+            in_flight_call = {'task': asyncio.ensure_future(call_callable()), 'waiter_count': 0}
+            key_to_in_flight_call[key] = in_flight_call
+            self.call_count += 1
+
+            def remove_in_flight_call(_):
+                if key_to_in_flight_call.get(key, None) is in_flight_call:
+                    del key_to_in_flight_call[key]
+
+            in_flight_call['task'].add_done_callback(remove_in_flight_call)
+        else:
+            self.coalesced_call_count += 1
+
+        in_flight_call['waiter_count'] += 1
+        try:
+            result = await asyncio.shield(in_flight_call['task'])
+        finally:
+            in_flight_call['waiter_count'] -= 1
+            if in_flight_call['waiter_count'] == 0 and not in_flight_call['task'].done():
+                in_flight_call['task'].cancel()
+
+        return copy.deepcopy(result)
+
+    def get_single_flight_statistics(self) -> Dict[str, int]:
+        """Get the number of calls made and the number of calls which joined a call in flight."""
+        return {
+            'call_count': self.call_count,
+            'coalesced_call_count': self.coalesced_call_count
+        }
@@ -0,0 +1,199 @@
+import collections
+import time
+from typing import Any, Dict, Optional
+
+from .commonValidators import CommonValidators
+from .skymelApiCallError import SkymelApiCallError, SkymelApiCircuitOpenError
+
+
+class SkymelApiCircuitBreaker:
+    """
+    Circuit breaker for one API endpoint, shared by every node calling that endpoint.
+
+    The breaker starts closed and records the outcome of the last ``sliding_window_size`` calls. Once at least
+    ``minimum_call_count`` outcomes are recorded and the share of failures reaches ``failure_rate_threshold``, it opens:
+    calls then fail immediately with ``SkymelApiCircuitOpenError`` instead of holding tasks and sockets on a backend
+    which is down. After ``open_duration_seconds`` it turns half-open and lets up to ``half_open_max_probe_calls``
+    probe calls through; a successful probe closes it again, while a failed probe reopens it.
+
+    Timeouts, connection errors, 429 and 5xx responses count as failures; other 4xx responses are the caller's fault
+    and do not. Breakers are registered per endpoint key, usually the endpoint URL, through
+    ``configure_endpoint_circuit_breaker`` or the ``circuitBreakerConfig`` key of a node's initialization config::
+
+        'circuitBreakerConfig': {'failureRateThreshold': 0.5, 'minimumCallCount': 10, 'openDurationSeconds': 30}
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    _endpoint_key_to_circuit_breaker = {}
+
+    def __init__(self,
+                 failure_rate_threshold: float = 0.5,
+                 minimum_call_count: int = 10,
+                 sliding_window_size: int = 20,
+                 open_duration_seconds: float = 30.0,
+                 half_open_max_probe_calls: int = 1):
+        """
+        Initialize a circuit breaker.
+
+        Args:
+            failure_rate_threshold: Share of failed calls in the window, between 0 and 1, at which the breaker opens
+            minimum_call_count: Number of recorded calls needed before the failure rate is considered
+            sliding_window_size: Number of most recent call outcomes considered
+            open_duration_seconds: Time the breaker stays open before letting probe calls through
+            half_open_max_probe_calls: Number of concurrent probe calls allowed while half-open
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.sliding_window_size = max(1, int(sliding_window_size))
+        self.minimum_call_count = min(self.sliding_window_size, max(1, int(minimum_call_count)))
+        self.open_duration_seconds = open_duration_seconds
+        self.half_open_max_probe_calls = max(1, int(half_open_max_probe_calls))
+
+        self.state = SkymelApiCircuitBreaker.CLOSED
+        self.call_outcomes = collections.deque(maxlen=self.sliding_window_size)
+        self.opened_time = 0.0
+        self.probe_calls_in_flight = 0
+
+        self.open_count = 0
+        self.rejected_call_count = 0
+
+    @staticmethod
+    def from_config(circuit_breaker_config: Optional[Dict]) -> Optional['SkymelApiCircuitBreaker']:
+        """
+        Create a circuit breaker from a ``circuitBreakerConfig`` config dictionary.
+
+        Returns:
+            The circuit breaker, or None if no circuit breaker is configured
+        """
+        if not CommonValidators.is_non_empty_dict(circuit_breaker_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                circuit_breaker_config, key_name, default_value)
+
+        if get_value('enabled', True) is not True:
+            return None
+
+        return SkymelApiCircuitBreaker(
+            failure_rate_threshold=get_value('failureRateThreshold', 0.5),
+            minimum_call_count=get_value('minimumCallCount', 10),
+            sliding_window_size=get_value('slidingWindowSize', 20),
+            open_duration_seconds=get_value('openDurationSeconds', 30.0),
+            half_open_max_probe_calls=get_value('halfOpenMaxProbeCalls', 1)
+        )
+
+    @staticmethod
+    def configure_endpoint_circuit_breaker(endpoint_key: str, circuit_breaker_config: Optional[Dict]):
+        """Register (or, with None, remove) the circuit breaker shared by every call to an endpoint."""
+        if circuit_breaker_config is None:
+            SkymelApiCircuitBreaker._endpoint_key_to_circuit_breaker.pop(endpoint_key, None)
+            return
+        SkymelApiCircuitBreaker._endpoint_key_to_circuit_breaker[endpoint_key] = SkymelApiCircuitBreaker.from_config(
+            circuit_breaker_config)
+
+    @staticmethod
+    def get_endpoint_circuit_breaker(endpoint_key: str,
+                                     circuit_breaker_config: Optional[Dict] = None) -> Optional['SkymelApiCircuitBreaker']:
+        """
+        Get the circuit breaker registered for an endpoint, registering one from the given config if there is none.
+
+        Returns:
+            The shared circuit breaker, or None if the endpoint has no circuit breaker
+        """
+        circuit_breaker = SkymelApiCircuitBreaker._endpoint_key_to_circuit_breaker.get(endpoint_key, None)
+        if circuit_breaker is None and circuit_breaker_config is not None:
+            circuit_breaker = SkymelApiCircuitBreaker.from_config(circuit_breaker_config)
+            if circuit_breaker is not None:
+                SkymelApiCircuitBreaker._endpoint_key_to_circuit_breaker[endpoint_key] = circuit_breaker
+        return circuit_breaker
+
+    @staticmethod
+    def is_failure_exception(exception: BaseException) -> bool:
+        """Check if a failed call indicates an unhealthy backend rather than a bad request."""
+        if isinstance(exception, SkymelApiCircuitOpenError):
+            return False
+        if isinstance(exception, SkymelApiCallError) and exception.status_code is not None:
+            return exception.status_code == 429 or exception.status_code >= 500
+        return True
+
+    def get_state(self) -> str:
+        """Get the current state, turning an open breaker half-open once its open duration has elapsed."""
+        if (self.state == SkymelApiCircuitBreaker.OPEN and
+                time.monotonic() - self.opened_time >= self.open_duration_seconds):
+            self.state = SkymelApiCircuitBreaker.HALF_OPEN
+            self.probe_calls_in_flight = 0
+        return self.state
+
+    def before_call(self):
+        """
+        Admit a call, or reject it while the breaker is open.
+
+        Every admitted call must be followed by exactly one call to ``record_call_outcome``.
+
+        Raises:
+            SkymelApiCircuitOpenError: If the breaker is open, or half-open with every probe slot taken
+        """
+        state = self.get_state()
+        if state == SkymelApiCircuitBreaker.CLOSED:
+            return
+        if state == SkymelApiCircuitBreaker.HALF_OPEN and self.probe_calls_in_flight < self.half_open_max_probe_calls:
+            self.probe_calls_in_flight += 1
+            return
+
+        self.rejected_call_count += 1
+        retry_after_seconds = max(0.0, self.open_duration_seconds - (time.monotonic() - self.opened_time))
+        raise SkymelApiCircuitOpenError("Circuit breaker is open; the endpoint is considered unhealthy",
+                                        retry_after_seconds=retry_after_seconds)
+
+    def record_call_outcome(self, is_failure: Optional[bool]):
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            is_failure: True for a failed call, False for a successful one, or None for a call which was abandoned
+                before it completed, e.g. cancelled; such calls only hand back their probe slot
+        """
+        if self.state == SkymelApiCircuitBreaker.HALF_OPEN:
+            self.probe_calls_in_flight = max(0, self.probe_calls_in_flight - 1)
+            if is_failure is True:
+                self.open()
+            elif is_failure is False:
+                self.state = SkymelApiCircuitBreaker.CLOSED
+                self.call_outcomes.clear()
+            return
+
+        if is_failure is None or self.state == SkymelApiCircuitBreaker.OPEN:
+            return
+
+        self.call_outcomes.append(is_failure)
+        if len(self.call_outcomes) >= self.minimum_call_count:
+            failure_rate = sum(self.call_outcomes) / len(self.call_outcomes)
+            if failure_rate >= self.failure_rate_threshold:
+                self.open()
+
+    def open(self):
+        """Open the breaker, rejecting calls for the open duration."""
+        self.state = SkymelApiCircuitBreaker.OPEN
+        self.opened_time = time.monotonic()
+        self.probe_calls_in_flight = 0
+        self.call_outcomes.clear()
+        self.open_count += 1
+
+    def reset(self):
+        """Close the breaker and forget the recorded outcomes."""
+        self.state = SkymelApiCircuitBreaker.CLOSED
+        self.probe_calls_in_flight = 0
+        self.call_outcomes.clear()
+
+    def get_circuit_breaker_statistics(self) -> Dict[str, Any]:
+        """Get the state of the breaker and the counts of openings and rejected calls."""
+        return {
+            'state': self.get_state(),
+            'failure_rate': (sum(self.call_outcomes) / len(self.call_outcomes)) if len(self.call_outcomes) > 0 else 0,
+            'recorded_call_count': len(self.call_outcomes),
+            'open_count': self.open_count,
+            'rejected_call_count': self.rejected_call_count
+        }
@@ -0,0 +1,250 @@
+import bisect
+import math
+import time
+from typing import Any, Dict, Optional
+
+
+class SkymelLogBucketedHistogram:
+    """
+    Histogram with logarithmically spaced buckets, keeping the same relative precision from microseconds to minutes.
+
+    Bucket ``i`` counts the values above ``bucket_upper_bounds[i - 1]`` and up to ``bucket_upper_bounds[i]``; the upper
+    bounds grow by a factor of ``2 ** (1 / buckets_per_doubling)`` from ``min_value`` to at least ``max_value``. Values
+    at or below ``min_value`` fall in the first bucket and values above the last bound in the last one. Percentiles are
+    estimated as the upper bound of the bucket holding them, clamped to the observed minimum and maximum.
+    """
+
+    def __init__(self, min_value: float = 0.1, max_value: float = 600000.0, buckets_per_doubling: int = 2):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            min_value: Upper bound of the first bucket
+            max_value: Smallest value the last bucket bound must reach
+            buckets_per_doubling: Number of buckets covering every doubling of the value
+        """
+        bucket_count = max(1, math.ceil(math.log2(max_value / min_value) * buckets_per_doubling)) + 1
+        self.bucket_upper_bounds = [min_value * 2 ** (bucket_index / buckets_per_doubling)
+                                    for bucket_index in range(bucket_count)]
+        self.bucket_counts = [0] * bucket_count
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value: float):
+        """Add one value to the histogram."""
+        bucket_index = min(bisect.bisect_left(self.bucket_upper_bounds, value), len(self.bucket_counts) - 1)
+        self.bucket_counts[bucket_index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate a percentile of the recorded values.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            The estimate, or None if the histogram is empty
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(percentile / 100.0 * self.count))
+        cumulative_count = 0
+        for bucket_index, bucket_count in enumerate(self.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                if bucket_index == len(self.bucket_counts) - 1:
+                    # The last bucket also holds the values beyond its bound
+                    return self.max
+                return min(self.max, max(self.min, self.bucket_upper_bounds[bucket_index]))
+        return self.max
+
+    def get_histogram_statistics(self) -> Dict[str, Any]:
+        """Get the count, sum, extremes, common percentiles and the bucket arrays of the histogram."""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': (self.sum / self.count) if self.count > 0 else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.get_percentile(50),
+            'p90': self.get_percentile(90),
+            'p99': self.get_percentile(99),
+            'bucket_upper_bounds': list(self.bucket_upper_bounds),
+            'bucket_counts': list(self.bucket_counts)
+        }
+
+
+class SkymelApiCallTrace:
+    """
+    Timings and transfer sizes of one API call attempt, filled in as the call progresses.
+
+    For HTTP calls the trace is passed to aiohttp as ``trace_request_ctx``, and the trace config of
+    ``SkymelApiEndpointMetrics.create_trace_config`` fills in the connection setup time and whether a pooled connection
+    was reused. Time to first byte and total time both run from the creation of the trace, so they include the
+    connection setup when a connection had to be opened, whatever the transport.
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.connect_start_time = None
+        self.connect_ms = None
+        self.connection_reused = None
+        self.first_byte_time = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def mark_connect_start(self):
+        self.connect_start_time = time.perf_counter()
+
+    def mark_connect_end(self):
+        """Record the end of opening a new connection."""
+        if self.connect_start_time is not None:
+            self.connect_ms = (time.perf_counter() - self.connect_start_time) * 1000
+        self.connection_reused = False
+
+    def mark_first_byte(self):
+        """Record the arrival of the first byte of the response, unless it was already recorded."""
+        if self.first_byte_time is None:
+            self.first_byte_time = time.perf_counter()
+
+    def get_time_to_first_byte_ms(self) -> Optional[float]:
+        if self.first_byte_time is None:
+            return None
+        return (self.first_byte_time - self.start_time) * 1000
+
+    def get_elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+
+class SkymelApiEndpointMetrics:
+    """
+    Latency distributions and transfer counters of every call to one API endpoint, aggregated across all nodes.
+
+    Each call attempt records its connection setup time (only when a new connection was opened), time to first byte
+    and total time into log-bucketed histograms in milliseconds, and its request and response sizes in bytes. Calls
+    served over an already open connection count as connection reuses, calls which had to open one as connection
+    creations; retries are counted separately.
+
+    Metrics are registered per endpoint key, the endpoint URL of the calling nodes, and are created on first use (see
+    ``get_endpoint_metrics`` and ``get_all_endpoint_statistics``).
+    """
+
+    _endpoint_key_to_metrics = {}
+
+    def __init__(self):
+        self.connect_ms_histogram = SkymelLogBucketedHistogram()
+        self.time_to_first_byte_ms_histogram = SkymelLogBucketedHistogram()
+        self.total_ms_histogram = SkymelLogBucketedHistogram()
+
+        self.call_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connection_reuse_count = 0
+        self.connection_create_count = 0
+
+    @staticmethod
+    def get_endpoint_metrics(endpoint_key: str) -> 'SkymelApiEndpointMetrics':
+        """Get the metrics of an endpoint, creating them if needed."""
+        metrics = SkymelApiEndpointMetrics._endpoint_key_to_metrics.get(endpoint_key, None)
+        if metrics is None:
+            metrics = SkymelApiEndpointMetrics()
+            SkymelApiEndpointMetrics._endpoint_key_to_metrics[endpoint_key] = metrics
+        return metrics
+
+    @staticmethod
+    def get_all_endpoint_statistics() -> Dict[str, Dict[str, Any]]:
+        """Get the statistics of every endpoint called so far, keyed by endpoint."""
+        return {endpoint_key: metrics.get_endpoint_statistics()
+                for endpoint_key, metrics in SkymelApiEndpointMetrics._endpoint_key_to_metrics.items()}
+
+    @staticmethod
+    def reset_all_endpoint_metrics():
+        """Forget the metrics of every endpoint."""
+        SkymelApiEndpointMetrics._endpoint_key_to_metrics = {}
+
+    @staticmethod
+    def create_trace_config() -> Any:
+        """
+        Create an ``aiohttp.TraceConfig`` filling in the ``SkymelApiCallTrace`` passed as a request's
+        ``trace_request_ctx``; requests without one are ignored.
+        """
+        import aiohttp
+
+        def get_call_trace(trace_config_ctx) -> Optional[SkymelApiCallTrace]:
+            call_trace = getattr(trace_config_ctx, 'trace_request_ctx', None)
+            return call_trace if isinstance(call_trace, SkymelApiCallTrace) else None
+
+        async def on_connection_create_start(session, trace_config_ctx, params):
+            call_trace = get_call_trace(trace_config_ctx)
+            if call_trace is not None:
+                call_trace.mark_connect_start()
+
+        async def on_connection_create_end(session, trace_config_ctx, params):
+            call_trace = get_call_trace(trace_config_ctx)
+            if call_trace is not None:
+                call_trace.mark_connect_end()
+
+        async def on_connection_reuseconn(session, trace_config_ctx, params):
+            call_trace = get_call_trace(trace_config_ctx)
+            if call_trace is not None:
+                call_trace.connection_reused = True
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def record_call(self, call_trace: SkymelApiCallTrace, is_error: bool = False):
+        """
+        Record one finished call attempt.
+
+        Args:
+            call_trace: Trace of the attempt
+            is_error: Whether the attempt failed
+        """
+        self.call_count += 1
+        if is_error:
+            self.error_count += 1
+        self.bytes_sent += call_trace.bytes_sent
+        self.bytes_received += call_trace.bytes_received
+
+        if call_trace.connection_reused is True:
+            self.connection_reuse_count += 1
+        elif call_trace.connection_reused is False:
+            self.connection_create_count += 1
+        if call_trace.connect_ms is not None:
+            self.connect_ms_histogram.record(call_trace.connect_ms)
+
+        time_to_first_byte_ms = call_trace.get_time_to_first_byte_ms()
+        if time_to_first_byte_ms is not None:
+            self.time_to_first_byte_ms_histogram.record(time_to_first_byte_ms)
+        self.total_ms_histogram.record(call_trace.get_elapsed_ms())
+
+    def record_retry(self):
+        self.retry_count += 1
+
+    def get_endpoint_statistics(self) -> Dict[str, Any]:
+        """Get the counters and latency histograms of the endpoint."""
+        connection_count = self.connection_reuse_count + self.connection_create_count
+        return {
+            'call_count': self.call_count,
+            'error_count': self.error_count,
+            'retry_count': self.retry_count,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'connection_reuse_count': self.connection_reuse_count,
+            'connection_create_count': self.connection_create_count,
+            'connection_reuse_rate': (self.connection_reuse_count / connection_count) if connection_count > 0 else 0,
+            'connect_ms': self.connect_ms_histogram.get_histogram_statistics(),
+            'time_to_first_byte_ms': self.time_to_first_byte_ms_histogram.get_histogram_statistics(),
+            'total_ms': self.total_ms_histogram.get_histogram_statistics()
+        }
@@ -0,0 +1,241 @@
+import asyncio
+import collections
+import math
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from .commonValidators import CommonValidators
+
+
+class SkymelApiEndpointRateLimiter:
+    """
+    Request-rate and concurrency limiter for one API endpoint, shared by every node calling that endpoint.
+
+    Calls first wait for a slot under the concurrency limit, then for a token from a token bucket refilled at
+    ``requests_per_second`` and holding up to ``burst`` tokens. The concurrency limit adapts AIMD-style: every healthy
+    call raises it by ``1 / limit`` (about one per round of calls), while a throttled call (HTTP 429 or 503) or a call
+    slower than ``latency_tolerance_ratio`` times the baseline latency multiplies it by ``decrease_factor``. The baseline
+    is the ``baseline_latency_percentile`` of the last ``latency_window_size`` call latencies, so a single unusually fast
+    call does not make every ordinary call look slow, while a lasting shift in the endpoint's latency moves the baseline
+    along. Decreases happen at most once per ``decrease_cooldown_seconds`` so that a burst of failures from one overload
+    counts once.
+
+    Limiters are registered per endpoint key, usually the endpoint URL, through ``configure_endpoint_limiter`` or the
+    ``rateLimitConfig`` key of a node's initialization config, for example::
+
+        'rateLimitConfig': {'requestsPerSecond': 50, 'burst': 10, 'initialConcurrency': 8, 'maxConcurrency': 64}
+    """
+
+    _endpoint_key_to_limiter = {}
+
+    def __init__(self,
+                 requests_per_second: Optional[float] = None,
+                 burst: Optional[float] = None,
+                 initial_concurrency: float = 8,
+                 min_concurrency: float = 1,
+                 max_concurrency: float = 64,
+                 decrease_factor: float = 0.5,
+                 latency_tolerance_ratio: float = 3.0,
+                 decrease_cooldown_seconds: float = 1.0,
+                 baseline_latency_percentile: float = 50.0,
+                 latency_window_size: int = 100,
+                 minimum_latency_samples: int = 10):
+        """
+        Initialize an endpoint limiter.
+
+        Args:
+            requests_per_second: Sustained request rate, or None for no rate limit
+            burst: Maximum number of requests sent back-to-back; defaults to one second worth of requests
+            initial_concurrency: Starting concurrency limit
+            min_concurrency: Lower bound of the concurrency limit
+            max_concurrency: Upper bound of the concurrency limit
+            decrease_factor: Factor applied to the concurrency limit on throttling or rising latency
+            latency_tolerance_ratio: Latency, relative to the baseline latency, above which a call counts as slow
+            decrease_cooldown_seconds: Minimum time between two decreases of the concurrency limit
+            baseline_latency_percentile: Percentile of the recent call latencies used as the baseline latency
+            latency_window_size: Number of most recent call latencies the baseline is computed over
+            minimum_latency_samples: Number of call latencies needed before any call counts as slow
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst if burst is not None else max(1.0, requests_per_second or 1.0)
+        self.min_concurrency = max(1.0, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.concurrency_limit = min(self.max_concurrency, max(self.min_concurrency, initial_concurrency))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance_ratio = latency_tolerance_ratio
+        self.decrease_cooldown_seconds = decrease_cooldown_seconds
+        self.baseline_latency_percentile = baseline_latency_percentile
+        self.minimum_latency_samples = max(1, int(minimum_latency_samples))
+
+        self.available_tokens = self.burst
+        self.last_token_refill_time = time.monotonic()
+        self.last_decrease_time = 0.0
+        self.recent_latencies_seconds = collections.deque(maxlen=max(1, int(latency_window_size)))
+        self.calls_in_flight = 0
+        self._event_loop_to_condition = weakref.WeakKeyDictionary()
+
+        self.throttled_call_count = 0
+        self.slow_call_count = 0
+        self.decrease_count = 0
+
+    @staticmethod
+    def from_config(rate_limit_config: Optional[Dict]) -> Optional['SkymelApiEndpointRateLimiter']:
+        """
+        Create a limiter from a ``rateLimitConfig`` config dictionary.
+
+        Returns:
+            The limiter, or None if no rate limiting is configured
+        """
+        if not CommonValidators.is_non_empty_dict(rate_limit_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                rate_limit_config, key_name, default_value)
+
+        return SkymelApiEndpointRateLimiter(
+            requests_per_second=get_value('requestsPerSecond', None),
+            burst=get_value('burst', None),
+            initial_concurrency=get_value('initialConcurrency', 8),
+            min_concurrency=get_value('minConcurrency', 1),
+            max_concurrency=get_value('maxConcurrency', 64),
+            decrease_factor=get_value('decreaseFactor', 0.5),
+            latency_tolerance_ratio=get_value('latencyToleranceRatio', 3.0),
+            decrease_cooldown_seconds=get_value('decreaseCooldownSeconds', 1.0),
+            baseline_latency_percentile=get_value('baselineLatencyPercentile', 50.0),
+            latency_window_size=get_value('latencyWindowSize', 100),
+            minimum_latency_samples=get_value('minimumLatencySamples', 10)
+        )
+
+    @staticmethod
+    def configure_endpoint_limiter(endpoint_key: str, rate_limit_config: Optional[Dict]):
+        """Register (or, with None, remove) the limiter shared by every call to an endpoint."""
+        if rate_limit_config is None:
+            SkymelApiEndpointRateLimiter._endpoint_key_to_limiter.pop(endpoint_key, None)
+            return
+        SkymelApiEndpointRateLimiter._endpoint_key_to_limiter[endpoint_key] = SkymelApiEndpointRateLimiter.from_config(
+            rate_limit_config)
+
+    @staticmethod
+    def get_endpoint_limiter(endpoint_key: str, rate_limit_config: Optional[Dict] = None) -> Optional['SkymelApiEndpointRateLimiter']:
+        """
+        Get the limiter registered for an endpoint, registering one from the given config if there is none.
+
+        Returns:
+            The shared limiter, or None if the endpoint is not rate limited
+        """
+        limiter = SkymelApiEndpointRateLimiter._endpoint_key_to_limiter.get(endpoint_key, None)
+        if limiter is None and rate_limit_config is not None:
+            limiter = SkymelApiEndpointRateLimiter.from_config(rate_limit_config)
+            if limiter is not None:
+                SkymelApiEndpointRateLimiter._endpoint_key_to_limiter[endpoint_key] = limiter
+        return limiter
+
+    def _get_condition(self) -> asyncio.Condition:
+        event_loop = asyncio.get_running_loop()
+        condition = self._event_loop_to_condition.get(event_loop, None)
+        if condition is None:
+            condition = asyncio.Condition()
+            self._event_loop_to_condition[event_loop] = condition
+        return condition
+
+    def get_token_wait_seconds(self) -> float:
+        """Refill the token bucket and take a token, returning how long to wait before the token is valid."""
+        if self.requests_per_second is None:
+            return 0.0
+
+        current_time = time.monotonic()
+        self.available_tokens = min(self.burst, self.available_tokens +
+                                    (current_time - self.last_token_refill_time) * self.requests_per_second)
+        self.last_token_refill_time = current_time
+
+        # Tokens may go negative: each waiter reserves its token and sleeps until the bucket would have refilled it
+        self.available_tokens -= 1.0
+        if self.available_tokens >= 0:
+            return 0.0
+        return -self.available_tokens / self.requests_per_second
+
+    def get_baseline_latency_seconds(self) -> Optional[float]:
+        """
+        Get the baseline latency calls are compared against.
+
+        Returns:
+            The configured percentile of the recent call latencies, or None until enough latencies are recorded
+        """
+        if len(self.recent_latencies_seconds) < self.minimum_latency_samples:
+            return None
+        recent_latencies_seconds = sorted(self.recent_latencies_seconds)
+        percentile_index = min(len(recent_latencies_seconds) - 1, max(0, math.ceil(
+            self.baseline_latency_percentile / 100.0 * len(recent_latencies_seconds)) - 1))
+        return recent_latencies_seconds[percentile_index]
+
+    async def acquire(self):
+        """Wait for a slot under the concurrency limit and for a request token."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.calls_in_flight < int(self.concurrency_limit))
+            self.calls_in_flight += 1
+
+        token_wait_seconds = self.get_token_wait_seconds()
+        if token_wait_seconds > 0:
+            try:
+                await asyncio.sleep(token_wait_seconds)
+            except BaseException:
+                await self.release(None, None)
+                raise
+
+    async def release(self, status_code: Optional[int], latency_seconds: Optional[float]):
+        """
+        Hand back a concurrency slot and adapt the concurrency limit to the outcome of the call.
+
+        Args:
+            status_code: HTTP status code of the call, or None if unknown
+            latency_seconds: Duration of the call, or None if it did not complete
+        """
+        is_throttled = status_code in (429, 503)
+        is_slow = False
+        if latency_seconds is not None and not is_throttled:
+            baseline_latency_seconds = self.get_baseline_latency_seconds()
+            is_slow = (baseline_latency_seconds is not None and
+                       latency_seconds > self.latency_tolerance_ratio * baseline_latency_seconds)
+            # Slow calls enter the window too, so that a lasting latency shift becomes the new baseline
+            self.recent_latencies_seconds.append(latency_seconds)
+
+        if is_throttled or is_slow:
+            self.throttled_call_count += int(is_throttled)
+            self.slow_call_count += int(is_slow)
+            current_time = time.monotonic()
+            if current_time - self.last_decrease_time >= self.decrease_cooldown_seconds:
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+                self.last_decrease_time = current_time
+                self.decrease_count += 1
+        elif latency_seconds is not None and status_code is not None and status_code < 500:
+            self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1.0 / self.concurrency_limit)
+
+        condition = self._get_condition()
+        async with condition:
+            self.calls_in_flight = max(0, self.calls_in_flight - 1)
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def hold(self):
+        """Async context manager holding a slot for the duration of the block, recording no outcome."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release(None, None)
+
+    def get_limiter_statistics(self) -> Dict[str, float]:
+        """Get the current limits, the baseline latency and the counts of calls that lowered the limits."""
+        return {
+            'concurrency_limit': self.concurrency_limit,
+            'calls_in_flight': self.calls_in_flight,
+            'requests_per_second': self.requests_per_second,
+            'baseline_latency_seconds': self.get_baseline_latency_seconds(),
+            'throttled_call_count': self.throttled_call_count,
+            'slow_call_count': self.slow_call_count,
+            'decrease_count': self.decrease_count
+        }
@@ -0,0 +1,108 @@
+import gzip
+import json
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from .commonValidators import CommonValidators
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SkymelApiPayloadSerializer:
+    """
+    Serializes API request payloads to JSON bytes once, optionally compressing them.
+
+    orjson is used when it is installed and ``use_fast_json`` is set, falling back to the standard library for payloads
+    orjson cannot encode, such as dicts with non-string keys. Bodies of at least ``compression_threshold_bytes`` are
+    compressed with ``compression`` ('gzip' or 'deflate') and sent with the matching Content-Encoding header; the
+    backend must accept compressed request bodies, so compression is off by default.
+
+    Nodes configure it through the ``payloadSerializationConfig`` key of their initialization config, for example::
+
+        'payloadSerializationConfig': {'compression': 'gzip', 'compressionThresholdBytes': 65536}
+    """
+
+    COMPRESSION_TO_COMPRESS_FUNCTION = {
+        'gzip': lambda data, level: gzip.compress(data, compresslevel=level),
+        'deflate': lambda data, level: zlib.compress(data, level)
+    }
+
+    def __init__(self,
+                 compression: Optional[str] = None,
+                 compression_threshold_bytes: int = 65536,
+                 compression_level: int = 6,
+                 use_fast_json: bool = True):
+        """
+        Initialize a payload serializer.
+
+        Args:
+            compression: 'gzip', 'deflate', or None to never compress
+            compression_threshold_bytes: Minimum size of the JSON body for it to be compressed
+            compression_level: Compression level from 1 (fastest) to 9 (smallest)
+            use_fast_json: Whether to use orjson when it is installed
+        """
+        if compression is not None and compression not in SkymelApiPayloadSerializer.COMPRESSION_TO_COMPRESS_FUNCTION:
+            raise ValueError(f"Unsupported payload compression: {compression}")
+        self.compression = compression
+        self.compression_threshold_bytes = max(0, int(compression_threshold_bytes))
+        self.compression_level = compression_level
+        self.use_fast_json = use_fast_json and orjson is not None
+
+    @staticmethod
+    def from_config(payload_serialization_config: Optional[Dict]) -> 'SkymelApiPayloadSerializer':
+        """Create a serializer from a ``payloadSerializationConfig`` config dictionary; None gives the defaults."""
+        payload_serialization_config = payload_serialization_config or {}
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                payload_serialization_config, key_name, default_value)
+
+        return SkymelApiPayloadSerializer(
+            compression=get_value('compression', None),
+            compression_threshold_bytes=get_value('compressionThresholdBytes', 65536),
+            compression_level=get_value('compressionLevel', 6),
+            use_fast_json=get_value('useFastJson', True)
+        )
+
+    def dumps(self, payload: Any) -> bytes:
+        """Encode a payload as compact UTF-8 JSON."""
+        if self.use_fast_json:
+            try:
+                return orjson.dumps(payload)
+            except TypeError:
+                pass
+        return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def serialize(self, payload: Any) -> Tuple[bytes, Dict[str, str], int]:
+        """
+        Serialize a payload into the request body.
+
+        Args:
+            payload: JSON-serializable payload
+
+        Returns:
+            The body bytes, the headers describing the body, and the size of the uncompressed JSON
+        """
+        return self.encode_body(self.dumps(payload), 'application/json')
+
+    def encode_body(self, body: bytes, content_type: str) -> Tuple[bytes, Dict[str, str], int]:
+        """
+        Compress an already serialized body if it reaches the compression threshold.
+
+        Args:
+            body: Serialized payload
+            content_type: Media type of the serialized payload
+
+        Returns:
+            The body bytes, the headers describing the body, and the size of the uncompressed body
+        """
+        body_size = len(body)
+        headers = {'Content-Type': content_type}
+        if self.compression is not None and body_size >= self.compression_threshold_bytes:
+            body = SkymelApiPayloadSerializer.COMPRESSION_TO_COMPRESS_FUNCTION[self.compression](
+                body, self.compression_level)
+            headers['Content-Encoding'] = self.compression
+        return body, headers, body_size
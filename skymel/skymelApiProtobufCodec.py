@@ -0,0 +1,225 @@
+import base64
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from . import skymel_modelio_pb2
+from .commonValidators import CommonValidators
+from .skymelApiCallError import SkymelApiCallError
+
+
+class SkymelApiProtobufCodec:
+    """
+    Encodes API request payloads as ``InferenceRequest`` messages and decodes ``InferenceResponse`` messages.
+
+    Inputs named in ``image_input_names`` are sent, in that order, as ``images``: bytes as raw ``image_bytes``, base64
+    strings (with or without a data URL prefix) decoded to ``image_bytes``, and http(s) URLs as ``image_url``. Every
+    other input is sent as a named, typed entry of ``graph_output``: numbers, booleans, lists and NumPy arrays as packed
+    flat arrays with their shape, strings and lists of strings as string outputs, and bytes as bytes outputs.
+
+    Responses are decoded into backend outputs: each ``graph_output`` entry under its name (arrays as NumPy arrays of
+    their shape, scalars as Python numbers, single strings as strings), plus the unnamed ``text_outputs``,
+    ``integer_outputs``, ``image_outputs`` and ``classifier_outputs`` under those field names when present. A response
+    whose status reports an error raises ``SkymelApiCallError``.
+
+    Nodes opt in through the ``protobufTransportConfig`` key of their initialization config, for example::
+
+        'protobufTransportConfig': {'enabled': True, 'imageInputNames': ['image']}
+    """
+
+    CONTENT_TYPE = 'application/x-protobuf'
+
+    DTYPE_KIND_AND_SIZE_TO_GRAPH_OUTPUT_FIELD = {
+        ('f', 4): ('float_outputs', np.float32),
+        ('f', 8): ('double_outputs', np.float64),
+        ('f', 2): ('float_outputs', np.float32),
+        ('i', 1): ('int32_outputs', np.int32),
+        ('i', 2): ('int32_outputs', np.int32),
+        ('i', 4): ('int32_outputs', np.int32),
+        ('i', 8): ('int64_outputs', np.int64),
+        ('u', 1): ('int32_outputs', np.int32),
+        ('u', 2): ('int32_outputs', np.int32),
+        ('u', 4): ('int64_outputs', np.int64),
+        ('b', 1): ('boolean_outputs', np.bool_)
+    }
+
+    GRAPH_OUTPUT_FIELD_TO_DTYPE = {
+        'float_outputs': np.float32,
+        'double_outputs': np.float64,
+        'int32_outputs': np.int32,
+        'int64_outputs': np.int64,
+        'boolean_outputs': np.bool_
+    }
+
+    ERROR_STATUS_CODES = (skymel_modelio_pb2.StatusReport.CLIENT_ERROR, skymel_modelio_pb2.StatusReport.SERVER_ERROR,
+                          skymel_modelio_pb2.StatusReport.OTHER_ERROR)
+
+    def __init__(self, image_input_names: Optional[List[str]] = None):
+        """
+        Initialize a codec.
+
+        Args:
+            image_input_names: Names of the backend inputs holding images
+        """
+        self.image_input_names = list(image_input_names or [])
+
+    @staticmethod
+    def from_config(protobuf_transport_config: Optional[Dict]) -> Optional['SkymelApiProtobufCodec']:
+        """
+        Create a codec from a ``protobufTransportConfig`` config dictionary.
+
+        Returns:
+            The codec, or None if the protobuf transport is not enabled
+        """
+        if not CommonValidators.is_non_empty_dict(protobuf_transport_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                protobuf_transport_config, key_name, default_value)
+
+        if get_value('enabled', True) is not True:
+            return None
+        return SkymelApiProtobufCodec(image_input_names=get_value('imageInputNames', []))
+
+    @staticmethod
+    def make_image(image: Any) -> skymel_modelio_pb2.Image:
+        """Make an ``Image`` message from image bytes, a base64 string or an image URL."""
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return skymel_modelio_pb2.Image(image_bytes=bytes(image))
+        if isinstance(image, str):
+            if image.startswith('http://') or image.startswith('https://'):
+                return skymel_modelio_pb2.Image(image_url=image)
+            if image.startswith('data:') and ',' in image:
+                image = image.split(',', 1)[1]
+            return skymel_modelio_pb2.Image(image_bytes=base64.b64decode(image))
+        raise ValueError(f"Unsupported image input of type {type(image).__name__}")
+
+    @staticmethod
+    def add_graph_output_value(graph_output: skymel_modelio_pb2.GraphOutput, name: str, value: Any):
+        """Add a named value to a ``GraphOutput`` message as the typed output matching its type."""
+        if isinstance(value, str):
+            graph_output.string_outputs.add(node_name=name, output_strings=[value])
+            return
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            graph_output.bytes_outputs.add(node_name=name, output_flat_array=bytes(value))
+            return
+        if isinstance(value, (list, tuple)) and len(value) > 0 and all(isinstance(item, str) for item in value):
+            graph_output.string_outputs.add(node_name=name, output_strings=list(value))
+            return
+
+        array = np.asarray(value)
+        field_and_dtype = SkymelApiProtobufCodec.DTYPE_KIND_AND_SIZE_TO_GRAPH_OUTPUT_FIELD.get(
+            (array.dtype.kind, array.dtype.itemsize), None)
+        if field_and_dtype is None:
+            raise ValueError(f"Input {name} of dtype {array.dtype} cannot be sent with the protobuf transport")
+        field_name, dtype = field_and_dtype
+        # Scalars are sent with an empty shape, so that they decode back to scalars
+        getattr(graph_output, field_name).add(node_name=name,
+                                              output_flat_array=array.astype(dtype, copy=False).ravel().tolist(),
+                                              array_shape=list(array.shape))
+
+    def encode_request(self, payload: Dict[str, Any], include_request_id: bool = True) -> bytes:
+        """
+        Encode a request payload as a serialized ``InferenceRequest``.
+
+        Args:
+            payload: Backend inputs and private attributes
+            include_request_id: Whether to add a random request ID; without it, identical payloads give identical bytes,
+                and the ID can be appended later with ``encode_request_id``
+
+        Returns:
+            The serialized message
+        """
+        inference_request = skymel_modelio_pb2.InferenceRequest(
+            request_id=uuid.uuid4().hex if include_request_id else '')
+        graph_output = skymel_modelio_pb2.GraphOutput()
+        for name, value in payload.items():
+            if name in self.image_input_names:
+                continue
+            if value is None:
+                continue
+            SkymelApiProtobufCodec.add_graph_output_value(graph_output, name, value)
+
+        for image_input_name in self.image_input_names:
+            images = payload.get(image_input_name, None)
+            if images is None:
+                continue
+            for image in (images if isinstance(images, (list, tuple)) else [images]):
+                inference_request.images.append(SkymelApiProtobufCodec.make_image(image))
+
+        inference_request.graph_output.append(graph_output)
+        return inference_request.SerializeToString(deterministic=True)
+
+    @staticmethod
+    def encode_request_id(request_id: Optional[str] = None) -> bytes:
+        """
+        Encode an ``InferenceRequest`` holding only a request ID.
+
+        Serialized protobuf messages merge when concatenated, so appending these bytes to a request encoded without an
+        ID gives the same message as encoding it with the ID.
+
+        Args:
+            request_id: Request ID, or None for a random ID
+        """
+        return skymel_modelio_pb2.InferenceRequest(request_id=request_id or uuid.uuid4().hex).SerializeToString()
+
+    @staticmethod
+    def decode_graph_output_value(field_name: str, typed_output) -> Any:
+        """Decode one typed output of a ``GraphOutput`` message."""
+        if field_name == 'string_outputs':
+            output_strings = list(typed_output.output_strings)
+            return output_strings[0] if len(output_strings) == 1 else output_strings
+        if field_name in ('bytes_outputs', 'compressed_bytes_outputs'):
+            return typed_output.output_flat_array
+
+        array = np.asarray(typed_output.output_flat_array,
+                           dtype=SkymelApiProtobufCodec.GRAPH_OUTPUT_FIELD_TO_DTYPE[field_name])
+        array_shape = list(typed_output.array_shape)
+        if len(array_shape) == 0:
+            return array.item() if array.size == 1 else array
+        return array.reshape(array_shape)
+
+    def decode_response(self, response_bytes: bytes) -> Dict[str, Any]:
+        """
+        Decode a serialized ``InferenceResponse`` into backend outputs.
+
+        Args:
+            response_bytes: The serialized message
+
+        Returns:
+            Dictionary of backend outputs
+        """
+        inference_response = skymel_modelio_pb2.InferenceResponse()
+        inference_response.ParseFromString(response_bytes)
+
+        if inference_response.HasField('status') and \
+                inference_response.status.status in SkymelApiProtobufCodec.ERROR_STATUS_CODES:
+            raise SkymelApiCallError(f"Inference error "
+                                     f"{skymel_modelio_pb2.StatusReport.StatusCode.Name(inference_response.status.status)}: "
+                                     f"{inference_response.status.message}")
+
+        backend_outputs = {}
+        for graph_output in inference_response.graph_output:
+            for field_name in ('float_outputs', 'double_outputs', 'int32_outputs', 'int64_outputs', 'boolean_outputs',
+                               'string_outputs', 'bytes_outputs', 'compressed_bytes_outputs'):
+                for typed_output in getattr(graph_output, field_name):
+                    backend_outputs[typed_output.node_name] = SkymelApiProtobufCodec.decode_graph_output_value(
+                        field_name, typed_output)
+
+        if len(inference_response.text_outputs) > 0:
+            backend_outputs['text_outputs'] = list(inference_response.text_outputs)
+        if len(inference_response.integer_outputs) > 0:
+            backend_outputs['integer_outputs'] = list(inference_response.integer_outputs)
+        if len(inference_response.image_outputs) > 0:
+            backend_outputs['image_outputs'] = [
+                getattr(image, image.WhichOneof('image')) if image.WhichOneof('image') is not None else None
+                for image in inference_response.image_outputs]
+        if len(inference_response.classifier_outputs) > 0:
+            backend_outputs['classifier_outputs'] = [
+                [{'class_name': score.class_name, 'class_id': score.class_id,
+                  'probabilistic_confidence': score.probabilistic_confidence}
+                 for score in classifier_output.class_confidence_scores]
+                for classifier_output in inference_response.classifier_outputs]
+        return backend_outputs
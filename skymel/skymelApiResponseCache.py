@@ -0,0 +1,223 @@
+import asyncio
+import collections
+import copy
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .commonValidators import CommonValidators
+
+
+class SkymelApiResponseCache:
+    """
+    Two-tier cache of API responses with per-entry time-to-live.
+
+    The first tier is an in-memory LRU holding at most ``max_entries`` responses. The optional second tier is a sqlite
+    database at ``sqlite_path`` holding at most ``max_disk_entries`` responses, which survives restarts; responses
+    found only on disk are promoted to memory. Responses are returned as copies, so callers cannot modify cached data.
+
+    Nodes opt in through the ``responseCacheConfig`` key of their initialization config, for example::
+
+        'responseCacheConfig': {'enabled': True, 'ttlSeconds': 3600, 'cacheName': 'embeddings',
+                                'maxEntries': 4096, 'sqlitePath': '/var/cache/skymel/embeddings.sqlite'}
+
+    Nodes naming the same cache share it (see ``get_shared_cache``).
+    """
+
+    _cache_name_to_shared_cache = {}
+
+    def __init__(self, max_entries: int = 1024, sqlite_path: Optional[str] = None, max_disk_entries: int = 100000):
+        """
+        Initialize a response cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            sqlite_path: Path of the sqlite database of the on-disk tier, or None for a memory-only cache
+            max_disk_entries: Maximum number of responses kept on disk
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.sqlite_path = sqlite_path
+        self.max_disk_entries = max(1, int(max_disk_entries))
+
+        self.key_to_expiry_time_and_response = collections.OrderedDict()
+
+        self.sqlite_connection = None
+        self.sqlite_lock = threading.Lock()
+        self.disk_write_count = 0
+        if sqlite_path is not None:
+            self.sqlite_connection = sqlite3.connect(sqlite_path, check_same_thread=False)
+            with self.sqlite_lock:
+                self.sqlite_connection.execute(
+                    "CREATE TABLE IF NOT EXISTS api_response_cache "
+                    "(cache_key TEXT PRIMARY KEY, response_json TEXT NOT NULL, expiry_time REAL NOT NULL, "
+                    "write_time REAL NOT NULL)")
+                self.sqlite_connection.commit()
+
+        self.memory_hit_count = 0
+        self.disk_hit_count = 0
+        self.miss_count = 0
+
+    @staticmethod
+    def from_config(response_cache_config: Optional[Dict]) -> Optional['SkymelApiResponseCache']:
+        """
+        Get the shared cache described by a ``responseCacheConfig`` config dictionary.
+
+        Returns:
+            The cache, or None if caching is not enabled
+        """
+        if not CommonValidators.is_non_empty_dict(response_cache_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                response_cache_config, key_name, default_value)
+
+        if get_value('enabled', True) is not True:
+            return None
+
+        return SkymelApiResponseCache.get_shared_cache(
+            cache_name=get_value('cacheName', 'default'),
+            max_entries=get_value('maxEntries', 1024),
+            sqlite_path=get_value('sqlitePath', None),
+            max_disk_entries=get_value('maxDiskEntries', 100000)
+        )
+
+    @staticmethod
+    def get_shared_cache(cache_name: str = 'default', max_entries: int = 1024, sqlite_path: Optional[str] = None,
+                         max_disk_entries: int = 100000) -> 'SkymelApiResponseCache':
+        """
+        Get the cache registered under a name, creating it if needed.
+
+        The size bounds and sqlite path are only used when the cache is created.
+        """
+        shared_cache = SkymelApiResponseCache._cache_name_to_shared_cache.get(cache_name, None)
+        if shared_cache is None:
+            shared_cache = SkymelApiResponseCache(max_entries, sqlite_path, max_disk_entries)
+            SkymelApiResponseCache._cache_name_to_shared_cache[cache_name] = shared_cache
+        return shared_cache
+
+    @staticmethod
+    def close_shared_caches():
+        """Close and forget every shared cache."""
+        for shared_cache in SkymelApiResponseCache._cache_name_to_shared_cache.values():
+            shared_cache.close()
+        SkymelApiResponseCache._cache_name_to_shared_cache = {}
+
+    def get_from_memory(self, cache_key: str) -> Optional[Any]:
+        """Get a live response from the in-memory tier, marking it most recently used."""
+        expiry_time_and_response = self.key_to_expiry_time_and_response.get(cache_key, None)
+        if expiry_time_and_response is None:
+            return None
+        if expiry_time_and_response[0] < time.time():
+            del self.key_to_expiry_time_and_response[cache_key]
+            return None
+        self.key_to_expiry_time_and_response.move_to_end(cache_key)
+        return expiry_time_and_response[1]
+
+    def put_in_memory(self, cache_key: str, response: Any, expiry_time: float):
+        """Store a response in the in-memory tier, evicting the least recently used responses beyond the bound."""
+        self.key_to_expiry_time_and_response[cache_key] = (expiry_time, response)
+        self.key_to_expiry_time_and_response.move_to_end(cache_key)
+        while len(self.key_to_expiry_time_and_response) > self.max_entries:
+            self.key_to_expiry_time_and_response.popitem(last=False)
+
+    def get_from_disk(self, cache_key: str) -> Optional[tuple]:
+        """Get a live response and its expiry time from the on-disk tier."""
+        with self.sqlite_lock:
+            row = self.sqlite_connection.execute(
+                "SELECT response_json, expiry_time FROM api_response_cache WHERE cache_key = ? AND expiry_time >= ?",
+                (cache_key, time.time())).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put_on_disk(self, cache_key: str, response: Any, expiry_time: float):
+        """
+        Store a response in the on-disk tier, periodically dropping expired and excess responses.
+
+        Responses which are not JSON-serializable, e.g. holding NumPy arrays, are only kept in memory.
+        """
+        try:
+            response_json = json.dumps(response)
+        except (TypeError, ValueError):
+            return
+        with self.sqlite_lock:
+            self.sqlite_connection.execute(
+                "INSERT OR REPLACE INTO api_response_cache VALUES (?, ?, ?, ?)",
+                (cache_key, response_json, expiry_time, time.time()))
+            self.disk_write_count += 1
+            if self.disk_write_count % 100 == 0:
+                self.sqlite_connection.execute("DELETE FROM api_response_cache WHERE expiry_time < ?", (time.time(),))
+                self.sqlite_connection.execute(
+                    "DELETE FROM api_response_cache WHERE cache_key NOT IN "
+                    "(SELECT cache_key FROM api_response_cache ORDER BY write_time DESC LIMIT ?)",
+                    (self.max_disk_entries,))
+            self.sqlite_connection.commit()
+
+    async def get(self, cache_key: str) -> Optional[Any]:
+        """
+        Get a cached response.
+
+        Args:
+            cache_key: Key of the response
+
+        Returns:
+            A copy of the cached response, or None if it is not cached or has expired
+        """
+        response = self.get_from_memory(cache_key)
+        if response is not None:
+            self.memory_hit_count += 1
+            return copy.deepcopy(response)
+
+        if self.sqlite_connection is not None:
+            response_and_expiry_time = await asyncio.to_thread(self.get_from_disk, cache_key)
+            if response_and_expiry_time is not None:
+                self.disk_hit_count += 1
+                response, expiry_time = response_and_expiry_time
+                self.put_in_memory(cache_key, response, expiry_time)
+                return copy.deepcopy(response)
+
+        self.miss_count += 1
+        return None
+
+    async def put(self, cache_key: str, response: Any, ttl_seconds: float):
+        """
+        Cache a response.
+
+        Args:
+            cache_key: Key of the response
+            response: JSON-serializable response
+            ttl_seconds: How long the response stays valid
+        """
+        expiry_time = time.time() + ttl_seconds
+        self.put_in_memory(cache_key, copy.deepcopy(response), expiry_time)
+        if self.sqlite_connection is not None:
+            await asyncio.to_thread(self.put_on_disk, cache_key, response, expiry_time)
+
+    def clear(self):
+        """Remove every response from both tiers."""
+        self.key_to_expiry_time_and_response.clear()
+        if self.sqlite_connection is not None:
+            with self.sqlite_lock:
+                self.sqlite_connection.execute("DELETE FROM api_response_cache")
+                self.sqlite_connection.commit()
+
+    def close(self):
+        """Close the on-disk tier; the in-memory tier stays usable."""
+        if self.sqlite_connection is not None:
+            with self.sqlite_lock:
+                self.sqlite_connection.close()
+            self.sqlite_connection = None
+
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """Get hit and miss counts of the cache."""
+        lookup_count = self.memory_hit_count + self.disk_hit_count + self.miss_count
+        return {
+            'memory_hit_count': self.memory_hit_count,
+            'disk_hit_count': self.disk_hit_count,
+            'miss_count': self.miss_count,
+            'hit_rate': ((self.memory_hit_count + self.disk_hit_count) / lookup_count) if lookup_count > 0 else 0,
+            'memory_entry_count': len(self.key_to_expiry_time_and_response)
+        }
@@ -0,0 +1,48 @@
+from .skymelTokenRatioBudget import SkymelTokenRatioBudget
+
+
+class SkymelApiRetryBudget(SkymelTokenRatioBudget):
+    """
+    Process-wide budget capping the extra load created by retried API calls.
+
+    Every call deposits ``retry_budget_ratio`` tokens (up to ``max_tokens``) and every retry spends one token, so
+    retries stay below roughly ``retry_budget_ratio`` of live traffic across the process. When a backend fails every
+    call, retries dry up instead of multiplying the load on it.
+    """
+
+    _process_wide_budget = None
+
+    def __init__(self, retry_budget_ratio: float = 0.1, max_tokens: float = 10.0):
+        """
+        Initialize a retry budget.
+
+        Args:
+            retry_budget_ratio: Fraction of calls that may be retried
+            max_tokens: Maximum number of tokens saved up for bursts of retries
+        """
+        super().__init__(retry_budget_ratio, max_tokens)
+
+    @staticmethod
+    def configure_process_wide_budget(retry_budget_ratio: float, max_tokens: float = 10.0):
+        """Replace the process-wide retry budget."""
+        SkymelApiRetryBudget._process_wide_budget = SkymelApiRetryBudget(retry_budget_ratio, max_tokens)
+
+    @property
+    def retry_budget_ratio(self) -> float:
+        return self.budget_ratio
+
+    @property
+    def retry_count(self) -> int:
+        return self.spent_token_count
+
+    @property
+    def denied_retry_count(self) -> int:
+        return self.denied_spend_count
+
+    def record_call(self):
+        """Deposit the budget earned by one call."""
+        self.deposit()
+
+    def try_spend_retry(self) -> bool:
+        """Take one token for a retry, if the budget allows it."""
+        return self.try_spend()
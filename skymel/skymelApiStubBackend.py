@@ -0,0 +1,253 @@
+import asyncio
+import json
+import math
+import random
+import weakref
+from typing import Any, Dict, Optional
+
+from .commonValidators import CommonValidators
+
+
+class SkymelApiStubBackend:
+    """
+    Local stub backend for measuring external API call nodes without a real endpoint.
+
+    Serves three endpoints on a local port:
+
+    - ``POST /json`` echoes the JSON payload back under ``echo``; batched payloads carrying a list under ``inputs``
+      are answered with one echo per input under ``outputs``.
+    - ``POST /sse`` streams ``stream_chunk_count`` server-sent events ``{"text": "token N "}`` followed by ``[DONE]``.
+    - ``GET /ws`` is a WebSocket answering every JSON message with its echo, carrying back the message's ``requestId``
+      so that multiplexed requests can be correlated; messages with ``"stream": true`` are answered with
+      ``stream_chunk_count`` frames followed by ``{"done": true}``. Failed messages are answered with
+      ``{"error": ..., "status": error_status}``, which nodes configured with ``webSocketErrorKey`` treat as failures.
+
+    Every reply is delayed by a latency drawn from ``latency_distribution``, fails with ``error_status`` with
+    probability ``error_rate``, and is padded with ``response_payload_bytes`` bytes under ``padding``. The backend
+    counts requests, errors and the TCP connections clients opened (see ``get_stub_statistics``). Requires aiohttp.
+    """
+
+    LATENCY_DISTRIBUTIONS = ('constant', 'uniform', 'lognormal')
+
+    def __init__(self,
+                 latency_distribution: str = 'constant',
+                 latency_ms: float = 10.0,
+                 latency_jitter_ms: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 response_payload_bytes: int = 0,
+                 stream_chunk_count: int = 5,
+                 seed: Optional[int] = None):
+        """
+        Initialize a stub backend.
+
+        Args:
+            latency_distribution: 'constant', 'uniform' (latency_ms plus or minus latency_jitter_ms) or 'lognormal'
+                (median latency_ms, with latency_jitter_ms as the typical deviation from it)
+            latency_ms: Typical latency of a reply in milliseconds
+            latency_jitter_ms: Spread of the latency in milliseconds
+            error_rate: Probability, between 0 and 1, that a request fails
+            error_status: HTTP status code of failed requests
+            response_payload_bytes: Number of padding bytes added to every reply
+            stream_chunk_count: Number of chunks of streamed replies
+            seed: Seed of the random generator drawing latencies and errors, for reproducible runs
+        """
+        if latency_distribution not in SkymelApiStubBackend.LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unsupported latency distribution: {latency_distribution}")
+        self.latency_distribution = latency_distribution
+        self.latency_ms = max(0.0, latency_ms)
+        self.latency_jitter_ms = max(0.0, latency_jitter_ms)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response_payload_bytes = max(0, int(response_payload_bytes))
+        self.stream_chunk_count = max(0, int(stream_chunk_count))
+        self.random_generator = random.Random(seed)
+
+        self.runner = None
+        self.base_url = None
+        self.seen_transports = weakref.WeakSet()
+        self.open_websockets = weakref.WeakSet()
+
+        self.request_count = 0
+        self.error_count = 0
+        self.connection_count = 0
+
+    @staticmethod
+    def from_config(stub_backend_config: Optional[Dict]) -> 'SkymelApiStubBackend':
+        """Create a stub backend from a config dictionary; None gives the defaults."""
+        stub_backend_config = stub_backend_config or {}
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                stub_backend_config, key_name, default_value)
+
+        return SkymelApiStubBackend(
+            latency_distribution=get_value('latencyDistribution', 'constant'),
+            latency_ms=get_value('latencyMs', 10.0),
+            latency_jitter_ms=get_value('latencyJitterMs', 0.0),
+            error_rate=get_value('errorRate', 0.0),
+            error_status=get_value('errorStatus', 503),
+            response_payload_bytes=get_value('responsePayloadBytes', 0),
+            stream_chunk_count=get_value('streamChunkCount', 5),
+            seed=get_value('seed', None)
+        )
+
+    def sample_latency_seconds(self) -> float:
+        """Draw the latency of one reply."""
+        if self.latency_distribution == 'uniform':
+            latency_ms = self.random_generator.uniform(self.latency_ms - self.latency_jitter_ms,
+                                                       self.latency_ms + self.latency_jitter_ms)
+        elif self.latency_distribution == 'lognormal' and self.latency_ms > 0:
+            sigma = math.log1p(self.latency_jitter_ms / self.latency_ms)
+            latency_ms = self.latency_ms * math.exp(self.random_generator.gauss(0.0, sigma))
+        else:
+            latency_ms = self.latency_ms
+        return max(0.0, latency_ms) / 1000.0
+
+    def should_fail(self) -> bool:
+        """Draw whether one request fails."""
+        return self.error_rate > 0 and self.random_generator.random() < self.error_rate
+
+    def make_echo_reply(self, payload: Any) -> Dict[str, Any]:
+        """Make the reply to a payload."""
+        if isinstance(payload, dict) and isinstance(payload.get('inputs', None), list):
+            reply = {'outputs': [{'echo': inputs} for inputs in payload['inputs']]}
+        else:
+            reply = {'echo': payload}
+        if self.response_payload_bytes > 0:
+            reply['padding'] = 'x' * self.response_payload_bytes
+        return reply
+
+    def record_request(self, request):
+        """Count a request, and the connection it arrived on if that connection is new."""
+        self.request_count += 1
+        self.record_connection(request)
+
+    def record_connection(self, request):
+        """Count the connection a request arrived on if that connection is new."""
+        transport = request.transport
+        if transport is not None and transport not in self.seen_transports:
+            self.seen_transports.add(transport)
+            self.connection_count += 1
+
+    async def handle_json(self, request):
+        from aiohttp import web
+
+        self.record_request(request)
+        payload = await request.json()
+        await asyncio.sleep(self.sample_latency_seconds())
+        if self.should_fail():
+            self.error_count += 1
+            return web.Response(status=self.error_status, text='Injected stub backend error')
+        return web.json_response(self.make_echo_reply(payload))
+
+    async def handle_sse(self, request):
+        from aiohttp import web
+
+        self.record_request(request)
+        await request.json()
+        await asyncio.sleep(self.sample_latency_seconds())
+        if self.should_fail():
+            self.error_count += 1
+            return web.Response(status=self.error_status, text='Injected stub backend error')
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        for chunk_index in range(self.stream_chunk_count):
+            chunk = {'text': f"token {chunk_index} "}
+            if self.response_payload_bytes > 0 and chunk_index == 0:
+                chunk['padding'] = 'x' * self.response_payload_bytes
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    async def reply_to_websocket_message(self, websocket, message_text: str):
+        payload = json.loads(message_text)
+        request_id = payload.pop('requestId', None) if isinstance(payload, dict) else None
+        await asyncio.sleep(self.sample_latency_seconds())
+
+        if self.should_fail():
+            self.error_count += 1
+            reply = {'error': 'Injected stub backend error', 'status': self.error_status}
+        elif isinstance(payload, dict) and payload.get('stream', False) is True:
+            for chunk_index in range(self.stream_chunk_count):
+                await websocket.send_str(json.dumps({'text': f"token {chunk_index} "}))
+            reply = {'done': True}
+        else:
+            reply = self.make_echo_reply(payload)
+
+        if request_id is not None:
+            reply['requestId'] = request_id
+        await websocket.send_str(json.dumps(reply))
+
+    async def handle_websocket(self, request):
+        from aiohttp import web, WSMsgType
+
+        self.record_connection(request)
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self.open_websockets.add(websocket)
+
+        # Messages are answered concurrently, so replies to multiplexed requests may arrive out of order
+        reply_tasks = set()
+        async for message in websocket:
+            if message.type != WSMsgType.TEXT:
+                continue
+            self.request_count += 1
+            reply_task = asyncio.ensure_future(self.reply_to_websocket_message(websocket, message.data))
+            reply_tasks.add(reply_task)
+            reply_task.add_done_callback(reply_tasks.discard)
+        await asyncio.gather(*reply_tasks, return_exceptions=True)
+        return websocket
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Start serving.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on, or 0 for a free port
+
+        Returns:
+            The base URL of the backend, e.g. 'http://127.0.0.1:54321'
+        """
+        try:
+            from aiohttp import web
+        except ImportError:
+            raise ImportError("aiohttp is required for the stub backend. Install with: pip install aiohttp")
+
+        application = web.Application()
+        application.router.add_post('/json', self.handle_json)
+        application.router.add_post('/sse', self.handle_sse)
+        application.router.add_get('/ws', self.handle_websocket)
+
+        self.runner = web.AppRunner(application)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        self.base_url = f"http://{host}:{site._server.sockets[0].getsockname()[1]}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving and close open connections."""
+        # Open WebSockets would otherwise hold up the graceful shutdown until it times out
+        for websocket in list(self.open_websockets):
+            await websocket.close()
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def __aenter__(self) -> 'SkymelApiStubBackend':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    def get_stub_statistics(self) -> Dict[str, int]:
+        """Get the number of requests served, errors injected and connections opened by clients."""
+        return {
+            'request_count': self.request_count,
+            'error_count': self.error_count,
+            'connection_count': self.connection_count
+        }
@@ -0,0 +1,174 @@
+import asyncio
+import inspect
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from .commonValidators import CommonValidators
+
+
+class SkymelECGraphMicroBatcher:
+    """
+    Collects concurrent single-item calls into batches.
+
+    Callers ``submit`` one item each and wait; once ``max_batch_size`` items are queued, or ``max_batch_wait_ms``
+    milliseconds after the first item of a batch arrived, the whole batch is handed to a batch callable in one call.
+    That callable returns one result per item, in order, and each result is scattered back to the caller that
+    submitted the item. Callers may submit their own batch callable along with their item, such as a bound method of
+    the submitting node; the batch is then processed by the callable submitted with its first item, so a shared
+    batcher never holds on to, or processes batches with, a node that is no longer submitting to it.
+
+    Batches are processed in tasks of their own, never in the task of the caller whose item filled the batch, so that
+    cancelling one caller (for example on a timeout or a lost hedge) cannot cancel the batch of the other callers.
+
+    Batchers are shared through ``get_micro_batcher`` so that nodes of many concurrently executing graphs feed the
+    same batch.
+    """
+
+    _event_loop_to_batcher_key_to_batcher = weakref.WeakKeyDictionary()
+
+    def __init__(self, process_batch_callable: Optional[Callable[[List[Any]], Any]] = None, max_batch_size: int = 32,
+                 max_batch_wait_ms: float = 5.0):
+        """
+        Initialize a micro-batcher.
+
+        Args:
+            process_batch_callable: Callable (sync or async) taking a list of items and returning a list of results,
+                used for batches whose items were submitted without a batch callable of their own
+            max_batch_size: Maximum number of items per batch
+            max_batch_wait_ms: Maximum time the first item of a batch waits for others to join it
+        """
+        self.process_batch_callable = process_batch_callable
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_batch_wait_ms = max_batch_wait_ms
+
+        self.pending_items = []
+        self.pending_futures = []
+        self.pending_batch_callable = None
+        self.flush_timer_task = None
+        # Strong references to running flushes and flush timers, which the event loop only holds weakly
+        self.flush_tasks = set()
+
+        self.processed_batch_count = 0
+        self.processed_item_count = 0
+
+    @staticmethod
+    def get_micro_batcher(batcher_key: str, process_batch_callable: Optional[Callable[[List[Any]], Any]] = None,
+                          max_batch_size: int = 32, max_batch_wait_ms: float = 5.0) -> 'SkymelECGraphMicroBatcher':
+        """
+        Get the batcher registered under a key for the running event loop, creating it if needed.
+
+        The batch callable and limits are only used when the batcher is created. Callers sharing a key must agree on
+        how their items are processed, since a batch mixing their items is processed by one batch callable.
+        """
+        event_loop = asyncio.get_running_loop()
+        batcher_key_to_batcher = SkymelECGraphMicroBatcher._event_loop_to_batcher_key_to_batcher.get(event_loop, None)
+        if batcher_key_to_batcher is None:
+            batcher_key_to_batcher = {}
+            SkymelECGraphMicroBatcher._event_loop_to_batcher_key_to_batcher[event_loop] = batcher_key_to_batcher
+
+        micro_batcher = batcher_key_to_batcher.get(batcher_key, None)
+        if micro_batcher is None:
+            micro_batcher = SkymelECGraphMicroBatcher(process_batch_callable, max_batch_size, max_batch_wait_ms)
+            batcher_key_to_batcher[batcher_key] = micro_batcher
+        return micro_batcher
+
+    async def submit(self, item: Any, process_batch_callable: Optional[Callable[[List[Any]], Any]] = None) -> Any:
+        """
+        Queue one item and wait for its result.
+
+        Args:
+            item: Item to include in the next batch
+            process_batch_callable: Batch callable of the submitter, used if this item is the first of its batch
+
+        Returns:
+            The result produced for this item
+        """
+        future = asyncio.get_running_loop().create_future()
+        if len(self.pending_items) == 0:
+            self.pending_batch_callable = process_batch_callable
+        self.pending_items.append(item)
+        self.pending_futures.append(future)
+
+        if len(self.pending_items) >= self.max_batch_size:
+            # The batch is taken now but processed in a task of its own, out of reach of this caller's cancellation
+            batch_items, batch_futures, batch_callable = self._take_pending_batch()
+            flush_task = asyncio.ensure_future(self._process_batch(batch_items, batch_futures, batch_callable))
+            self.flush_tasks.add(flush_task)
+            flush_task.add_done_callback(self.flush_tasks.discard)
+        elif self.flush_timer_task is None:
+            self.flush_timer_task = asyncio.ensure_future(self._flush_after_max_batch_wait())
+            self.flush_tasks.add(self.flush_timer_task)
+            self.flush_timer_task.add_done_callback(self.flush_tasks.discard)
+
+        return await future
+
+    async def _flush_after_max_batch_wait(self):
+        await asyncio.sleep(self.max_batch_wait_ms / 1000.0)
+        await self.flush()
+
+    def _take_pending_batch(self):
+        # The timer is forgotten once its batch is taken, so the next submitted item starts a new one
+        if self.flush_timer_task is not None:
+            if self.flush_timer_task is not asyncio.current_task():
+                self.flush_timer_task.cancel()
+            self.flush_timer_task = None
+
+        batch_items = self.pending_items
+        batch_futures = self.pending_futures
+        batch_callable = self.pending_batch_callable or self.process_batch_callable
+        self.pending_items = []
+        self.pending_futures = []
+        self.pending_batch_callable = None
+        return batch_items, batch_futures, batch_callable
+
+    async def flush(self):
+        """
+        Process every queued item as one batch.
+
+        Every caller waiting on the batch is answered even if the flush itself is interrupted: a failed batch raises
+        its exception to each of them, and a cancelled flush cancels their waits.
+        """
+        batch_items, batch_futures, batch_callable = self._take_pending_batch()
+        await self._process_batch(batch_items, batch_futures, batch_callable)
+
+    async def _process_batch(self, batch_items: List[Any], batch_futures: List[asyncio.Future],
+                             batch_callable: Optional[Callable[[List[Any]], Any]]):
+        if len(batch_items) == 0:
+            return
+
+        try:
+            if batch_callable is None:
+                raise RuntimeError("No batch callable to process the batch with.")
+            batch_results = batch_callable(batch_items)
+            if inspect.isawaitable(batch_results):
+                batch_results = await batch_results
+            if not CommonValidators.is_list(batch_results) and not CommonValidators.is_tuple(batch_results):
+                batch_results = list(batch_results)
+            if len(batch_results) != len(batch_items):
+                raise RuntimeError(
+                    f"Batch processing returned {len(batch_results)} results for {len(batch_items)} inputs.")
+        except BaseException as e:
+            for future in batch_futures:
+                if not future.done():
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                    else:
+                        future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        self.processed_batch_count += 1
+        self.processed_item_count += len(batch_items)
+        for future, result in zip(batch_futures, batch_results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_batching_statistics(self) -> Dict[str, Any]:
+        """Get the number of batches and items processed so far."""
+        return {
+            'processed_batch_count': self.processed_batch_count,
+            'processed_item_count': self.processed_item_count,
+            'average_batch_size': (self.processed_item_count / self.processed_batch_count)
+            if self.processed_batch_count > 0 else 0
+        }
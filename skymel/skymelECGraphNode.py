@@ -1,7 +1,11 @@
+import asyncio
+import inspect
 import re
 
 from .commonUtils import generate_unique_string_key, maybe_convert_bytes_to_string
 from .commonValidators import CommonValidators
+from .skymelECGraphNodeExecutionPolicy import SkymelECGraphNodeExecutionPolicy
+from .skymelECGraphNodeHedgingPolicy import SkymelECGraphNodeHedgingPolicy
 
 
 class SkymelECGraphNode(object):
@@ -28,7 +32,32 @@ class SkymelECGraphNode(object):
         self.logged_node_errors = []
         self.on_execution_complete_callback = None
 
-
+        # Streaming: consumers declare themselves streaming-capable by providing a chunk subroutine.
+        self.node_streaming_input_chunk_subroutine = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'nodeStreamingInputChunkSubroutine', None)
+        self.node_streaming_chunk_aggregator = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'nodeStreamingChunkAggregator', None)
+        self.streaming_chunk_consumer_nodes = []
+
+        # Optional callable, plain or async, run by warm_up to pay one-time costs before the first execution
+        self.node_warm_up_subroutine = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'nodeWarmUpSubroutine', None)
+
+        # Resource tags, such as {"api.openai": 1, "cpu": 1}, used by the graph to gate dispatch of this node.
+        self.node_resources = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'resources', {})
+
+        # Timeout and retry policy applied to the work of every execution
+        self.node_execution_policy = SkymelECGraphNodeExecutionPolicy.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                initialization_config, 'nodeExecutionPolicy', None))
+        self.execution_retry_count = 0
+
+        # Speculative duplicate attempts for executions running past the recorded latency percentile
+        self.node_hedging_policy = SkymelECGraphNodeHedgingPolicy.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                initialization_config, 'nodeHedgingPolicy', None))
+        self.hedged_attempt_count = 0
 
     @staticmethod
     def generate_node_id(node_id_prefix: str | None = None, node_id_suffix: str | None = None) -> str:
@@ -56,7 +85,7 @@ class SkymelECGraphNode(object):
         if not SkymelECGraphNode.is_valid_node_output_name(node_output_name):
             return None
         name_parts = node_output_name.split(".")
-        node_id_parts = name_parts[:-2]
+        node_id_parts = name_parts[:-1]
         return ".".join(node_id_parts)
 
     def set_node_id(self, node_id: str):
@@ -118,6 +147,12 @@ class SkymelECGraphNode(object):
     def get_on_execution_complete_callback(self):
         return self.on_execution_complete_callback
 
+    def set_node_resources(self, node_resources: dict):
+        self.node_resources = node_resources
+
+    def get_node_resources(self) -> dict:
+        return self.node_resources
+
     def log_node_error(self, error_message: str | None = None):
         self.logged_node_errors.append(error_message)
 
@@ -171,6 +206,10 @@ class SkymelECGraphNode(object):
         """Get the last execution result."""
         return self.last_execution_result
 
+    def release_last_execution_result(self):
+        """Drop the reference to the last execution result so it can be garbage collected."""
+        self.last_execution_result = None
+
     def is_node_valid(self, reference_graph=None) -> bool:
         """Check if this node is valid."""
         if not CommonValidators.is_non_empty_string(self.node_id):
@@ -223,10 +262,9 @@ class SkymelECGraphNode(object):
             # Execute the node subroutine
             if CommonValidators.is_callable_method(self.node_subroutine):
                 # Call the subroutine with appropriate parameters
-                if input_values is None:
-                    result = await self.node_subroutine() if hasattr(self.node_subroutine, '__call__') else self.node_subroutine
-                else:
-                    result = await self.node_subroutine(input_values) if hasattr(self.node_subroutine, '__call__') else self.node_subroutine
+                result = await self.run_with_node_execution_policy(
+                    lambda: self.run_node_subroutine(input_values),
+                    allow_repeated_attempts=not self.is_streaming_subroutine())
                 
                 # Store the result
                 self.last_execution_result = result if isinstance(result, dict) else {'result': result}
@@ -269,10 +307,240 @@ class SkymelECGraphNode(object):
             
             return False
 
+    def set_node_execution_policy(self, node_execution_policy: SkymelECGraphNodeExecutionPolicy | None):
+        self.node_execution_policy = node_execution_policy
+
+    def get_node_execution_policy(self) -> SkymelECGraphNodeExecutionPolicy | None:
+        return self.node_execution_policy
+
+    def set_node_hedging_policy(self, node_hedging_policy: SkymelECGraphNodeHedgingPolicy | None):
+        self.node_hedging_policy = node_hedging_policy
+
+    def get_node_hedging_policy(self) -> SkymelECGraphNodeHedgingPolicy | None:
+        return self.node_hedging_policy
+
+    def is_streaming_subroutine(self) -> bool:
+        """Check if the node subroutine is an async generator function, whose chunks are pushed downstream."""
+        return (inspect.isasyncgenfunction(self.node_subroutine) or
+                inspect.isasyncgenfunction(getattr(self.node_subroutine, '__call__', None)))
+
+    async def run_with_node_execution_policy(self, attempt_callable, is_retry_allowed_callable=None,
+                                             allow_repeated_attempts: bool = True):
+        """
+        Run the work of one execution under the node execution and hedging policies, if they are configured.
+
+        Attempts which push chunks to streaming consumers as they run must pass ``allow_repeated_attempts=False``:
+        their chunks cannot be taken back, so a hedged or retried attempt would deliver them a second time. Such
+        executions are neither hedged nor retried, though the execution policy timeout still applies.
+
+        Args:
+            attempt_callable: Zero-argument callable returning a fresh awaitable for every attempt
+            is_retry_allowed_callable: Optional callable invoked with the exception of a failed attempt; returning
+                False prevents the execution policy from retrying
+            allow_repeated_attempts: Whether the work may be hedged and retried
+
+        Returns:
+            The result of the first successful attempt
+        """
+        if not allow_repeated_attempts:
+            def is_retry_allowed_callable(exception):
+                return False
+        elif self.node_hedging_policy is not None:
+            unhedged_attempt_callable = attempt_callable
+
+            def on_hedge(hedged_attempt_count):
+                self.hedged_attempt_count += 1
+
+            def attempt_callable():
+                return self.node_hedging_policy.run(unhedged_attempt_callable, self.execution_timings_milliseconds,
+                                                    on_hedge)
+
+        if self.node_execution_policy is None:
+            return await attempt_callable()
+
+        def on_retry(retry_index, exception):
+            self.execution_retry_count += 1
+            if self.node_log_errors:
+                self.log_node_error(f"Retrying node {self.node_id} after attempt {retry_index + 1} failed: {str(exception)}")
+
+        return await self.node_execution_policy.run(attempt_callable, on_retry, is_retry_allowed_callable)
+
+    async def run_node_subroutine(self, input_values: dict = None):
+        """
+        Call the node subroutine and return its complete result.
+
+        Subroutines may be coroutine functions, plain functions or async generators. Chunks yielded by an async
+        generator are pushed to the streaming consumers of this node as they are produced, and the aggregated
+        chunks are returned as the result.
+        """
+        if input_values is None:
+            result = self.node_subroutine()
+        else:
+            result = self.node_subroutine(input_values)
+
+        if inspect.isasyncgen(result):
+            return await self.collect_and_push_streaming_chunks(result)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    def clone(self) -> 'SkymelECGraphNode':
+        """
+        Create a node with the same configuration and fresh execution state.
+
+        The clone shares this node's configuration, subroutines and policies instead of rebuilding them from the
+        initialization config, which makes cloning much cheaper than constructing a node. Subclasses holding further
+        execution state override this method to reset it on the clone.
+
+        Returns:
+            The cloned node
+        """
+        # Copying the attribute dictionary directly is several times faster than copy.copy
+        cloned_node = self.__class__.__new__(self.__class__)
+        cloned_node.__dict__.update(self.__dict__)
+        cloned_node.execution_timings_milliseconds = []
+        cloned_node.execution_run_success_statuses = []
+        cloned_node.last_execution_result = None
+        cloned_node.logged_node_errors = []
+        cloned_node.streaming_chunk_consumer_nodes = []
+        cloned_node.execution_retry_count = 0
+        cloned_node.hedged_attempt_count = 0
+        return cloned_node
+
+    async def warm_up(self, parent_graph=None) -> bool:
+        """
+        Pay one-time costs, such as imports, model loads or connection setup, before the first execution.
+
+        Runs the node's warm-up subroutine, if any. Can be overridden by subclasses. Failures are logged, not raised:
+        warming up is best-effort and the first execution still pays whatever was not warmed up.
+
+        Args:
+            parent_graph: Graph the node will be executed in
+
+        Returns:
+            True if the node warmed up successfully, False otherwise
+        """
+        if not CommonValidators.is_callable_method(self.node_warm_up_subroutine):
+            return True
+        try:
+            result = self.node_warm_up_subroutine()
+            if inspect.isawaitable(result):
+                await result
+            return True
+        except Exception as e:
+            self.log_node_error(f"Warm-up of node {self.node_id} failed: {str(e)}")
+            return False
+
+    def set_streaming_chunk_consumer_nodes(self, streaming_chunk_consumer_nodes: list):
+        self.streaming_chunk_consumer_nodes = streaming_chunk_consumer_nodes
+
+    def get_streaming_chunk_consumer_nodes(self) -> list:
+        return self.streaming_chunk_consumer_nodes
+
+    def is_streaming_input_capable(self) -> bool:
+        """Check if this node wants to receive the chunks of its streaming parents as they are produced."""
+        return CommonValidators.is_callable_method(self.node_streaming_input_chunk_subroutine)
+
+    async def consume_streaming_input_chunk(self, producer_node_id: str, chunk):
+        """Receive one chunk streamed by a parent node. Can be overridden by subclasses."""
+        result = self.node_streaming_input_chunk_subroutine(producer_node_id, chunk)
+        if inspect.isawaitable(result):
+            await result
+
+    async def collect_and_push_streaming_chunks(self, chunk_iterator, aggregate_chunks: bool = True,
+                                                max_buffered_chunks: int = 0):
+        """
+        Drain an async iterator of chunks, forwarding every chunk to the streaming consumers of this node.
+
+        Each consumer is fed through its own queue, so consumers process chunk N while this node produces chunk N+1.
+
+        Args:
+            chunk_iterator: Async iterator yielding output chunks
+            aggregate_chunks: Whether to keep the chunks and return their aggregate
+            max_buffered_chunks: Maximum number of chunks queued per consumer before this node waits for it, or 0
+                for no limit
+
+        Returns:
+            The aggregated chunks, or the number of chunks if aggregate_chunks is False
+        """
+        end_of_stream = object()
+        consumer_queues = []
+        consumer_tasks = []
+
+        async def drain_queue_into_consumer(consumer_node, consumer_queue):
+            # A failed consumer keeps draining its queue so that the producer never waits on a full queue
+            consumer_exception = None
+            while True:
+                chunk = await consumer_queue.get()
+                if chunk is end_of_stream:
+                    break
+                if consumer_exception is None:
+                    try:
+                        await consumer_node.consume_streaming_input_chunk(self.node_id, chunk)
+                    except Exception as e:
+                        consumer_exception = e
+            if consumer_exception is not None:
+                raise consumer_exception
+
+        for consumer_node in self.streaming_chunk_consumer_nodes:
+            consumer_queue = asyncio.Queue(maxsize=max(0, max_buffered_chunks))
+            consumer_queues.append(consumer_queue)
+            consumer_tasks.append(asyncio.create_task(drain_queue_into_consumer(consumer_node, consumer_queue)))
+
+        chunks = []
+        chunk_count = 0
+        try:
+            async for chunk in chunk_iterator:
+                chunk_count += 1
+                if aggregate_chunks:
+                    chunks.append(chunk)
+                for consumer_queue in consumer_queues:
+                    await consumer_queue.put(chunk)
+        finally:
+            for consumer_queue in consumer_queues:
+                await consumer_queue.put(end_of_stream)
+            if consumer_tasks:
+                await asyncio.gather(*consumer_tasks)
+
+        if not aggregate_chunks:
+            return chunk_count
+        if CommonValidators.is_callable_method(self.node_streaming_chunk_aggregator):
+            return self.node_streaming_chunk_aggregator(chunks)
+        return SkymelECGraphNode.aggregate_streaming_chunks(chunks)
+
+    @staticmethod
+    def aggregate_streaming_chunks(chunks: list):
+        """
+        Default aggregation of streamed chunks: strings and bytes are concatenated, dicts are merged key by key
+        (concatenating string and list values), anything else is returned as the list of chunks.
+        """
+        if len(chunks) == 0:
+            return None
+        if all(isinstance(chunk, str) for chunk in chunks):
+            return "".join(chunks)
+        if all(isinstance(chunk, bytes) for chunk in chunks):
+            return b"".join(chunks)
+        if all(isinstance(chunk, dict) for chunk in chunks):
+            output = {}
+            for chunk in chunks:
+                for key, value in chunk.items():
+                    previous_value = output.get(key, None)
+                    if isinstance(previous_value, str) and isinstance(value, str):
+                        output[key] = previous_value + value
+                    elif isinstance(previous_value, list) and isinstance(value, list):
+                        output[key] = previous_value + value
+                    else:
+                        output[key] = value
+            return output
+        return list(chunks)
+
     async def dispose(self) -> bool:
         """Dispose of the node and clean up resources."""
         self.last_execution_result = None
         self.execution_timings_milliseconds.clear()
         self.execution_run_success_statuses.clear()
         self.logged_node_errors.clear()
+        self.streaming_chunk_consumer_nodes = []
+        self.execution_retry_count = 0
+        self.hedged_attempt_count = 0
         return True
\ No newline at end of file
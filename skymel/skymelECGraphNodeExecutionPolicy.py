@@ -0,0 +1,132 @@
+import asyncio
+import random
+from typing import Any, Callable, Dict, List, Optional
+
+from .commonValidators import CommonValidators
+
+
+class SkymelECGraphNodeExecutionPolicy:
+    """
+    Timeout and retry policy applied to the work of a single node execution.
+
+    Created from the ``nodeExecutionPolicy`` key of a node's initialization config, for example::
+
+        'nodeExecutionPolicy': {
+            'timeoutSeconds': 5.0,
+            'maxRetries': 3,
+            'retryBackoffSeconds': 0.2,
+            'retryBackoffMaxSeconds': 5.0,
+            'retryBackoffJitter': True,
+            'retryableExceptionTypes': ['TimeoutError', 'ConnectionError']
+        }
+
+    Retryable exception types may be given as exception classes or as class names; a name matches the raised exception
+    if it names the exception's class or any of its base classes. By default every ``Exception`` is retryable.
+    """
+
+    DEFAULT_RETRYABLE_EXCEPTION_TYPES = ['Exception']
+
+    def __init__(self,
+                 timeout_seconds: Optional[float] = None,
+                 max_retries: int = 0,
+                 retry_backoff_seconds: float = 0.1,
+                 retry_backoff_max_seconds: float = 10.0,
+                 retry_backoff_jitter: bool = True,
+                 retryable_exception_types: Optional[List] = None):
+        """
+        Initialize a node execution policy.
+
+        Args:
+            timeout_seconds: Time limit for each attempt, or None for no limit
+            max_retries: Number of retries after the first failed attempt
+            retry_backoff_seconds: Base delay before the first retry; doubled on every further retry
+            retry_backoff_max_seconds: Upper bound on the delay between retries
+            retry_backoff_jitter: Whether to draw each delay uniformly between zero and the backoff ("full jitter")
+            retryable_exception_types: Exception classes or class names which may be retried
+        """
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retry_backoff_max_seconds = retry_backoff_max_seconds
+        self.retry_backoff_jitter = retry_backoff_jitter
+        self.retryable_exception_types = (retryable_exception_types if CommonValidators.is_non_empty_list(
+            retryable_exception_types) else list(SkymelECGraphNodeExecutionPolicy.DEFAULT_RETRYABLE_EXCEPTION_TYPES))
+
+    @staticmethod
+    def from_config(node_execution_policy_config: Optional[Dict]) -> Optional['SkymelECGraphNodeExecutionPolicy']:
+        """
+        Create a policy from a ``nodeExecutionPolicy`` config dictionary.
+
+        Returns:
+            The policy, or None if no policy is configured
+        """
+        if not CommonValidators.is_non_empty_dict(node_execution_policy_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                node_execution_policy_config, key_name, default_value)
+
+        return SkymelECGraphNodeExecutionPolicy(
+            timeout_seconds=get_value('timeoutSeconds', None),
+            max_retries=get_value('maxRetries', 0),
+            retry_backoff_seconds=get_value('retryBackoffSeconds', 0.1),
+            retry_backoff_max_seconds=get_value('retryBackoffMaxSeconds', 10.0),
+            retry_backoff_jitter=get_value('retryBackoffJitter', True),
+            retryable_exception_types=get_value('retryableExceptionTypes', None)
+        )
+
+    def is_retryable_exception(self, exception: BaseException) -> bool:
+        """Check if an exception raised by an attempt may be retried under this policy."""
+        exception_class_names = {exception_class.__name__ for exception_class in type(exception).__mro__}
+        for retryable_exception_type in self.retryable_exception_types:
+            if CommonValidators.is_class(retryable_exception_type):
+                if isinstance(exception, retryable_exception_type):
+                    return True
+            elif retryable_exception_type in exception_class_names:
+                return True
+        return False
+
+    def get_retry_delay_seconds(self, retry_index: int) -> float:
+        """Get the delay before the retry with the given zero-based index."""
+        backoff_seconds = min(self.retry_backoff_max_seconds, self.retry_backoff_seconds * (2 ** retry_index))
+        if self.retry_backoff_jitter:
+            return random.uniform(0, backoff_seconds)
+        return backoff_seconds
+
+    async def run_attempt(self, attempt_callable: Callable[[], Any]) -> Any:
+        """Run one attempt, bounded by the policy timeout."""
+        if self.timeout_seconds is None:
+            return await attempt_callable()
+        return await asyncio.wait_for(attempt_callable(), timeout=self.timeout_seconds)
+
+    async def run(self, attempt_callable: Callable[[], Any], on_retry_callback: Optional[Callable] = None,
+                  is_retry_allowed_callable: Optional[Callable[[BaseException], bool]] = None) -> Any:
+        """
+        Run ``attempt_callable`` under this policy.
+
+        Args:
+            attempt_callable: Zero-argument callable returning a fresh awaitable for every attempt
+            on_retry_callback: Optional callable invoked with ``(retry_index, exception)`` before each retry
+            is_retry_allowed_callable: Optional callable invoked with the exception of a failed attempt; returning
+                False prevents any retry, e.g. while work of the failed attempt cannot be stopped
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            The exception of the last attempt if it was not retryable or no retries were left
+        """
+        retry_index = 0
+        while True:
+            try:
+                return await self.run_attempt(attempt_callable)
+            except Exception as e:
+                if retry_index >= self.max_retries or not self.is_retryable_exception(e):
+                    raise
+                if is_retry_allowed_callable is not None and not is_retry_allowed_callable(e):
+                    raise
+                if on_retry_callback is not None:
+                    on_retry_callback(retry_index, e)
+                await asyncio.sleep(self.get_retry_delay_seconds(retry_index))
+                retry_index += 1
@@ -1,8 +1,14 @@
 import time
 import json
-from typing import Dict, List, Optional, Any, Union
+import asyncio
+import inspect
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
+import numpy as np
 from .skymelECGraphNode import SkymelECGraphNode
+from .commonHashUtils import CommonHashUtils
 from .commonValidators import CommonValidators
+from .skymelECGraphMicroBatcher import SkymelECGraphMicroBatcher
+from .skymelECGraphNodeInputSchema import SkymelECGraphNodeInputSchema
 
 
 class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
@@ -40,10 +46,75 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
             self.data_processing_config, 'errorHandlingMode', 'strict'
         )
         
+        # Compiled once here so that validating each input costs a handful of direct checks per field
+        self.input_schema = SkymelECGraphNodeInputSchema.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                self.data_processing_config, 'inputSchema', None
+            )
+        )
+        self.last_input_validation_errors = []
+        
+        # 'standard' copies sequences into lists and attaches stats to every output; 'columnar' keeps arrays as
+        # NumPy arrays and stores metadata and stats on the node only
+        self.output_format = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.data_processing_config, 'outputFormat', 'standard'
+        )
+        
+        # Opt-in micro-batching of concurrent process_data calls into process_data_batch calls
+        self.micro_batching_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.data_processing_config, 'microBatching', {}
+        )
+        
+        self.micro_batching_enabled = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.micro_batching_config, 'enabled', False
+        )
+        
+        self.max_batch_size = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.micro_batching_config, 'maxBatchSize', 32
+        )
+        
+        self.max_batch_wait_ms = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.micro_batching_config, 'maxBatchWaitMs', 5.0
+        )
+        
+        # Nodes sharing a batch group key share one batch, e.g. the same node in many graph instances. The default key
+        # includes a fingerprint of the node's configuration, so that only identically configured nodes share a batch
+        self.micro_batch_group_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.micro_batching_config, 'batchGroupKey', None
+        )
+        
+        # Opt-in chunked streaming of one large input through process_data_stream
+        self.streaming_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.data_processing_config, 'streaming', {}
+        )
+        
+        self.streaming_enabled = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.streaming_config, 'enabled', False
+        )
+        
+        self.stream_chunk_size = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.streaming_config, 'chunkSize', 65536
+        )
+        
+        # Defaults to the only input name of the node
+        self.stream_input_name = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.streaming_config, 'streamInputName', None
+        )
+        
+        # Without aggregation the node keeps no output chunks and its result is the number of chunks streamed
+        self.aggregate_stream_output_chunks = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.streaming_config, 'aggregateOutputChunks', True
+        )
+        
+        self.max_buffered_stream_chunks = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.streaming_config, 'maxBufferedChunks', 4
+        )
+        
         # Processing statistics
         self.processed_data_count = 0
         self.processing_errors = []
         self.last_processing_metadata = None
+        self.last_output_processing_stats = None
 
     def validate_input_data(self, input_data: Any) -> bool:
         """
@@ -67,6 +138,17 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
             if not isinstance(input_data, dict):
                 return self.error_handling_mode != 'strict'
             
+            if self.input_schema is not None:
+                self.last_input_validation_errors = self.input_schema.validate(input_data)
+                if len(self.last_input_validation_errors) > 0:
+                    error_msg = f"Input schema validation failed: {SkymelECGraphNodeInputSchema.format_errors(self.last_input_validation_errors)}"
+                    self.processing_errors.append(error_msg)
+                    
+                    if self.node_log_errors:
+                        self.log_node_error(error_msg)
+                    
+                    return self.error_handling_mode != 'strict'
+            
             return True
             
         except Exception as e:
@@ -78,6 +160,10 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
             
             return self.error_handling_mode == 'lenient'
 
+    def get_last_input_validation_errors(self) -> List[Dict[str, Any]]:
+        """Get the structured input schema errors found by the last input validation."""
+        return self.last_input_validation_errors
+
     def format_output_data(self, processed_data: Any) -> Dict[str, Any]:
         """
         Format processed data into the expected output format.
@@ -91,6 +177,9 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
         if not self.output_formatting_enabled:
             return processed_data if isinstance(processed_data, dict) else {'result': processed_data}
         
+        if self.output_format == 'columnar':
+            return self.format_output_data_as_columns(processed_data)
+        
         try:
             # Create standardized output format
             output = {}
@@ -109,11 +198,7 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
                 output['metadata'] = self.last_processing_metadata
             
             # Add processing statistics
-            output['processing_stats'] = {
-                'processed_count': self.processed_data_count,
-                'node_id': self.node_id,
-                'processing_timestamp': time.time() * 1000
-            }
+            output['processing_stats'] = self.record_output_processing_stats()
             
             return output
             
@@ -131,6 +216,96 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
                 'node_id': self.node_id
             }
 
+    def record_output_processing_stats(self) -> Dict[str, Any]:
+        """
+        Record the processing statistics of the output being formatted on the node.
+        
+        Returns:
+            Processing statistics dictionary
+        """
+        self.last_output_processing_stats = {
+            'processed_count': self.processed_data_count,
+            'node_id': self.node_id,
+            'processing_timestamp': time.time() * 1000
+        }
+        return self.last_output_processing_stats
+
+    @staticmethod
+    def convert_sequence_to_columns(processed_data: Union[list, tuple]) -> Any:
+        """
+        Convert a list or tuple into columnar form without building intermediate Python lists.
+        
+        Sequences of numbers become a typed NumPy array, sequences of dicts sharing the same keys become a dict of
+        per-key NumPy arrays (a columnar record), and anything else, including ragged sequences whose values do not
+        form regular arrays, is returned unchanged.
+        
+        Args:
+            processed_data: List or tuple to convert
+            
+        Returns:
+            NumPy array, dict of NumPy arrays, or the unchanged sequence
+        """
+        if len(processed_data) == 0:
+            return processed_data
+        
+        first_item = processed_data[0]
+        if CommonValidators.is_number(first_item):
+            try:
+                numeric_array = np.asarray(processed_data)
+            except (ValueError, TypeError):
+                return processed_data
+            if numeric_array.dtype.kind in 'biufc':
+                return numeric_array
+            return processed_data
+        
+        if CommonValidators.is_dict(first_item):
+            column_names = first_item.keys()
+            if all(CommonValidators.is_dict(item) and item.keys() == column_names for item in processed_data):
+                columns = {}
+                for column_name in column_names:
+                    try:
+                        column = np.asarray([item[column_name] for item in processed_data])
+                    except (ValueError, TypeError):
+                        return processed_data
+                    if column.dtype.kind == 'O':
+                        return processed_data
+                    columns[column_name] = column
+                return columns
+        
+        return processed_data
+
+    def format_output_data_as_columns(self, processed_data: Any) -> Dict[str, Any]:
+        """
+        Format processed data in columnar mode.
+        
+        Dicts are returned as they are, NumPy arrays are kept without copying, and lists or tuples are converted by
+        `convert_sequence_to_columns`. Metadata and processing statistics are stored on the node instead of being
+        copied into the output.
+        
+        Args:
+            processed_data: Data that has been processed
+            
+        Returns:
+            Formatted output dictionary
+        """
+        self.record_output_processing_stats()
+        
+        if isinstance(processed_data, dict):
+            return processed_data
+        
+        if isinstance(processed_data, np.ndarray):
+            return {'items': processed_data, 'count': len(processed_data) if processed_data.ndim > 0 else 1}
+        
+        if isinstance(processed_data, (list, tuple)):
+            return {'items': SkymelECGraphNodeForDataProcessing.convert_sequence_to_columns(processed_data),
+                    'count': len(processed_data)}
+        
+        return {'result': processed_data}
+
+    def get_last_output_processing_stats(self) -> Optional[Dict[str, Any]]:
+        """Get the processing statistics recorded for the last formatted output."""
+        return self.last_output_processing_stats
+
     def process_data(self, input_data: Any) -> Any:
         """
         Abstract method for data processing logic.
@@ -144,6 +319,155 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
         """
         raise NotImplementedError("Subclasses must implement process_data method")
 
+    def process_data_batch(self, list_of_input_data: List[Any]) -> List[Any]:
+        """
+        Process a batch of inputs collected by the micro-batcher.
+        Can be overridden by subclasses with a vectorized implementation.
+        
+        Args:
+            list_of_input_data: Preprocessed inputs of concurrent executions
+            
+        Returns:
+            List with one processed result per input, in the same order
+        """
+        return [self.process_data(input_data) for input_data in list_of_input_data]
+
+    def get_initialization_config_fingerprint(self) -> str:
+        """
+        Get a fingerprint identifying this node's configuration.
+        
+        Returns:
+            A canonical hash of the initialization config, or, if it cannot be serialized to JSON, the identity of the
+            config object, which clones of this node share
+        """
+        try:
+            return CommonHashUtils.generate_canonical_json_hash(self.initialization_config, max_length=16)
+        except (TypeError, ValueError):
+            return f"config-{id(self.initialization_config)}"
+
+    def get_micro_batch_group_key(self) -> str:
+        """
+        Get the key of the batch this node's executions join.
+        
+        Returns:
+            The configured batchGroupKey, or a key built from the node class, node ID and configuration fingerprint
+        """
+        if self.micro_batch_group_key is None:
+            self.micro_batch_group_key = (f"{type(self).__module__}.{type(self).__qualname__}.{self.node_id}|"
+                                          f"{self.get_initialization_config_fingerprint()}")
+        return self.micro_batch_group_key
+
+    def get_micro_batcher(self) -> SkymelECGraphMicroBatcher:
+        """Get the micro-batcher shared by all nodes in this node's batch group."""
+        return SkymelECGraphMicroBatcher.get_micro_batcher(
+            self.get_micro_batch_group_key(), None, self.max_batch_size, self.max_batch_wait_ms
+        )
+
+    async def run_processing_stages_with_micro_batching(self, processing_input: Any) -> Any:
+        """
+        Run the processing stages, with the main data processing batched together with concurrent executions.
+        
+        Args:
+            processing_input: Input data for the node
+            
+        Returns:
+            Final processed data
+        """
+        preprocessing_result = self.pre_process_hook(processing_input)
+        processed_data = await self.get_micro_batcher().submit(preprocessing_result, self.process_data_batch)
+        return self.post_process_hook(processed_data, processing_input)
+
+    def process_data_stream(self, input_chunks: AsyncIterator[Any], input_data: Any) -> Any:
+        """
+        Process a stream of input chunks into a stream of output chunks.
+        Can be overridden by subclasses with a generator or async generator function.
+        
+        Args:
+            input_chunks: Async iterator over chunks of the streamed input
+            input_data: Preprocessed input data, including the unchunked values of the other inputs
+            
+        Returns:
+            Iterator or async iterator of output chunks
+        """
+        async def process_input_chunks():
+            async for input_chunk in input_chunks:
+                yield self.process_data(input_chunk)
+        
+        return process_input_chunks()
+
+    def get_stream_input_name(self) -> str:
+        """Get the name of the input which is streamed in chunks."""
+        if self.stream_input_name is not None:
+            return self.stream_input_name
+        if CommonValidators.is_list(self.node_input_names) and len(self.node_input_names) == 1:
+            return self.node_input_names[0]
+        raise RuntimeError(f"Node {self.node_id} must set streamInputName to stream one of several inputs.")
+
+    @staticmethod
+    async def iterate_in_chunks(stream_input_value: Any, chunk_size: int) -> AsyncIterator[Any]:
+        """
+        Iterate over an input value in chunks.
+        
+        Async iterators and iterators are passed through chunk by chunk, file-like objects are read ``chunk_size``
+        units at a time, and strings, bytes, lists, tuples and NumPy arrays are sliced into ``chunk_size`` long
+        chunks (NumPy slices are views, so no data is copied).
+        
+        Args:
+            stream_input_value: Value to iterate over
+            chunk_size: Number of items, characters or bytes per chunk
+            
+        Returns:
+            Async iterator over the chunks
+        """
+        if hasattr(stream_input_value, '__aiter__'):
+            async for chunk in stream_input_value:
+                yield chunk
+            return
+        
+        if hasattr(stream_input_value, 'read'):
+            while True:
+                chunk = stream_input_value.read(chunk_size)
+                if inspect.isawaitable(chunk):
+                    chunk = await chunk
+                if not chunk:
+                    return
+                yield chunk
+        
+        if isinstance(stream_input_value, (str, bytes, bytearray, memoryview, list, tuple, np.ndarray)):
+            for chunk_start in range(0, len(stream_input_value), chunk_size):
+                yield stream_input_value[chunk_start:chunk_start + chunk_size]
+            return
+        
+        for chunk in stream_input_value:
+            yield chunk
+
+    async def run_processing_stages_with_streaming(self, processing_input: Any) -> Any:
+        """
+        Run the processing stages with the stream input processed chunk by chunk by `process_data_stream`.
+        
+        Output chunks are forwarded to streaming-capable child nodes as they are produced, with at most
+        ``maxBufferedChunks`` chunks waiting per child, so memory use is bounded by the chunk size unless the
+        output chunks are aggregated.
+        
+        Args:
+            processing_input: Input data for the node
+            
+        Returns:
+            Final processed data: the aggregated output chunks, or the number of output chunks
+        """
+        preprocessing_result = self.pre_process_hook(processing_input)
+        input_chunks = self.iterate_in_chunks(preprocessing_result[self.get_stream_input_name()],
+                                              max(1, int(self.stream_chunk_size)))
+        
+        output_chunks = self.process_data_stream(input_chunks, preprocessing_result)
+        if not hasattr(output_chunks, '__aiter__'):
+            output_chunks = self.iterate_in_chunks(iter(output_chunks), 1)
+        
+        processed_data = await self.collect_and_push_streaming_chunks(
+            output_chunks, self.aggregate_stream_output_chunks, self.max_buffered_stream_chunks
+        )
+        return self.post_process_hook(processed_data, processing_input)
+
     def pre_process_hook(self, input_data: Any) -> Any:
         """
         Hook called before data processing.
@@ -171,6 +495,58 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
         """
         return processed_data
 
+    def run_processing_stages(self, processing_input: Any) -> Any:
+        """
+        Run the pre-processing hook, the main data processing and the post-processing hook.
+        
+        Args:
+            processing_input: Input data for the node
+            
+        Returns:
+            Final processed data
+        """
+        preprocessing_result = self.pre_process_hook(processing_input)
+        processed_data = self.process_data(preprocessing_result)
+        return self.post_process_hook(processed_data, processing_input)
+
+    async def run_processing_stages_with_node_execution_policy(self, processing_input: Any) -> Any:
+        """
+        Run the processing stages under the node execution policy.
+        
+        The stages are synchronous, so when the policy sets a timeout they run in a worker thread which the node
+        stops waiting for once the timeout expires. A thread cannot be interrupted, though: the timed-out stages keep
+        running to completion in the background, so a timeout bounds the wait but not the work, and an attempt that
+        timed out is never retried, which would run the stages twice concurrently. With streaming enabled, the stream
+        input is processed chunk by chunk and, since the output chunks are pushed downstream as they are produced, the
+        execution is neither hedged nor retried; with micro-batching enabled, the main data processing is submitted to
+        the shared micro-batcher.
+        
+        Args:
+            processing_input: Input data for the node
+            
+        Returns:
+            Final processed data
+        """
+        is_stage_thread_abandoned = False
+        
+        async def run_attempt():
+            nonlocal is_stage_thread_abandoned
+            if self.streaming_enabled:
+                return await self.run_processing_stages_with_streaming(processing_input)
+            if self.micro_batching_enabled:
+                return await self.run_processing_stages_with_micro_batching(processing_input)
+            if self.node_execution_policy is not None and self.node_execution_policy.timeout_seconds is not None:
+                try:
+                    return await asyncio.to_thread(self.run_processing_stages, processing_input)
+                except asyncio.CancelledError:
+                    is_stage_thread_abandoned = True
+                    raise
+            return self.run_processing_stages(processing_input)
+        
+        return await self.run_with_node_execution_policy(
+            run_attempt, is_retry_allowed_callable=lambda exception: not is_stage_thread_abandoned,
+            allow_repeated_attempts=not self.streaming_enabled)
+
     async def execute(self, parent_graph, input_values: Dict = None, measure_execution_time: bool = True) -> bool:
         """
         Execute the data processing node.
@@ -197,14 +573,8 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
             # Extract actual data from input values
             processing_input = input_values if input_values is not None else {}
             
-            # Pre-processing hook
-            preprocessing_result = self.pre_process_hook(processing_input)
-            
-            # Main data processing
-            processed_data = self.process_data(preprocessing_result)
-            
-            # Post-processing hook
-            final_processed_data = self.post_process_hook(processed_data, processing_input)
+            # Pre-processing hook, main data processing and post-processing hook
+            final_processed_data = await self.run_processing_stages_with_node_execution_policy(processing_input)
             
             # Format output
             formatted_output = self.format_output_data(final_processed_data)
@@ -254,15 +624,27 @@ class SkymelECGraphNodeForDataProcessing(SkymelECGraphNode):
             'processing_errors_count': len(self.processing_errors),
             'recent_errors': self.processing_errors[-5:] if self.processing_errors else [],
             'last_processing_metadata': self.last_processing_metadata,
+            'last_output_processing_stats': self.last_output_processing_stats,
             'average_execution_time_ms': self.get_average_execution_time_milliseconds(),
             'last_execution_time_ms': self.get_last_measured_execution_time_milliseconds()
         }
 
+    def clone(self) -> 'SkymelECGraphNodeForDataProcessing':
+        """Create a node with the same configuration and fresh execution state and processing statistics."""
+        cloned_node = super().clone()
+        cloned_node.processed_data_count = 0
+        cloned_node.processing_errors = []
+        cloned_node.last_processing_metadata = None
+        cloned_node.last_output_processing_stats = None
+        cloned_node.last_input_validation_errors = []
+        return cloned_node
+
     def reset_processing_statistics(self):
         """Reset processing statistics and error logs."""
         self.processed_data_count = 0
         self.processing_errors.clear()
         self.last_processing_metadata = None
+        self.last_output_processing_stats = None
 
     def set_processing_metadata(self, metadata: Dict[str, Any]):
         """
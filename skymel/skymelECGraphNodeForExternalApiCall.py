@@ -1,9 +1,26 @@
+import copy
+import email.utils
+import hashlib
 import json
+import random
 import time
 import asyncio
 from typing import Dict, List, Optional, Any, Union
 from .skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
 from .commonValidators import CommonValidators
+from .commonHashUtils import CommonHashUtils
+from .skymelApiCallError import SkymelApiCallError, SkymelApiCircuitOpenError
+from .skymelApiCircuitBreaker import SkymelApiCircuitBreaker
+from .skymelApiEndpointRateLimiter import SkymelApiEndpointRateLimiter
+from .skymelApiEndpointMetrics import SkymelApiCallTrace, SkymelApiEndpointMetrics
+from .skymelApiPayloadSerializer import SkymelApiPayloadSerializer
+from .skymelApiRetryBudget import SkymelApiRetryBudget
+from .skymelApiProtobufCodec import SkymelApiProtobufCodec
+from .skymelECGraphMicroBatcher import SkymelECGraphMicroBatcher
+from .skymelApiCallSingleFlight import SkymelApiCallSingleFlight
+from .skymelApiResponseCache import SkymelApiResponseCache
+from .skymelHttpClientPool import SkymelHttpClientPool
+from .skymelWebSocketConnectionManager import SkymelWebSocketConnectionManager
 
 
 class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
@@ -64,6 +81,17 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
             initialization_config, 'retryDelay', 1.0
         )
         
+        # Upper bound of the jittered retry delay; a Retry-After beyond it ends the retries instead of waiting
+        self.max_retry_delay = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'maxRetryDelay', 30.0
+        )
+        
+        # Retries are paid for from the process-wide retry budget unless this is disabled
+        self.use_retry_budget = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'useRetryBudget', True
+        )
+        self.retried_attempt_count = 0
+        
         # Headers configuration
         self.default_headers = {
             'Content-Type': 'application/json',
@@ -79,6 +107,153 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
         )
         self.default_headers.update(additional_headers)
         
+        # Request payloads are serialized once, optionally with orjson and compression, and sent as bytes
+        self.payload_serializer = SkymelApiPayloadSerializer.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                initialization_config, 'payloadSerializationConfig', None
+            )
+        )
+        self.last_serialized_request_payload = None
+        
+        # Opt-in binary transport sending InferenceRequest and receiving InferenceResponse protobuf messages over HTTP
+        self.protobuf_codec = SkymelApiProtobufCodec.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                initialization_config, 'protobufTransportConfig', None
+            )
+        )
+        
+        # Pool providing keep-alive HTTP sessions; falls back to the parent graph's pool, then the process-wide pool
+        self.http_client_pool = None
+        self.parent_graph_http_client_pool = None
+        
+        # Opt-in: WebSocket requests share one persistent connection per endpoint, correlated by a request ID which the
+        # backend must echo under webSocketRequestIdKey
+        self.use_persistent_websocket_connection = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'usePersistentWebSocketConnection', False
+        )
+        self.websocket_request_id_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'webSocketRequestIdKey', 'requestId'
+        )
+        # Opt-in: WebSocket replies carrying webSocketErrorKey are failed calls, with the status code under
+        # webSocketErrorStatusKey, since a WebSocket backend cannot answer a single message with an HTTP error status
+        self.websocket_error_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'webSocketErrorKey', None
+        )
+        self.websocket_error_status_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'webSocketErrorStatusKey', 'status'
+        )
+        self.websocket_connection_manager = None
+        
+        # Connections warm_up opens ahead of the first call; warming up only happens when warm_up is called
+        self.warm_up_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'warmUpConfig', {}
+        ) or {}
+        self.warm_up_enabled = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.warm_up_config, 'enabled', True
+        )
+        self.warm_up_connection_count = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.warm_up_config, 'connectionCount', 1
+        )
+        self.warm_up_method = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.warm_up_config, 'method', 'HEAD'
+        )
+        self.warm_up_url = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.warm_up_config, 'url', None
+        )
+        
+        # Opt-in: concurrent calls with identical payloads to the same endpoint share one backend call
+        self.coalesce_identical_requests = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'coalesceIdenticalRequests', False
+        )
+        
+        # Opt-in cache of responses for deterministic backends
+        self.response_cache_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'responseCacheConfig', {}
+        )
+        self.response_cache = SkymelApiResponseCache.from_config(self.response_cache_config)
+        self.response_cache_ttl_seconds = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.response_cache_config, 'ttlSeconds', 300.0
+        )
+        
+        # Opt-in token-bucket and adaptive concurrency limit, shared by every node calling the same endpoint
+        self.rate_limit_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'rateLimitConfig', None
+        )
+        self.rate_limit_endpoint_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.rate_limit_config or {}, 'endpointKey', self.endpoint_url
+        )
+        
+        # Opt-in circuit breaker, shared by every node calling the same endpoint, failing calls fast while it is open
+        self.circuit_breaker_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'circuitBreakerConfig', None
+        )
+        self.circuit_breaker_endpoint_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.circuit_breaker_config or {}, 'endpointKey', self.endpoint_url
+        )
+        # Backend outputs returned instead of failing while the circuit breaker is open, or None to fail
+        self.circuit_breaker_fallback_outputs = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.circuit_breaker_config or {}, 'fallbackOutputs', None
+        )
+        
+        # Opt-in consumption of streamed responses: SSE or newline-delimited JSON over HTTP, or several WebSocket frames
+        self.stream_response_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'streamResponseConfig', {}
+        )
+        self.stream_response_enabled = (CommonValidators.is_non_empty_dict(self.stream_response_config) and
+                                        CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                                            self.stream_response_config, 'enabled', True) is True)
+        # 'sse', 'ndjson', or 'auto' to pick SSE for text/event-stream responses and NDJSON otherwise
+        self.stream_response_format = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.stream_response_config, 'format', 'auto'
+        )
+        # A chunk equal to the end marker, or a dict chunk whose end marker key is true, ends the stream
+        self.stream_end_marker = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.stream_response_config, 'endMarker', '[DONE]'
+        )
+        self.stream_end_marker_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.stream_response_config, 'endMarkerKey', 'done'
+        )
+        # Whether partial outputs are pushed to streaming-capable child nodes as they arrive
+        self.forward_stream_chunks = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.stream_response_config, 'forwardChunks', True
+        )
+        self.last_time_to_first_chunk = None
+        
+        # Opt-in batching of concurrent calls to the same endpoint into one request carrying an array of inputs
+        self.request_batching_config = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            initialization_config, 'requestBatchingConfig', {}
+        )
+        self.request_batching_enabled = (CommonValidators.is_non_empty_dict(self.request_batching_config) and
+                                         CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                                             self.request_batching_config, 'enabled', True) is True)
+        self.max_request_batch_size = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'maxBatchSize', 32
+        )
+        self.max_request_batch_wait_ms = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'maxBatchWaitMs', 5.0
+        )
+        # 'rows': a list of per-call input dicts; 'columns': one list of values per backend input name
+        self.batch_input_layout = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'inputLayout', 'rows'
+        )
+        # Payload key holding the batched inputs, or None to put columns at the top level of the payload
+        self.batch_input_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'batchInputKey', 'inputs'
+        )
+        self.batch_output_layout = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'outputLayout', 'rows'
+        )
+        # Response key holding the batched outputs, or None if columns are at the top level of the response
+        self.batch_output_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'batchOutputKey', 'outputs'
+        )
+        self.request_batch_group_key = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            self.request_batching_config, 'batchGroupKey', None
+        )
+        
+        # Outcome of the last execution: 'succeeded', 'failed', 'circuit_open' or 'circuit_open_fallback'
+        self.last_execution_status = None
+        
         # API call statistics
         self.api_call_count = 0
         self.successful_calls = 0
@@ -102,6 +277,14 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
             self.last_error_message = "Invalid endpoint URL format"
             return False
         
+        if self.protobuf_codec is not None and (self.is_endpoint_websocket_url or self.stream_response_enabled):
+            self.last_error_message = "The protobuf transport only supports non-streamed HTTP requests"
+            return False
+        
+        if self.request_batching_enabled and (self.stream_response_enabled or self.protobuf_codec is not None):
+            self.last_error_message = "Request batching is not supported with streamed responses or the protobuf transport"
+            return False
+        
         return True
 
     def map_node_inputs_to_backend_inputs(self, node_inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -177,10 +360,107 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
         
         return payload
 
+    def set_http_client_pool(self, http_client_pool: Optional[SkymelHttpClientPool]):
+        """
+        Set the pool this node takes its HTTP sessions from.
+        
+        Args:
+            http_client_pool: Pool to use, or None to use the parent graph's or the process-wide pool
+        """
+        self.http_client_pool = http_client_pool
+
+    def get_http_client_pool(self) -> SkymelHttpClientPool:
+        """
+        Get the pool this node takes its HTTP sessions from.
+        
+        Returns:
+            The node's own pool if set, else the pool of the graph executing the node, else the process-wide pool
+        """
+        if self.http_client_pool is not None:
+            return self.http_client_pool
+        if self.parent_graph_http_client_pool is not None:
+            return self.parent_graph_http_client_pool
+        return SkymelHttpClientPool.get_process_wide_pool()
+
+    def get_encoded_request_payload(self, payload: Dict[str, Any]) -> bytes:
+        """
+        Get the uncompressed encoding of a payload, reusing the encoding of the last payload if it is the same object.
+        
+        HTTP requests send this encoding as their body, so the coalescing and cache keys derived from it cost no
+        further serialization. The encoding is deterministic: protobuf requests are encoded without their random
+        request ID, which is only appended to the body.
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            The payload as protobuf bytes if the node uses the protobuf transport over HTTP, otherwise as JSON bytes
+        """
+        last_serialized_request_payload = self.last_serialized_request_payload
+        if last_serialized_request_payload is not None and last_serialized_request_payload[0] is payload:
+            return last_serialized_request_payload[1]
+        
+        if self.protobuf_codec is not None and not self.is_endpoint_websocket_url:
+            encoded_request_payload = self.protobuf_codec.encode_request(payload, include_request_id=False)
+        else:
+            encoded_request_payload = self.payload_serializer.dumps(payload)
+        self.last_serialized_request_payload = (payload, encoded_request_payload, None)
+        return encoded_request_payload
+
+    def get_serialized_request_payload(self, payload: Dict[str, Any]) -> tuple:
+        """
+        Get the HTTP request body for a payload, compressing its encoding once per payload object.
+        
+        The sizes of the body are added to the processing metadata of the execution.
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            The body bytes, the headers describing the body, and the size of the uncompressed body
+        """
+        encoded_request_payload = self.get_encoded_request_payload(payload)
+        if self.last_serialized_request_payload[2] is not None:
+            return self.last_serialized_request_payload[2]
+        
+        if self.protobuf_codec is not None:
+            serialized_request_payload = self.payload_serializer.encode_body(
+                encoded_request_payload + SkymelApiProtobufCodec.encode_request_id(), SkymelApiProtobufCodec.CONTENT_TYPE)
+        else:
+            serialized_request_payload = self.payload_serializer.encode_body(encoded_request_payload, 'application/json')
+        self.last_serialized_request_payload = (payload, encoded_request_payload, serialized_request_payload)
+        if CommonValidators.is_dict(self.last_processing_metadata):
+            self.last_processing_metadata['request_payload_size'] = serialized_request_payload[2]
+            self.last_processing_metadata['request_body_size'] = len(serialized_request_payload[0])
+        return serialized_request_payload
+
+    def get_request_payload_digest(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Get a SHA-256 digest of a payload's encoding, or None if the payload cannot be encoded.
+        
+        Payloads are compared by their encoded bytes, so payloads holding the same values in a different key order
+        have different digests.
+        """
+        try:
+            return hashlib.sha256(self.get_encoded_request_payload(payload)).hexdigest()
+        except (TypeError, ValueError):
+            return None
+
+    def get_request_headers_and_body(self, payload: Dict[str, Any]) -> tuple:
+        """Get the headers and body bytes of an HTTP request carrying a payload."""
+        body, body_headers, _ = self.get_serialized_request_payload(payload)
+        request_headers = {**self.default_headers, **body_headers}
+        if self.protobuf_codec is not None:
+            request_headers['Accept'] = SkymelApiProtobufCodec.CONTENT_TYPE
+        return request_headers, body
+
     async def make_http_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make an HTTP request to the API endpoint.
         
+        The request reuses a pooled keep-alive session for the endpoint host instead of opening a new connection.
+        Its timings and sizes are recorded in the endpoint's metrics.
+        
         Args:
             payload: Request payload
             
@@ -192,118 +472,906 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
         except ImportError:
             raise ImportError("aiohttp is required for HTTP requests. Install with: pip install aiohttp")
         
-        start_time = time.time()
+        call_trace = SkymelApiCallTrace()
+        is_error = True
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.request_timeout)) as session:
-            try:
-                async with session.post(
-                    self.endpoint_url,
-                    json=payload,
-                    headers=self.default_headers
-                ) as response:
-                    self.last_response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-                    self.last_status_code = response.status
-                    
-                    if response.status == 200:
-                        response_data = await response.json()
-                        self.successful_calls += 1
-                        return response_data
+        session = self.get_http_client_pool().get_session(self.endpoint_url)
+        try:
+            request_headers, request_body = self.get_request_headers_and_body(payload)
+            call_trace.bytes_sent = len(request_body)
+            async with session.post(
+                self.endpoint_url,
+                data=request_body,
+                headers=request_headers,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                trace_request_ctx=call_trace
+            ) as response:
+                call_trace.mark_first_byte()
+                self.last_response_time = call_trace.get_time_to_first_byte_ms()
+                self.last_status_code = response.status
+                
+                # Reading the body first caches it for json() and text(), and gives its size
+                response_body = await response.read()
+                call_trace.bytes_received = len(response_body)
+                if response.status == 200:
+                    if self.protobuf_codec is not None:
+                        response_data = self.protobuf_codec.decode_response(response_body)
                     else:
-                        error_text = await response.text()
-                        error_msg = f"HTTP {response.status}: {error_text}"
-                        self.last_error_message = error_msg
-                        raise RuntimeError(error_msg)
-                        
-            except asyncio.TimeoutError:
-                self.last_error_message = f"Request timeout after {self.request_timeout} seconds"
-                raise RuntimeError(self.last_error_message)
-            except Exception as e:
-                self.last_error_message = f"HTTP request error: {str(e)}"
-                raise RuntimeError(self.last_error_message)
+                        response_data = await response.json()
+                    is_error = False
+                    return response_data
+                else:
+                    error_text = await response.text()
+                    error_msg = f"HTTP {response.status}: {error_text}"
+                    self.last_error_message = error_msg
+                    raise SkymelApiCallError(error_msg, status_code=response.status,
+                                             retry_after_seconds=self.get_retry_after_seconds(response.headers))
+                    
+        except SkymelApiCallError:
+            raise
+        except asyncio.TimeoutError:
+            self.last_error_message = f"Request timeout after {self.request_timeout} seconds"
+            raise SkymelApiCallError(self.last_error_message)
+        except Exception as e:
+            self.last_error_message = f"HTTP request error: {str(e)}"
+            raise RuntimeError(self.last_error_message)
+        finally:
+            self.get_endpoint_metrics().record_call(call_trace, is_error)
+
+    @staticmethod
+    def get_retry_after_seconds(response_headers) -> Optional[float]:
+        """
+        Get the delay requested by a response's Retry-After header, given either in seconds or as an HTTP date.
+        
+        Returns:
+            The delay in seconds, or None if the header is absent or unparsable
+        """
+        retry_after = response_headers.get('Retry-After', None) if response_headers is not None else None
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_after_time = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_after_time is None:
+            return None
+        return max(0.0, retry_after_time.timestamp() - time.time())
+
+    def set_websocket_connection_manager(self, websocket_connection_manager: Optional[SkymelWebSocketConnectionManager]):
+        """
+        Set the manager providing this node's persistent WebSocket connections.
+        
+        Args:
+            websocket_connection_manager: Manager to use, or None to use the process-wide manager
+        """
+        self.websocket_connection_manager = websocket_connection_manager
+
+    def get_websocket_connection_manager(self) -> SkymelWebSocketConnectionManager:
+        """Get the manager providing this node's persistent WebSocket connections."""
+        if self.websocket_connection_manager is not None:
+            return self.websocket_connection_manager
+        return SkymelWebSocketConnectionManager.get_process_wide_manager()
+
+    def get_websocket_url(self) -> str:
+        """Get the endpoint URL with an HTTP scheme converted to the matching WebSocket scheme."""
+        ws_url = self.endpoint_url
+        if ws_url.startswith('http://'):
+            ws_url = ws_url.replace('http://', 'ws://', 1)
+        elif ws_url.startswith('https://'):
+            ws_url = ws_url.replace('https://', 'wss://', 1)
+        return ws_url
+
+    def raise_on_websocket_error_reply(self, reply: Any):
+        """
+        Raise if a WebSocket reply reports a failed call under webSocketErrorKey.
+        
+        Args:
+            reply: Decoded WebSocket reply
+            
+        Raises:
+            SkymelApiCallError: If the reply carries webSocketErrorKey, with the status code found under
+                webSocketErrorStatusKey, if any
+        """
+        if self.websocket_error_key is None or not isinstance(reply, dict) or self.websocket_error_key not in reply:
+            return
+        status_code = reply.get(self.websocket_error_status_key, None)
+        if not isinstance(status_code, int) or isinstance(status_code, bool):
+            status_code = None
+        self.last_status_code = status_code
+        self.last_error_message = f"WebSocket error reply: {reply[self.websocket_error_key]}"
+        raise SkymelApiCallError(self.last_error_message, status_code=status_code)
 
     async def make_websocket_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make a WebSocket request to the API endpoint.
         
+        By default a connection is opened for this request only. With usePersistentWebSocketConnection enabled, the
+        request is multiplexed over a persistent connection to the endpoint, shared with concurrent requests and
+        correlated by the request ID sent under webSocketRequestIdKey.
+        
         Args:
             payload: Request payload
             
         Returns:
             Response data dictionary
         """
+        if not self.use_persistent_websocket_connection:
+            return await self.make_single_use_websocket_request(payload)
+        
+        call_trace = SkymelApiCallTrace()
+        is_error = True
+        
         try:
-            import websockets
-        except ImportError:
-            raise ImportError("websockets is required for WebSocket connections. Install with: pip install websockets")
+            response_data = await self.get_websocket_connection_manager().request(
+                self.get_websocket_url(), payload, self.default_headers, self.request_timeout, call_trace,
+                self.websocket_request_id_key
+            )
+            self.last_response_time = call_trace.get_time_to_first_byte_ms()
+            self.raise_on_websocket_error_reply(response_data)
+            is_error = False
+            return response_data
+        except SkymelApiCallError:
+            raise
+        except asyncio.TimeoutError:
+            self.last_error_message = f"WebSocket request timeout after {self.request_timeout} seconds"
+            raise RuntimeError(self.last_error_message)
+        except Exception as e:
+            self.last_error_message = f"WebSocket request error: {str(e)}"
+            raise RuntimeError(self.last_error_message)
+        finally:
+            self.get_endpoint_metrics().record_call(call_trace, is_error)
+
+    async def make_single_use_websocket_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make a WebSocket request over a connection opened for this request only.
         
-        start_time = time.time()
+        Args:
+            payload: Request payload
+            
+        Returns:
+            Response data dictionary
+        """
+        call_trace = SkymelApiCallTrace()
+        is_error = True
         
         try:
             # Convert HTTP URL to WebSocket URL if needed
-            ws_url = self.endpoint_url
-            if ws_url.startswith('http://'):
-                ws_url = ws_url.replace('http://', 'ws://', 1)
-            elif ws_url.startswith('https://'):
-                ws_url = ws_url.replace('https://', 'wss://', 1)
+            ws_url = self.get_websocket_url()
             
-            async with websockets.connect(
+            call_trace.mark_connect_start()
+            async with await self.get_websocket_connection_manager().open_websocket(
                 ws_url,
-                timeout=self.request_timeout,
-                extra_headers=self.default_headers
+                self.default_headers
             ) as websocket:
+                call_trace.mark_connect_end()
+                
                 # Send the payload
-                await websocket.send(json.dumps(payload))
+                request_text = json.dumps(payload)
+                await websocket.send(request_text)
+                call_trace.bytes_sent = len(request_text.encode('utf-8'))
                 
                 # Receive the response
                 response_text = await websocket.recv()
+                call_trace.mark_first_byte()
+                call_trace.bytes_received = self.get_websocket_message_size(response_text)
                 
-                self.last_response_time = (time.time() - start_time) * 1000
+                self.last_response_time = call_trace.get_time_to_first_byte_ms()
                 
                 try:
                     response_data = json.loads(response_text)
-                    self.successful_calls += 1
-                    return response_data
                 except json.JSONDecodeError:
                     # Return as text if not valid JSON
+                    is_error = False
                     return {'response': response_text}
+                self.raise_on_websocket_error_reply(response_data)
+                is_error = False
+                return response_data
                     
+        except SkymelApiCallError:
+            raise
         except Exception as e:
             self.last_error_message = f"WebSocket request error: {str(e)}"
             raise RuntimeError(self.last_error_message)
+        finally:
+            self.get_endpoint_metrics().record_call(call_trace, is_error)
+
+    @staticmethod
+    def get_websocket_message_size(message: Union[str, bytes]) -> int:
+        """Get the size in bytes of a WebSocket message."""
+        return len(message) if isinstance(message, (bytes, bytearray)) else len(message.encode('utf-8'))
+
+    def parse_stream_chunk(self, chunk_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse one chunk of a streamed response.
+        
+        Args:
+            chunk_text: Text of one SSE event, NDJSON line or WebSocket frame
+            
+        Returns:
+            The chunk as a dictionary of backend outputs (non-JSON and non-dict chunks under 'response'), or None if
+            the chunk marks the end of the stream
+        """
+        if chunk_text == self.stream_end_marker:
+            return None
+        try:
+            chunk = json.loads(chunk_text)
+        except (TypeError, ValueError):
+            return {'response': chunk_text}
+        if not isinstance(chunk, dict):
+            return {'response': chunk}
+        if self.stream_end_marker_key is not None and chunk.get(self.stream_end_marker_key, False) is True:
+            # A final chunk may carry outputs besides the end marker
+            chunk = {key: value for key, value in chunk.items() if key != self.stream_end_marker_key}
+            return chunk if len(chunk) > 0 else None
+        return chunk
+
+    async def iterate_http_response_stream(self, payload: Dict[str, Any], call_trace: SkymelApiCallTrace):
+        """
+        Make an HTTP request and yield the chunks of its streamed SSE or newline-delimited JSON response.
+        
+        The request timeout bounds the wait for each line rather than the whole response.
+        
+        Args:
+            payload: Request payload
+            call_trace: Trace to fill in with the call's timings and sizes
+            
+        Yields:
+            Dictionaries of backend outputs, one per SSE event or NDJSON line, ending at the end marker
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("aiohttp is required for HTTP requests. Install with: pip install aiohttp")
+        
+        session = self.get_http_client_pool().get_session(self.endpoint_url)
+        request_headers, request_body = self.get_request_headers_and_body(payload)
+        call_trace.bytes_sent = len(request_body)
+        async with session.post(
+            self.endpoint_url,
+            data=request_body,
+            headers=request_headers,
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=self.request_timeout),
+            trace_request_ctx=call_trace
+        ) as response:
+            call_trace.mark_first_byte()
+            self.last_status_code = response.status
+            if response.status != 200:
+                error_text = await response.text()
+                self.last_error_message = f"HTTP {response.status}: {error_text}"
+                raise SkymelApiCallError(self.last_error_message, status_code=response.status,
+                                         retry_after_seconds=self.get_retry_after_seconds(response.headers))
+            
+            stream_format = self.stream_response_format
+            if stream_format == 'auto':
+                stream_format = 'sse' if response.content_type == 'text/event-stream' else 'ndjson'
+            
+            event_data_lines = []
+            async for raw_line in response.content:
+                call_trace.bytes_received += len(raw_line)
+                line = raw_line.decode('utf-8').rstrip('\r\n')
+                if stream_format == 'ndjson':
+                    chunk_text = line if line.strip() != '' else None
+                elif line == '':
+                    # A blank line dispatches the SSE event made of the preceding data lines
+                    chunk_text = '\n'.join(event_data_lines) if len(event_data_lines) > 0 else None
+                    event_data_lines = []
+                else:
+                    # Other SSE fields (event, id, retry) and comments carry no outputs
+                    if line.startswith('data:'):
+                        event_data_lines.append(line[6:] if line.startswith('data: ') else line[5:])
+                    chunk_text = None
+                
+                if chunk_text is not None:
+                    chunk = self.parse_stream_chunk(chunk_text)
+                    if chunk is None:
+                        return
+                    yield chunk
+            
+            if len(event_data_lines) > 0:
+                chunk = self.parse_stream_chunk('\n'.join(event_data_lines))
+                if chunk is not None:
+                    yield chunk
+
+    async def iterate_websocket_response_stream(self, payload: Dict[str, Any], call_trace: SkymelApiCallTrace):
+        """
+        Send a WebSocket request over a connection of its own and yield the reply frames until the end marker.
+        
+        Streams do not share the persistent connection, whose replies are correlated one-to-one with requests.
+        The request timeout bounds the wait for each frame; the stream also ends when the backend closes the socket.
+        
+        Args:
+            payload: Request payload
+            call_trace: Trace to fill in with the call's timings and sizes
+            
+        Yields:
+            Dictionaries of backend outputs, one per frame
+        """
+        try:
+            from websockets.exceptions import ConnectionClosedOK
+        except ImportError:
+            raise ImportError("websockets is required for WebSocket connections. Install with: pip install websockets")
+        
+        call_trace.mark_connect_start()
+        async with await self.get_websocket_connection_manager().open_websocket(
+            self.get_websocket_url(),
+            self.default_headers
+        ) as websocket:
+            call_trace.mark_connect_end()
+            request_text = json.dumps(payload)
+            await websocket.send(request_text)
+            call_trace.bytes_sent = len(request_text.encode('utf-8'))
+            while True:
+                try:
+                    message = await asyncio.wait_for(websocket.recv(), timeout=self.request_timeout)
+                except ConnectionClosedOK:
+                    return
+                call_trace.mark_first_byte()
+                call_trace.bytes_received += self.get_websocket_message_size(message)
+                chunk = self.parse_stream_chunk(message.decode('utf-8') if isinstance(message, bytes) else message)
+                if chunk is None:
+                    return
+                self.raise_on_websocket_error_reply(chunk)
+                yield chunk
+
+    async def iterate_streamed_outputs(self, payload: Dict[str, Any]):
+        """
+        Make a streaming API call and yield its partial outputs as they arrive.
+        
+        The call is subject to the endpoint's circuit breaker and rate limiter, if configured, but is neither retried,
+        coalesced nor cached.
+        
+        Args:
+            payload: Request payload
+            
+        Yields:
+            Dictionaries of node outputs
+        """
+        endpoint_circuit_breaker = self.get_endpoint_circuit_breaker()
+        if endpoint_circuit_breaker is not None:
+            endpoint_circuit_breaker.before_call()
+        endpoint_rate_limiter = self.get_endpoint_rate_limiter()
+        is_rate_limiter_slot_held = False
+        
+        start_time = time.time()
+        self.last_time_to_first_chunk = None
+        call_trace = SkymelApiCallTrace()
+        status_code = None
+        is_failure = None
+        try:
+            # Acquired inside the try, so that a cancelled wait still hands back the circuit breaker's probe slot
+            if endpoint_rate_limiter is not None:
+                await endpoint_rate_limiter.acquire()
+                is_rate_limiter_slot_held = True
+            
+            if self.is_endpoint_websocket_url:
+                chunk_iterator = self.iterate_websocket_response_stream(payload, call_trace)
+            else:
+                chunk_iterator = self.iterate_http_response_stream(payload, call_trace)
+            async for chunk in chunk_iterator:
+                if self.last_time_to_first_chunk is None:
+                    self.last_time_to_first_chunk = (time.time() - start_time) * 1000
+                yield self.map_backend_outputs_to_node_outputs(chunk)
+            
+            self.last_response_time = (time.time() - start_time) * 1000
+            status_code = 200
+            is_failure = False
+        except SkymelApiCallError as e:
+            status_code = e.status_code
+            is_failure = SkymelApiCircuitBreaker.is_failure_exception(e)
+            raise
+        except asyncio.TimeoutError:
+            is_failure = True
+            self.last_error_message = f"Streamed response timeout after {self.request_timeout} seconds"
+            raise SkymelApiCallError(self.last_error_message)
+        except Exception as e:
+            is_failure = True
+            self.last_error_message = f"Streamed response error: {str(e)}"
+            raise SkymelApiCallError(self.last_error_message)
+        finally:
+            if endpoint_circuit_breaker is not None:
+                endpoint_circuit_breaker.record_call_outcome(is_failure)
+            if endpoint_rate_limiter is None or is_rate_limiter_slot_held:
+                self.get_endpoint_metrics().record_call(call_trace, status_code != 200)
+            if is_rate_limiter_slot_held:
+                await endpoint_rate_limiter.release(status_code, None)
+
+    async def stream_outputs(self, input_values: Dict = None):
+        """
+        Call the endpoint with the given node inputs and yield the partial node outputs as they are streamed back.
+        
+        This is the streaming counterpart of ``execute`` for callers consuming the partial outputs directly.
+        
+        Args:
+            input_values: Input values for the node
+            
+        Yields:
+            Dictionaries of node outputs
+        """
+        if not self.validate_api_configuration():
+            raise ValueError(self.last_error_message)
+        if not self.validate_input_data(input_values):
+            raise ValueError("Input validation failed")
+        
+        self.api_call_count += 1
+        request_payload = self.build_request_payload(self.map_node_inputs_to_backend_inputs(input_values or {}))
+        async for node_outputs in self.iterate_streamed_outputs(request_payload):
+            yield node_outputs
+        self.successful_calls += 1
+
+    async def collect_streamed_outputs(self, request_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make a streaming API call, forwarding its partial outputs downstream unless disabled, and aggregate them.
+        
+        Args:
+            request_payload: Request payload
+            
+        Returns:
+            The aggregated node outputs
+        """
+        chunk_iterator = self.iterate_streamed_outputs(request_payload)
+        if self.forward_stream_chunks:
+            return await self.collect_and_push_streaming_chunks(chunk_iterator)
+        
+        chunks = [chunk async for chunk in chunk_iterator]
+        if CommonValidators.is_callable_method(self.node_streaming_chunk_aggregator):
+            return self.node_streaming_chunk_aggregator(chunks)
+        return SkymelECGraphNodeForDataProcessing.aggregate_streaming_chunks(chunks)
+
+    def get_request_coalescing_key(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the key identifying calls which may share one in-flight backend call.
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            Key built from the endpoint, the request headers and the digest of the encoded payload, or None if the
+            payload cannot be encoded
+        """
+        request_payload_digest = self.get_request_payload_digest(payload)
+        if request_payload_digest is None:
+            return None
+        return (f"{self.endpoint_url}|{self.is_endpoint_websocket_url}|"
+                f"{CommonHashUtils.generate_canonical_json_hash(self.default_headers)}|{request_payload_digest}")
+
+    def get_response_cache_key(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the key under which the response to a call is cached.
+        
+        Args:
+            payload: Request payload, holding the mapped backend inputs and the private attributes
+            
+        Returns:
+            Key built from the endpoint and the digest of the encoded payload, or None if the payload cannot be
+            encoded
+        """
+        request_payload_digest = self.get_request_payload_digest(payload)
+        if request_payload_digest is None:
+            return None
+        return f"{self.endpoint_url}|{request_payload_digest}"
+
+    def set_response_cache(self, response_cache: Optional[SkymelApiResponseCache], ttl_seconds: Optional[float] = None):
+        """
+        Set the cache this node keeps its responses in.
+        
+        Args:
+            response_cache: Cache to use, or None to disable caching
+            ttl_seconds: How long cached responses stay valid; unchanged if None
+        """
+        self.response_cache = response_cache
+        if ttl_seconds is not None:
+            self.response_cache_ttl_seconds = ttl_seconds
+
+    def get_response_cache(self) -> Optional[SkymelApiResponseCache]:
+        return self.response_cache
+
+    async def make_api_call_with_response_cache(self, backend_inputs: Dict[str, Any], request_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the cached response to a call if there is one, otherwise make the call and cache its response.
+        
+        Args:
+            backend_inputs: Mapped backend inputs, batched if request batching is enabled
+            request_payload: Request payload, used for the cache key
+            
+        Returns:
+            Response data dictionary
+        """
+        response_cache_key = self.get_response_cache_key(request_payload) if self.response_cache is not None else None
+        if response_cache_key is not None:
+            cached_response = await self.response_cache.get(response_cache_key)
+            if cached_response is not None:
+                return cached_response
+        
+        if self.request_batching_enabled:
+            api_response = await self.run_with_node_execution_policy(
+                lambda: self.make_batched_api_call(backend_inputs), self.is_execution_policy_retry_allowed)
+        else:
+            api_response = await self.run_with_node_execution_policy(
+                lambda: self.make_api_call_with_retries(request_payload), self.is_execution_policy_retry_allowed)
+        
+        if response_cache_key is not None:
+            await self.response_cache.put(response_cache_key, api_response, self.response_cache_ttl_seconds)
+        return api_response
+
+    def get_request_batch_group_key(self) -> str:
+        """
+        Get the key of the batch this node's calls join.
+        
+        Returns:
+            The configured batchGroupKey, or a key built from the endpoint, headers, private attributes, batch layout
+            and the settings governing how the batched request is sent and retried, so that only calls which can
+            share one request, made the same way whichever of the batched nodes makes it, are batched together
+        """
+        if self.request_batch_group_key is not None:
+            return self.request_batch_group_key
+        return (f"{self.endpoint_url}|{self.is_endpoint_websocket_url}|" +
+                CommonHashUtils.generate_canonical_json_hash({
+                    'headers': self.default_headers,
+                    'privateAttributes': self.node_private_attributes_and_values,
+                    'requestBatchingConfig': {key: value for key, value in self.request_batching_config.items()
+                                              if key not in ('maxBatchSize', 'maxBatchWaitMs')},
+                    'requestSettings': [self.request_timeout, self.max_retries, self.retry_delay, self.max_retry_delay,
+                                        self.use_retry_budget, self.payload_serializer.compression,
+                                        self.payload_serializer.compression_threshold_bytes]
+                }))
+
+    def build_batched_request_payload(self, list_of_backend_inputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the payload of one request carrying the inputs of several calls.
+        
+        Args:
+            list_of_backend_inputs: Mapped backend inputs of each call, in order
+            
+        Returns:
+            Request payload dictionary
+        """
+        if self.batch_input_layout == 'columns':
+            backend_input_names = []
+            for backend_inputs in list_of_backend_inputs:
+                backend_input_names.extend(name for name in backend_inputs if name not in backend_input_names)
+            batched_inputs = {name: [backend_inputs.get(name, None) for backend_inputs in list_of_backend_inputs]
+                              for name in backend_input_names}
+        else:
+            batched_inputs = list(list_of_backend_inputs)
+        
+        if self.batch_input_key is None:
+            if not isinstance(batched_inputs, dict):
+                raise ValueError("A batchInputKey is required for the 'rows' batch input layout.")
+            return self.build_request_payload(batched_inputs)
+        return self.build_request_payload({self.batch_input_key: batched_inputs})
+
+    def split_batched_response(self, batched_response: Dict[str, Any], batch_size: int) -> List[Dict[str, Any]]:
+        """
+        Split the response to a batched request into the responses to the individual calls.
+        
+        In the 'columns' layout, list values of the batch length hold one value per call; any other value applies to
+        every call.
+        
+        Args:
+            batched_response: Response to the batched request
+            batch_size: Number of calls in the batch
+            
+        Returns:
+            One response dictionary per call, in order
+        """
+        batched_outputs = (batched_response.get(self.batch_output_key, None)
+                           if self.batch_output_key is not None and isinstance(batched_response, dict)
+                           else batched_response)
+        
+        if self.batch_output_layout == 'columns':
+            if not isinstance(batched_outputs, dict):
+                raise RuntimeError("Batched response does not hold a dictionary of output columns.")
+            responses = [{} for _ in range(batch_size)]
+            for output_name, value in batched_outputs.items():
+                is_per_call_value = isinstance(value, (list, tuple)) and len(value) == batch_size
+                for call_index, response in enumerate(responses):
+                    response[output_name] = value[call_index] if is_per_call_value else value
+            return responses
+        
+        if not isinstance(batched_outputs, (list, tuple)) or len(batched_outputs) != batch_size:
+            raise RuntimeError(f"Batched response does not hold a list of {batch_size} outputs.")
+        return list(batched_outputs)
+
+    async def process_api_call_batch(self, list_of_backend_inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Make one API call for a batch of calls collected by the micro-batcher.
+        
+        Args:
+            list_of_backend_inputs: Mapped backend inputs of each call, in order
+            
+        Returns:
+            The response to each call, in order
+        """
+        batched_response = await self.make_api_call_with_retries(
+            self.build_batched_request_payload(list_of_backend_inputs))
+        return self.split_batched_response(batched_response, len(list_of_backend_inputs))
+
+    async def process_api_call_batch_sharing_call_statistics(self, list_of_backend_inputs: List[Dict[str, Any]]) -> list:
+        """
+        Make one API call for a batch of calls, returning each response with the statistics of the shared call.
+        
+        Returns:
+            One tuple of response, response time and status code per call, in order
+        """
+        responses = await self.process_api_call_batch(list_of_backend_inputs)
+        return [(response, self.last_response_time, self.last_status_code) for response in responses]
+
+    def get_request_micro_batcher(self) -> SkymelECGraphMicroBatcher:
+        """Get the micro-batcher shared by the calls of every node in this node's batch group."""
+        return SkymelECGraphMicroBatcher.get_micro_batcher(
+            self.get_request_batch_group_key(), None, self.max_request_batch_size, self.max_request_batch_wait_ms
+        )
+
+    async def make_batched_api_call(self, backend_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make an API call as part of a batch of concurrent calls to the same endpoint.
+        
+        Args:
+            backend_inputs: Mapped backend inputs of this call
+            
+        Returns:
+            The response to this call, split from the batched response
+        """
+        response, self.last_response_time, self.last_status_code = await self.get_request_micro_batcher().submit(
+            backend_inputs, self.process_api_call_batch_sharing_call_statistics)
+        return response
 
     async def make_api_call_with_retries(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make API call with retry logic.
         
+        Identical concurrent calls are coalesced into one backend call if coalesceIdenticalRequests is enabled, unless
+        the node hedges its calls, which relies on duplicate calls being made. Every coalesced node records the
+        response time and status code of the shared call.
+        
         Args:
             payload: Request payload
             
         Returns:
             Response data dictionary
         """
-        last_exception = None
+        if self.coalesce_identical_requests and self.node_hedging_policy is None:
+            request_coalescing_key = self.get_request_coalescing_key(payload)
+            if request_coalescing_key is not None:
+                async def make_shared_api_call():
+                    response = await self.make_uncoalesced_api_call_with_retries(payload)
+                    return response, self.last_response_time, self.last_status_code
+                
+                response, self.last_response_time, self.last_status_code = \
+                    await SkymelApiCallSingleFlight.get_process_wide_single_flight().run(
+                        request_coalescing_key, make_shared_api_call)
+                return response
+        
+        return await self.make_uncoalesced_api_call_with_retries(payload)
+
+    @staticmethod
+    def is_retryable_api_error(exception: BaseException) -> bool:
+        """
+        Check if a failed API call may succeed when retried.
         
+        Timeouts, connection errors, 408, 425, 429 and 5xx responses other than 501 and 505 are transient; other 4xx
+        responses will fail again, and calls rejected by an open circuit breaker cannot succeed before it probes.
+        """
+        if isinstance(exception, SkymelApiCircuitOpenError):
+            return False
+        if isinstance(exception, SkymelApiCallError) and exception.status_code is not None:
+            status_code = exception.status_code
+            if status_code in (408, 425, 429):
+                return True
+            return 500 <= status_code < 600 and status_code not in (501, 505)
+        return True
+
+    def is_execution_policy_retry_allowed(self, exception: BaseException) -> bool:
+        """
+        Check if the node execution policy may retry a failed API call.
+        
+        The node's own maxRetries loop already retries each call, so the execution policy only retries when maxRetries
+        is 0, which keeps the two retry layers from multiplying. Such retries are limited to transient failures and
+        paid for from the process-wide retry budget, like the node's own retries.
+        """
+        if self.max_retries > 0 or not self.is_retryable_api_error(exception):
+            return False
+        if self.use_retry_budget and not SkymelApiRetryBudget.get_process_wide_budget().try_spend_retry():
+            return False
+        return True
+
+    def get_retry_delay_seconds(self, previous_retry_delay_seconds: float, exception: BaseException) -> Optional[float]:
+        """
+        Get the delay before the next retry, using decorrelated jitter and honouring Retry-After.
+        
+        Args:
+            previous_retry_delay_seconds: Delay before the previous retry, or the base retry delay before the first
+            exception: Error of the failed attempt
+            
+        Returns:
+            The delay in seconds, or None if the backend asked for a wait longer than maxRetryDelay
+        """
+        # Decorrelated jitter spreads the retries of many callers failing at the same time
+        retry_delay_seconds = min(self.max_retry_delay,
+                                  random.uniform(self.retry_delay, max(self.retry_delay, 3 * previous_retry_delay_seconds)))
+        retry_after_seconds = getattr(exception, 'retry_after_seconds', None)
+        if retry_after_seconds is not None:
+            if retry_after_seconds > self.max_retry_delay:
+                return None
+            retry_delay_seconds = max(retry_delay_seconds, retry_after_seconds)
+        return retry_delay_seconds
+
+    async def make_uncoalesced_api_call_with_retries(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make API call with retry logic, without joining identical calls in flight.
+        
+        Only transient failures are retried, after a jittered delay of at least the backend's Retry-After, and only
+        while the process-wide retry budget allows it.
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            Response data dictionary
+        """
+        retry_budget = SkymelApiRetryBudget.get_process_wide_budget() if self.use_retry_budget else None
+        if retry_budget is not None:
+            retry_budget.record_call()
+        
+        retry_delay_seconds = self.retry_delay
         for attempt in range(self.max_retries + 1):
             try:
-                if self.is_endpoint_websocket_url:
-                    return await self.make_websocket_request(payload)
-                else:
-                    return await self.make_http_request(payload)
-                    
+                return await self.make_circuit_protected_api_call(payload)
             except Exception as e:
-                last_exception = e
-                self.failed_calls += 1
+                if attempt >= self.max_retries or not self.is_retryable_api_error(e):
+                    raise
+                
+                retry_delay_seconds = self.get_retry_delay_seconds(retry_delay_seconds, e)
+                if retry_delay_seconds is None:
+                    raise
+                if retry_budget is not None and not retry_budget.try_spend_retry():
+                    raise
                 
-                if attempt < self.max_retries:
-                    # Wait before retrying
-                    await asyncio.sleep(self.retry_delay * (2 ** attempt))  # Exponential backoff
-                    continue
+                self.retried_attempt_count += 1
+                self.get_endpoint_metrics().record_retry()
+                await asyncio.sleep(retry_delay_seconds)
+        
+        raise RuntimeError("API call failed after all retries")
+
+    def get_endpoint_metrics(self) -> SkymelApiEndpointMetrics:
+        """Get the latency and transfer metrics shared by every node calling this node's endpoint."""
+        return SkymelApiEndpointMetrics.get_endpoint_metrics(self.endpoint_url)
+
+    def get_endpoint_circuit_breaker(self) -> Optional[SkymelApiCircuitBreaker]:
+        """
+        Get the circuit breaker shared by the calls to this node's endpoint.
+        
+        Returns:
+            The circuit breaker configured for the endpoint key, or None if the endpoint has no circuit breaker
+        """
+        if self.circuit_breaker_endpoint_key is None:
+            return None
+        return SkymelApiCircuitBreaker.get_endpoint_circuit_breaker(self.circuit_breaker_endpoint_key,
+                                                                    self.circuit_breaker_config)
+
+    async def make_circuit_protected_api_call(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make a single API call unless the endpoint's circuit breaker is open, and record its outcome.
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            Response data dictionary
+        """
+        endpoint_circuit_breaker = self.get_endpoint_circuit_breaker()
+        if endpoint_circuit_breaker is None:
+            return await self.make_rate_limited_api_call(payload)
+        
+        endpoint_circuit_breaker.before_call()
+        is_failure = None
+        try:
+            response = await self.make_rate_limited_api_call(payload)
+            is_failure = False
+            return response
+        except Exception as e:
+            is_failure = SkymelApiCircuitBreaker.is_failure_exception(e)
+            raise
+        finally:
+            endpoint_circuit_breaker.record_call_outcome(is_failure)
+
+    def get_endpoint_rate_limiter(self) -> Optional[SkymelApiEndpointRateLimiter]:
+        """
+        Get the limiter shared by the calls to this node's endpoint.
+        
+        Returns:
+            The limiter configured for the endpoint key, or None if the endpoint is not rate limited
+        """
+        if self.rate_limit_endpoint_key is None:
+            return None
+        return SkymelApiEndpointRateLimiter.get_endpoint_limiter(self.rate_limit_endpoint_key, self.rate_limit_config)
+
+    async def make_rate_limited_api_call(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make a single API call once the endpoint's rate and concurrency limits allow it.
+        
+        The outcome of the call (throttled, slow or healthy) is reported back to the limiter so that it can adapt the
+        endpoint's concurrency limit.
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            Response data dictionary
+        """
+        endpoint_rate_limiter = self.get_endpoint_rate_limiter()
+        if endpoint_rate_limiter is None:
+            if self.is_endpoint_websocket_url:
+                return await self.make_websocket_request(payload)
+            return await self.make_http_request(payload)
+        
+        await endpoint_rate_limiter.acquire()
+        status_code = None
+        latency_seconds = None
+        start_time = time.monotonic()
+        try:
+            if self.is_endpoint_websocket_url:
+                response = await self.make_websocket_request(payload)
+            else:
+                response = await self.make_http_request(payload)
+            status_code = 200
+            latency_seconds = time.monotonic() - start_time
+            return response
+        except SkymelApiCallError as e:
+            status_code = e.status_code
+            if status_code is not None:
+                latency_seconds = time.monotonic() - start_time
+            raise
+        finally:
+            await endpoint_rate_limiter.release(status_code, latency_seconds)
+
+    async def warm_up(self, parent_graph=None) -> bool:
+        """
+        Import the transport and open the connection to the endpoint ahead of the first call.
+        
+        HTTP endpoints get ``connectionCount`` keep-alive connections in the pool the node will use, opened by
+        ``method`` requests to the endpoint (or to ``url``) whose replies are discarded. WebSocket endpoints get their
+        persistent connection opened. Single-use WebSocket connections and streamed WebSocket responses cannot be
+        opened ahead, so only their transport is imported. The node's warm-up subroutine, if any, runs afterwards.
+        
+        Args:
+            parent_graph: Graph the node will be executed in, whose HTTP client pool the node will use
+            
+        Returns:
+            True if the node warmed up successfully, False otherwise
+        """
+        if parent_graph is not None:
+            get_parent_graph_http_client_pool = getattr(parent_graph, 'get_http_client_pool', None)
+            self.parent_graph_http_client_pool = (get_parent_graph_http_client_pool()
+                                                  if get_parent_graph_http_client_pool is not None else None)
+        
+        is_warmed_up = True
+        if self.warm_up_enabled and not self.validate_api_configuration():
+            is_warmed_up = False
+            self.log_node_error(f"Warm-up of node {self.node_id} failed: {self.last_error_message}")
+        elif self.warm_up_enabled:
+            try:
+                # Importing the transport here spares the first call the lazy import in the request methods
+                if self.is_endpoint_websocket_url:
+                    import websockets
+                    if self.use_persistent_websocket_connection and not self.stream_response_enabled:
+                        await self.get_websocket_connection_manager().get_connection(
+                            self.get_websocket_url(), self.default_headers, self.websocket_request_id_key).connect()
                 else:
-                    # Final attempt failed
-                    break
+                    import aiohttp
+                    is_warmed_up = await self.get_http_client_pool().warm_up_connections(
+                        self.warm_up_url or self.endpoint_url, self.warm_up_connection_count, self.default_headers,
+                        self.warm_up_method, self.request_timeout)
+            except Exception as e:
+                is_warmed_up = False
+                self.log_node_error(f"Warm-up of node {self.node_id} failed: {str(e)}")
         
-        # All retries failed
-        raise last_exception or RuntimeError("API call failed after all retries")
+        is_subroutine_warmed_up = await super().warm_up(parent_graph)
+        return is_warmed_up and is_subroutine_warmed_up
 
     def process_data(self, input_data: Any) -> Any:
         """
@@ -334,8 +1402,13 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
         """
         start_time = time.time() * 1000 if measure_execution_time else None
         
+        get_parent_graph_http_client_pool = getattr(parent_graph, 'get_http_client_pool', None)
+        self.parent_graph_http_client_pool = (get_parent_graph_http_client_pool()
+                                              if get_parent_graph_http_client_pool is not None else None)
+        
         try:
             # Validate API configuration
+            self.last_execution_status = 'failed'
             if not self.validate_api_configuration():
                 if self.node_log_errors:
                     self.log_node_error(self.last_error_message)
@@ -358,19 +1431,32 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
             # Build request payload
             request_payload = self.build_request_payload(backend_inputs)
             
-            # Set processing metadata
+            # Set processing metadata; HTTP requests add the sizes of their body once they serialize the payload
             self.set_processing_metadata({
                 'api_call_count': self.api_call_count,
                 'endpoint_url': self.endpoint_url,
-                'is_websocket': self.is_endpoint_websocket_url,
-                'request_payload_size': len(json.dumps(request_payload))
+                'is_websocket': self.is_endpoint_websocket_url
             })
             
-            # Make API call with retries
-            api_response = await self.make_api_call_with_retries(request_payload)
-            
-            # Map backend outputs to node outputs
-            mapped_outputs = self.map_backend_outputs_to_node_outputs(api_response)
+            # Make API call with retries, unless the response is cached or streamed; responses served from the cache, or
+            # shared with coalesced or batched calls of other nodes, count as successful calls of this node too
+            execution_status = 'succeeded'
+            try:
+                if self.stream_response_enabled:
+                    # Streamed chunks cannot be taken back, so the call is bounded by the policy timeout but never
+                    # hedged or retried
+                    mapped_outputs = await self.run_with_node_execution_policy(
+                        lambda: self.collect_streamed_outputs(request_payload), allow_repeated_attempts=False)
+                else:
+                    api_response = await self.make_api_call_with_response_cache(backend_inputs, request_payload)
+                    mapped_outputs = self.map_backend_outputs_to_node_outputs(api_response)
+                self.successful_calls += 1
+            except SkymelApiCircuitOpenError:
+                if self.circuit_breaker_fallback_outputs is None:
+                    raise
+                mapped_outputs = self.map_backend_outputs_to_node_outputs(
+                    copy.deepcopy(self.circuit_breaker_fallback_outputs))
+                execution_status = 'circuit_open_fallback'
             
             # Format final output
             formatted_output = self.format_output_data(mapped_outputs)
@@ -381,6 +1467,7 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
             
             # Record success
             self.execution_run_success_statuses.append(True)
+            self.last_execution_status = execution_status
             
             if measure_execution_time:
                 execution_time = time.time() * 1000 - start_time
@@ -401,17 +1488,35 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
             self.processing_errors.append(error_message)
             self.execution_run_success_statuses.append(False)
             self.failed_calls += 1
+            self.last_execution_status = 'circuit_open' if isinstance(e, SkymelApiCircuitOpenError) else 'failed'
             
             if measure_execution_time:
                 execution_time = time.time() * 1000 - start_time
                 self.execution_timings_milliseconds.append(execution_time)
             
             return False
+        
+        finally:
+            # The serialized body may hold megabytes of attachments; it is not needed once the call is over
+            self.last_serialized_request_payload = None
+
+    def get_last_execution_status(self) -> Optional[str]:
+        """
+        Get the outcome of the last execution.
+        
+        Returns:
+            'succeeded', 'failed', 'circuit_open' if the call was rejected by the open circuit breaker,
+            'circuit_open_fallback' if the fallback outputs were returned instead, or None before the first execution
+        """
+        return self.last_execution_status
 
     def get_api_statistics(self) -> Dict[str, Any]:
         """
         Get API call statistics for this node.
         
+        The counters and last-call values cover this node only; ``endpoint_metrics`` holds the latency histograms and
+        transfer counters aggregated across every node calling the same endpoint.
+        
         Returns:
             Dictionary containing API call statistics
         """
@@ -421,23 +1526,65 @@ class SkymelECGraphNodeForExternalApiCall(SkymelECGraphNodeForDataProcessing):
             'api_call_count': self.api_call_count,
             'successful_calls': self.successful_calls,
             'failed_calls': self.failed_calls,
+            'retried_attempt_count': self.retried_attempt_count,
             'success_rate': (self.successful_calls / self.api_call_count) if self.api_call_count > 0 else 0,
             'last_response_time_ms': self.last_response_time,
             'last_status_code': self.last_status_code,
             'last_error_message': self.last_error_message,
             'endpoint_url': self.endpoint_url,
-            'is_websocket': self.is_endpoint_websocket_url
+            'is_websocket': self.is_endpoint_websocket_url,
+            'is_streaming': self.stream_response_enabled,
+            'last_time_to_first_chunk_ms': self.last_time_to_first_chunk,
+            'endpoint_metrics': self.get_endpoint_metrics().get_endpoint_statistics()
         }
         
+        endpoint_rate_limiter = self.get_endpoint_rate_limiter()
+        if endpoint_rate_limiter is not None:
+            api_stats['rate_limiter'] = endpoint_rate_limiter.get_limiter_statistics()
+        
+        endpoint_circuit_breaker = self.get_endpoint_circuit_breaker()
+        if endpoint_circuit_breaker is not None:
+            api_stats['circuit_breaker'] = endpoint_circuit_breaker.get_circuit_breaker_statistics()
+        
+        if self.request_batching_enabled:
+            try:
+                api_stats['request_batching'] = self.get_request_micro_batcher().get_batching_statistics()
+            except RuntimeError:
+                # Batchers belong to an event loop; none is running
+                pass
+        
         base_stats.update(api_stats)
         return base_stats
 
+    def clone(self) -> 'SkymelECGraphNodeForExternalApiCall':
+        """
+        Create a node with the same configuration and fresh execution state and API call statistics.
+        
+        The clone shares this node's serializer, codec, response cache, HTTP client pool and WebSocket connection
+        manager; endpoint-wide state such as rate limiters, circuit breakers and metrics is shared by endpoint anyway.
+        """
+        cloned_node = super().clone()
+        cloned_node.default_headers = dict(self.default_headers)
+        cloned_node.parent_graph_http_client_pool = None
+        cloned_node.last_serialized_request_payload = None
+        cloned_node.last_execution_status = None
+        cloned_node.last_time_to_first_chunk = None
+        cloned_node.api_call_count = 0
+        cloned_node.successful_calls = 0
+        cloned_node.failed_calls = 0
+        cloned_node.retried_attempt_count = 0
+        cloned_node.last_response_time = 0.0
+        cloned_node.last_status_code = None
+        cloned_node.last_error_message = None
+        return cloned_node
+
     def reset_api_statistics(self):
         """Reset API call statistics."""
         self.reset_processing_statistics()
         self.api_call_count = 0
         self.successful_calls = 0
         self.failed_calls = 0
+        self.retried_attempt_count = 0
         self.last_response_time = 0.0
         self.last_status_code = None
         self.last_error_message = None
\ No newline at end of file
@@ -0,0 +1,200 @@
+import time
+from typing import Dict, List, Any
+
+from .skymelECGraphNode import SkymelECGraphNode
+from .skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
+from .commonValidators import CommonValidators
+
+
+class SkymelECGraphNodeForFusedDataProcessing(SkymelECGraphNode):
+    """
+    Node running a chain of data processing nodes back-to-back as a single graph node.
+
+    Created by `SkymelECGraph.build_fused_node_id_to_object`. The fused node takes the node ID and output names of
+    the last stage and the input names of the first stage, so the rest of the graph is unaffected. Each stage's output
+    is handed to the next stage in memory without output formatting, and only the last stage's output is formatted.
+    Every stage still validates its own input, input schema included, exactly as it would unfused. Per-stage timings,
+    success statuses and processed counts are still recorded on the stage nodes.
+    """
+
+    def __init__(self, stage_nodes: List[SkymelECGraphNodeForDataProcessing]):
+        """
+        Initialize a fused data processing node.
+
+        Args:
+            stage_nodes: Data processing nodes in execution order, each consuming only the outputs of the previous one
+        """
+        if not CommonValidators.is_list(stage_nodes) or len(stage_nodes) < 2:
+            raise RuntimeError("A fused data processing node needs at least two stage nodes.")
+
+        first_stage_node = stage_nodes[0]
+        last_stage_node = stage_nodes[-1]
+        super().__init__({
+            'nodeId': last_stage_node.get_node_id(),
+            'nodeInputNames': first_stage_node.get_node_input_names(),
+            'nodeOutputNames': last_stage_node.get_node_output_names(),
+            'nodeSubroutine': 'run_fused_processing_stages',
+            'nodeLogErrors': any(stage_node.get_node_log_errors() for stage_node in stage_nodes)
+        })
+
+        self.stage_nodes = stage_nodes
+        self.last_stage_timings_milliseconds = {}
+
+    @staticmethod
+    def is_fusible_stage_node(node: Any) -> bool:
+        """
+        Check if a node can be run as a stage of a fused node.
+
+        Only plain data processing nodes qualify: nodes overriding `execute`, or relying on micro-batching, chunked
+        streaming, streaming input, execution or hedging policies, or resource limits, keep running on their own.
+
+        Args:
+            node: Graph node to check
+
+        Returns:
+            True if the node can be fused, False otherwise
+        """
+        if not isinstance(node, SkymelECGraphNodeForDataProcessing):
+            return False
+
+        if type(node).execute is not SkymelECGraphNodeForDataProcessing.execute:
+            return False
+
+        if node.micro_batching_enabled or node.streaming_enabled or node.is_streaming_input_capable():
+            return False
+
+        if node.get_node_execution_policy() is not None or node.get_node_hedging_policy() is not None:
+            return False
+
+        return CommonValidators.is_empty(node.get_node_resources())
+
+    def clone(self) -> 'SkymelECGraphNodeForFusedDataProcessing':
+        """Create a fused node with the same configuration, cloned stage nodes and fresh execution state."""
+        cloned_node = super().clone()
+        cloned_node.stage_nodes = [stage_node.clone() for stage_node in self.stage_nodes]
+        cloned_node.last_stage_timings_milliseconds = {}
+        return cloned_node
+
+    def get_stage_nodes(self) -> List[SkymelECGraphNodeForDataProcessing]:
+        """Get the fused stage nodes in execution order."""
+        return self.stage_nodes
+
+    def get_last_stage_timings_milliseconds(self) -> Dict[str, float]:
+        """Get the execution time of every stage during the last execution, keyed by stage node ID."""
+        return self.last_stage_timings_milliseconds
+
+    @staticmethod
+    def get_next_stage_input(stage_node: SkymelECGraphNodeForDataProcessing,
+                             next_stage_node: SkymelECGraphNodeForDataProcessing, processed_data: Any) -> Dict:
+        """
+        Select the inputs of the next stage from the unformatted output of a stage.
+
+        Stage outputs are dicts keyed by fully qualified output names in the common case and are used as they are;
+        any other output is formatted first, as it would have been without fusion.
+
+        Args:
+            stage_node: Stage which produced the data
+            next_stage_node: Stage consuming the data
+            processed_data: Unformatted output of the stage
+
+        Returns:
+            Input values for the next stage
+        """
+        next_stage_input_names = next_stage_node.get_node_input_names()
+        if not isinstance(processed_data, dict) or not all(
+                input_name in processed_data for input_name in next_stage_input_names):
+            processed_data = stage_node.format_output_data(processed_data)
+
+        next_stage_input = {}
+        for input_name in next_stage_input_names:
+            if input_name not in processed_data:
+                raise RuntimeError(f"Node {stage_node.get_node_id()} has not produced the output {input_name}.")
+            next_stage_input[input_name] = processed_data[input_name]
+        return next_stage_input
+
+    async def execute(self, parent_graph, input_values: Dict = None, measure_execution_time: bool = True) -> bool:
+        """
+        Execute all stages of the fused node.
+
+        Args:
+            parent_graph: The parent graph containing this node
+            input_values: Input values for the first stage
+            measure_execution_time: Whether to measure execution time
+
+        Returns:
+            True if every stage succeeded, False otherwise
+        """
+        start_time = time.time() * 1000 if measure_execution_time else None
+        self.last_stage_timings_milliseconds = {}
+
+        stage_node = self.stage_nodes[0]
+        stage_start_time = start_time
+        try:
+            stage_input = input_values
+            formatted_output = None
+            for stage_index, stage_node in enumerate(self.stage_nodes):
+                stage_start_time = time.time() * 1000 if measure_execution_time else None
+
+                if not stage_node.validate_input_data(stage_input):
+                    raise RuntimeError("Input validation failed")
+                if stage_input is None:
+                    stage_input = {}
+
+                processed_data = stage_node.run_processing_stages(stage_input)
+                if stage_index == len(self.stage_nodes) - 1:
+                    formatted_output = stage_node.format_output_data(processed_data)
+                else:
+                    stage_input = self.get_next_stage_input(stage_node, self.stage_nodes[stage_index + 1],
+                                                            processed_data)
+
+                stage_node.processed_data_count += 1
+                stage_node.execution_run_success_statuses.append(True)
+                if measure_execution_time:
+                    stage_execution_time = time.time() * 1000 - stage_start_time
+                    stage_node.execution_timings_milliseconds.append(stage_execution_time)
+                    self.last_stage_timings_milliseconds[stage_node.get_node_id()] = stage_execution_time
+
+                if stage_node.on_execution_complete_callback is not None:
+                    await stage_node.on_execution_complete_callback(stage_node)
+
+            self.last_execution_result = formatted_output
+            stage_node.last_execution_result = formatted_output
+            self.execution_run_success_statuses.append(True)
+
+            if measure_execution_time:
+                self.execution_timings_milliseconds.append(time.time() * 1000 - start_time)
+
+            if self.on_execution_complete_callback is not None:
+                await self.on_execution_complete_callback(self)
+
+            return True
+
+        except Exception as e:
+            error_message = f"Error executing data processing node {stage_node.get_node_id()}: {str(e)}"
+
+            if stage_node.get_node_log_errors():
+                stage_node.log_node_error(error_message)
+            if self.node_log_errors:
+                self.log_node_error(error_message)
+
+            stage_node.processing_errors.append(error_message)
+            stage_node.execution_run_success_statuses.append(False)
+            self.execution_run_success_statuses.append(False)
+
+            if measure_execution_time:
+                stage_node.execution_timings_milliseconds.append(time.time() * 1000 - stage_start_time)
+                self.execution_timings_milliseconds.append(time.time() * 1000 - start_time)
+
+            return False
+
+    def release_last_execution_result(self):
+        """Drop the references to the last execution result held by the fused node and its last stage."""
+        super().release_last_execution_result()
+        self.stage_nodes[-1].release_last_execution_result()
+
+    async def dispose(self) -> bool:
+        """Dispose of the fused node and its stage nodes."""
+        for stage_node in self.stage_nodes:
+            await stage_node.dispose()
+        self.last_stage_timings_milliseconds = {}
+        return await super().dispose()
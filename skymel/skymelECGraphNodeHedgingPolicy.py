@@ -0,0 +1,193 @@
+import asyncio
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+from .commonValidators import CommonValidators
+from .skymelTokenRatioBudget import SkymelTokenRatioBudget
+
+
+class SkymelECGraphNodeHedgeBudget(SkymelTokenRatioBudget):
+    """
+    Process-wide budget capping the extra load created by hedged attempts.
+
+    Every primary attempt deposits ``hedge_budget_ratio`` tokens (up to ``max_tokens``) and every hedged attempt spends
+    one token, so hedges stay below roughly ``hedge_budget_ratio`` of all attempts across the process.
+    """
+
+    _process_wide_budget = None
+
+    def __init__(self, hedge_budget_ratio: float = 0.05, max_tokens: float = 10.0):
+        """
+        Initialize a hedge budget.
+
+        Args:
+            hedge_budget_ratio: Fraction of primary attempts that may be hedged
+            max_tokens: Maximum number of tokens saved up for bursts of hedges
+        """
+        super().__init__(hedge_budget_ratio, max_tokens)
+
+    @staticmethod
+    def configure_process_wide_budget(hedge_budget_ratio: float, max_tokens: float = 10.0):
+        """Replace the process-wide hedge budget."""
+        SkymelECGraphNodeHedgeBudget._process_wide_budget = SkymelECGraphNodeHedgeBudget(hedge_budget_ratio, max_tokens)
+
+    @property
+    def hedge_budget_ratio(self) -> float:
+        return self.budget_ratio
+
+    @property
+    def hedged_attempt_count(self) -> int:
+        return self.spent_token_count
+
+    @property
+    def denied_hedge_count(self) -> int:
+        return self.denied_spend_count
+
+    def record_primary_attempt(self):
+        """Deposit the budget earned by one primary attempt."""
+        self.deposit()
+
+    def try_spend_hedge(self) -> bool:
+        """Take one token for a hedged attempt, if the budget allows it."""
+        return self.try_spend()
+
+
+class SkymelECGraphNodeHedgingPolicy:
+    """
+    Speculative duplicate execution for nodes with a heavy latency tail.
+
+    Created from the ``nodeHedgingPolicy`` key of a node's initialization config, for example::
+
+        'nodeHedgingPolicy': {
+            'hedgeAfterPercentile': 95,
+            'minimumTimingSamples': 20,
+            'maxHedgedAttempts': 1
+        }
+
+    Once the node has recorded enough execution timings, an attempt still running after the given percentile of those
+    timings is duplicated. The first attempt to succeed wins and the others are cancelled. Hedged attempts are paid for
+    from the process-wide ``SkymelECGraphNodeHedgeBudget``.
+    """
+
+    def __init__(self,
+                 hedge_after_percentile: float = 95.0,
+                 minimum_timing_samples: int = 20,
+                 maximum_timing_samples: int = 200,
+                 max_hedged_attempts: int = 1,
+                 hedge_budget: Optional[SkymelECGraphNodeHedgeBudget] = None):
+        """
+        Initialize a hedging policy.
+
+        Args:
+            hedge_after_percentile: Percentile of recorded timings after which an attempt is hedged
+            minimum_timing_samples: Number of recorded timings needed before hedging starts
+            maximum_timing_samples: Number of most recent timings the percentile is computed over
+            max_hedged_attempts: Maximum number of duplicate attempts per execution
+            hedge_budget: Budget to spend hedges from; the process-wide budget if None
+        """
+        self.hedge_after_percentile = hedge_after_percentile
+        self.minimum_timing_samples = minimum_timing_samples
+        self.maximum_timing_samples = maximum_timing_samples
+        self.max_hedged_attempts = max(0, int(max_hedged_attempts))
+        self.hedge_budget = hedge_budget
+
+    @staticmethod
+    def from_config(node_hedging_policy_config: Optional[Dict]) -> Optional['SkymelECGraphNodeHedgingPolicy']:
+        """
+        Create a policy from a ``nodeHedgingPolicy`` config dictionary.
+
+        Returns:
+            The policy, or None if hedging is not configured or explicitly disabled
+        """
+        if not CommonValidators.is_non_empty_dict(node_hedging_policy_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                node_hedging_policy_config, key_name, default_value)
+
+        if get_value('enabled', True) is False:
+            return None
+
+        return SkymelECGraphNodeHedgingPolicy(
+            hedge_after_percentile=get_value('hedgeAfterPercentile', 95.0),
+            minimum_timing_samples=get_value('minimumTimingSamples', 20),
+            maximum_timing_samples=get_value('maximumTimingSamples', 200),
+            max_hedged_attempts=get_value('maxHedgedAttempts', 1)
+        )
+
+    def get_hedge_budget(self) -> SkymelECGraphNodeHedgeBudget:
+        if self.hedge_budget is not None:
+            return self.hedge_budget
+        return SkymelECGraphNodeHedgeBudget.get_process_wide_budget()
+
+    def get_hedge_delay_seconds(self, execution_timings_milliseconds: List[float]) -> Optional[float]:
+        """
+        Get how long to wait before hedging, from the node's recorded execution timings.
+
+        Returns:
+            The delay in seconds, or None if there are not yet enough timings to hedge
+        """
+        if len(execution_timings_milliseconds) < self.minimum_timing_samples:
+            return None
+
+        recent_timings = sorted(execution_timings_milliseconds[-self.maximum_timing_samples:])
+        percentile_index = min(len(recent_timings) - 1,
+                               max(0, math.ceil(self.hedge_after_percentile / 100.0 * len(recent_timings)) - 1))
+        return recent_timings[percentile_index] / 1000.0
+
+    async def run(self, attempt_callable: Callable[[], Any], execution_timings_milliseconds: List[float],
+                  on_hedge_callback: Optional[Callable] = None) -> Any:
+        """
+        Run ``attempt_callable``, launching duplicate attempts if it outlives the hedge delay.
+
+        Args:
+            attempt_callable: Zero-argument callable returning a fresh awaitable for every attempt
+            execution_timings_milliseconds: Timings recorded by the node, used for the hedge delay
+            on_hedge_callback: Optional callable invoked with the number of hedges launched so far
+
+        Returns:
+            The result of the first attempt to succeed
+
+        Raises:
+            The exception of the last attempt to fail, if every attempt failed
+        """
+        hedge_budget = self.get_hedge_budget()
+        hedge_budget.record_primary_attempt()
+
+        hedge_delay_seconds = self.get_hedge_delay_seconds(execution_timings_milliseconds)
+        if hedge_delay_seconds is None or self.max_hedged_attempts == 0:
+            return await attempt_callable()
+
+        running_attempts = [asyncio.ensure_future(attempt_callable())]
+        hedged_attempt_count = 0
+        may_hedge = True
+        last_exception = None
+        try:
+            while len(running_attempts) > 0:
+                may_hedge = may_hedge and hedged_attempt_count < self.max_hedged_attempts
+                finished_attempts, _ = await asyncio.wait(running_attempts,
+                                                          timeout=hedge_delay_seconds if may_hedge else None,
+                                                          return_when=asyncio.FIRST_COMPLETED)
+                for finished_attempt in finished_attempts:
+                    running_attempts.remove(finished_attempt)
+                    if finished_attempt.exception() is None:
+                        return finished_attempt.result()
+                    last_exception = finished_attempt.exception()
+
+                if len(finished_attempts) > 0 or not may_hedge:
+                    continue
+
+                if not hedge_budget.try_spend_hedge():
+                    may_hedge = False
+                    continue
+
+                hedged_attempt_count += 1
+                running_attempts.append(asyncio.ensure_future(attempt_callable()))
+                if on_hedge_callback is not None:
+                    on_hedge_callback(hedged_attempt_count)
+
+            raise last_exception
+        finally:
+            for running_attempt in running_attempts:
+                running_attempt.cancel()
@@ -0,0 +1,168 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .commonValidators import CommonValidators
+
+
+class SkymelECGraphNodeInputSchema:
+    """
+    Input schema of a data processing node, compiled once into a list of per-input checks.
+
+    Created from the ``inputSchema`` key of a node's ``dataProcessingConfig``, mapping input names to field specs::
+
+        'inputSchema': {
+            'external.image': {'type': 'ndarray', 'dtype': 'float32', 'shape': [None, 224, 224, 3]},
+            'external.prompt': {'type': 'str'},
+            'external.temperature': {'type': ['int', 'float'], 'required': False}
+        }
+
+    Types are given as names from ``TYPE_NAME_TO_TYPES`` or as classes; ``None`` in a shape matches any size along
+    that axis. All type lookups, dtype conversions and shape parsing happen at compile time, so validating an input
+    costs one membership test, one ``isinstance`` call and, for arrays, a dtype and shape comparison per field.
+    """
+
+    TYPE_NAME_TO_TYPES = {
+        'str': (str,),
+        'bytes': (bytes, bytearray),
+        'bool': (bool, np.bool_),
+        'int': (int, np.integer),
+        'float': (float, np.floating),
+        'number': (int, float, np.number),
+        'list': (list,),
+        'tuple': (tuple,),
+        'dict': (dict,),
+        'ndarray': (np.ndarray,),
+        'any': None
+    }
+
+    def __init__(self, input_schema: Dict[str, Dict]):
+        """
+        Compile an input schema.
+
+        Args:
+            input_schema: Mapping of input names to field specs with optional keys ``type``, ``dtype``, ``shape``
+                and ``required`` (True by default)
+
+        Raises:
+            RuntimeError: If the schema is malformed
+        """
+        if not CommonValidators.is_dict(input_schema):
+            raise RuntimeError("Input schema must be a dictionary mapping input names to field specs.")
+
+        self.input_schema = input_schema
+        self.field_checks = [self.compile_field_check(input_name, field_spec)
+                             for input_name, field_spec in input_schema.items()]
+
+    @staticmethod
+    def from_config(input_schema_config: Optional[Dict]) -> Optional['SkymelECGraphNodeInputSchema']:
+        """
+        Create a compiled schema from an ``inputSchema`` config dictionary.
+
+        Returns:
+            The compiled schema, or None if no schema is configured
+        """
+        if not CommonValidators.is_non_empty_dict(input_schema_config):
+            return None
+        return SkymelECGraphNodeInputSchema(input_schema_config)
+
+    @staticmethod
+    def get_types_from_type_spec(input_name: str, type_spec: Any) -> Optional[tuple]:
+        """Resolve a ``type`` spec, a name, class or list of these, into a tuple usable with ``isinstance``."""
+        if type_spec is None:
+            return None
+
+        type_specs = type_spec if isinstance(type_spec, (list, tuple)) else [type_spec]
+        types = []
+        for single_type_spec in type_specs:
+            if isinstance(single_type_spec, type):
+                types.append(single_type_spec)
+                continue
+            if single_type_spec not in SkymelECGraphNodeInputSchema.TYPE_NAME_TO_TYPES:
+                raise RuntimeError(f"Unknown type {single_type_spec} in input schema of {input_name}.")
+            resolved_types = SkymelECGraphNodeInputSchema.TYPE_NAME_TO_TYPES[single_type_spec]
+            if resolved_types is None:
+                return None
+            types.extend(resolved_types)
+        return tuple(types)
+
+    @staticmethod
+    def compile_field_check(input_name: str, field_spec: Dict) -> Callable[[Dict, List], None]:
+        """
+        Compile the spec of one input into a check appending structured errors for that input.
+
+        Args:
+            input_name: Name of the input
+            field_spec: Field spec of the input
+
+        Returns:
+            Callable taking the input dictionary and the list to append errors to
+        """
+        if not CommonValidators.is_dict(field_spec):
+            raise RuntimeError(f"Input schema of {input_name} must be a dictionary.")
+
+        is_required = field_spec.get('required', True) is not False
+        types = SkymelECGraphNodeInputSchema.get_types_from_type_spec(input_name, field_spec.get('type', None))
+        rejects_bool = types is not None and bool not in types and np.bool_ not in types
+        type_description = field_spec.get('type', None)
+
+        dtype = np.dtype(field_spec['dtype']) if field_spec.get('dtype', None) is not None else None
+        shape = field_spec.get('shape', None)
+        expected_ndim = None if shape is None else len(shape)
+        fixed_axis_sizes = [] if shape is None else [(axis, size) for axis, size in enumerate(shape) if size is not None]
+        checks_array = dtype is not None or shape is not None
+
+        def check_field(input_data: Dict, errors: List[Dict]):
+            if input_name not in input_data:
+                if is_required:
+                    errors.append({'input_name': input_name, 'error': 'missing', 'expected': 'present',
+                                   'actual': None})
+                return
+
+            value = input_data[input_name]
+            if types is not None and (not isinstance(value, types) or (rejects_bool and isinstance(value, bool))):
+                errors.append({'input_name': input_name, 'error': 'type', 'expected': type_description,
+                               'actual': type(value).__name__})
+                return
+
+            if not checks_array:
+                return
+
+            if not isinstance(value, np.ndarray):
+                errors.append({'input_name': input_name, 'error': 'type', 'expected': 'ndarray',
+                               'actual': type(value).__name__})
+                return
+
+            if dtype is not None and value.dtype != dtype:
+                errors.append({'input_name': input_name, 'error': 'dtype', 'expected': str(dtype),
+                               'actual': str(value.dtype)})
+
+            if expected_ndim is not None:
+                value_shape = value.shape
+                if len(value_shape) != expected_ndim or any(value_shape[axis] != size for axis, size in fixed_axis_sizes):
+                    errors.append({'input_name': input_name, 'error': 'shape', 'expected': list(shape),
+                                   'actual': list(value_shape)})
+
+        return check_field
+
+    def validate(self, input_data: Dict) -> List[Dict[str, Any]]:
+        """
+        Validate an input dictionary against the schema.
+
+        Args:
+            input_data: Input values keyed by input name
+
+        Returns:
+            List of structured errors, each with ``input_name``, ``error`` (one of 'missing', 'type', 'dtype' or
+            'shape'), ``expected`` and ``actual``; empty if the input is valid
+        """
+        errors = []
+        for field_check in self.field_checks:
+            field_check(input_data, errors)
+        return errors
+
+    @staticmethod
+    def format_errors(errors: List[Dict[str, Any]]) -> str:
+        """Render structured errors as one human-readable message."""
+        return "; ".join(f"{error['input_name']}: {error['error']} (expected {error['expected']}, got {error['actual']})"
+                         for error in errors)
@@ -0,0 +1,159 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from .commonValidators import CommonValidators
+
+
+class SkymelECGraphResourceLimiter:
+    """
+    Gates node dispatch on named resource tags, such as ``{"api.openai": 1, "cpu": 1}``.
+
+    Each tag has a capacity; a node holding ``n`` units of a tag counts ``n`` against that capacity until it finishes.
+    Tags without a configured capacity are unlimited. All tags requested by a node are acquired together, so nodes
+    never hold one tag while waiting for another and cannot deadlock each other.
+
+    One limiter is shared by the whole process (see ``get_process_wide_limiter``); a graph may additionally own a
+    limiter through the ``resourceCapacities`` key of its initialization config.
+    """
+
+    _process_wide_limiter = None
+
+    def __init__(self, resource_tag_to_capacity: Optional[Dict[str, int]] = None):
+        """
+        Initialize a resource limiter.
+
+        Args:
+            resource_tag_to_capacity: Dictionary mapping resource tags to the number of units available
+        """
+        self.resource_tag_to_capacity = {}
+        self.resource_tag_to_units_in_use = {}
+        self._event_loop_to_condition = weakref.WeakKeyDictionary()
+
+        if CommonValidators.is_dict(resource_tag_to_capacity):
+            for resource_tag, capacity in resource_tag_to_capacity.items():
+                self.set_resource_capacity(resource_tag, capacity)
+
+    @staticmethod
+    def get_process_wide_limiter() -> 'SkymelECGraphResourceLimiter':
+        """Get the limiter shared by every graph in this process."""
+        if SkymelECGraphResourceLimiter._process_wide_limiter is None:
+            SkymelECGraphResourceLimiter._process_wide_limiter = SkymelECGraphResourceLimiter()
+        return SkymelECGraphResourceLimiter._process_wide_limiter
+
+    @staticmethod
+    def set_process_wide_resource_capacity(resource_tag: str, capacity: Optional[int]):
+        """Set (or, with None, remove) the process-wide capacity of a resource tag."""
+        SkymelECGraphResourceLimiter.get_process_wide_limiter().set_resource_capacity(resource_tag, capacity)
+
+    def set_resource_capacity(self, resource_tag: str, capacity: Optional[int]):
+        """
+        Set the capacity of a resource tag.
+
+        Args:
+            resource_tag: Name of the resource
+            capacity: Number of units available, or None to make the resource unlimited
+        """
+        if not CommonValidators.is_non_empty_string(resource_tag):
+            raise ValueError("Resource tag must be a non-empty string.")
+
+        if capacity is None:
+            self.resource_tag_to_capacity.pop(resource_tag, None)
+        else:
+            if not CommonValidators.is_integer(capacity) or capacity < 1:
+                raise ValueError(f"Capacity of resource {resource_tag} must be a positive integer.")
+            self.resource_tag_to_capacity[resource_tag] = capacity
+
+        self._notify_waiters()
+
+    def get_resource_capacity(self, resource_tag: str) -> Optional[int]:
+        """Get the capacity of a resource tag, or None if it is unlimited."""
+        return self.resource_tag_to_capacity.get(resource_tag, None)
+
+    def get_units_in_use(self, resource_tag: str) -> int:
+        """Get the number of units of a resource tag currently held."""
+        return self.resource_tag_to_units_in_use.get(resource_tag, 0)
+
+    def get_limited_resource_units(self, resources: Optional[Dict[str, int]]) -> Dict[str, int]:
+        """Keep only the requested tags that this limiter gates, clamping each request to the tag's capacity."""
+        output = {}
+        if not CommonValidators.is_non_empty_dict(resources):
+            return output
+
+        for resource_tag, units in resources.items():
+            capacity = self.get_resource_capacity(resource_tag)
+            if capacity is None or not CommonValidators.is_number(units) or units <= 0:
+                continue
+            output[resource_tag] = min(int(units), capacity)
+        return output
+
+    def _get_condition(self) -> asyncio.Condition:
+        event_loop = asyncio.get_running_loop()
+        condition = self._event_loop_to_condition.get(event_loop, None)
+        if condition is None:
+            condition = asyncio.Condition()
+            self._event_loop_to_condition[event_loop] = condition
+        return condition
+
+    def _notify_waiters(self):
+        try:
+            event_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        condition = self._event_loop_to_condition.get(event_loop, None)
+        if condition is not None:
+            event_loop.create_task(self._notify_all(condition))
+
+    @staticmethod
+    async def _notify_all(condition: asyncio.Condition):
+        async with condition:
+            condition.notify_all()
+
+    def _has_capacity_for(self, resource_units: Dict[str, int]) -> bool:
+        for resource_tag, units in resource_units.items():
+            capacity = self.get_resource_capacity(resource_tag)
+            if capacity is not None and self.get_units_in_use(resource_tag) + units > capacity:
+                return False
+        return True
+
+    async def acquire(self, resources: Optional[Dict[str, int]]) -> Dict[str, int]:
+        """
+        Wait until all requested resource units are available and take them.
+
+        Args:
+            resources: Dictionary mapping resource tags to the number of units needed
+
+        Returns:
+            The units actually taken, to be handed back to ``release``
+        """
+        resource_units = self.get_limited_resource_units(resources)
+        if len(resource_units) == 0:
+            return resource_units
+
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._has_capacity_for(resource_units))
+            for resource_tag, units in resource_units.items():
+                self.resource_tag_to_units_in_use[resource_tag] = self.get_units_in_use(resource_tag) + units
+        return resource_units
+
+    async def release(self, resource_units: Dict[str, int]):
+        """Hand back resource units taken by ``acquire``."""
+        if CommonValidators.is_empty(resource_units):
+            return
+
+        condition = self._get_condition()
+        async with condition:
+            for resource_tag, units in resource_units.items():
+                self.resource_tag_to_units_in_use[resource_tag] = max(0, self.get_units_in_use(resource_tag) - units)
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def hold(self, resources: Optional[Dict[str, int]]):
+        """Async context manager holding the requested resource units for the duration of the block."""
+        resource_units = await self.acquire(resources)
+        try:
+            yield resource_units
+        finally:
+            await self.release(resource_units)
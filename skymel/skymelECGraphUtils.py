@@ -41,6 +41,65 @@ class SkymelECGraphUtils:
             graph_execution_config, 'externalInputNamesToValuesDict', None
         )
 
+    @staticmethod
+    def get_release_intermediate_node_results_from_graph_execution_config(graph_execution_config: Optional[Dict]) -> bool:
+        """
+        Checks whether intermediate node results should be released once all their consumers have run.
+
+        Args:
+            graph_execution_config: The graph execution configuration
+
+        Returns:
+            True if intermediate node results should be released, False otherwise
+        """
+        if CommonValidators.is_empty(graph_execution_config):
+            return False
+
+        return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            graph_execution_config, 'releaseIntermediateNodeResults', False
+        ) is True
+
+    @staticmethod
+    def get_fuse_data_processing_node_chains_from_graph_execution_config(graph_execution_config: Optional[Dict]) -> bool:
+        """
+        Checks whether chains of data processing nodes should be fused into single nodes before execution.
+
+        Args:
+            graph_execution_config: The graph execution configuration
+
+        Returns:
+            True if data processing node chains should be fused, False otherwise
+        """
+        if CommonValidators.is_empty(graph_execution_config):
+            return False
+
+        return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            graph_execution_config, 'fuseDataProcessingNodeChains', False
+        ) is True
+
+    @staticmethod
+    def get_node_output_names_to_retain_from_graph_execution_config(graph_execution_config: Optional[Dict]) -> List[str]:
+        """
+        Gets the node output names whose producing nodes must keep their results after execution.
+
+        Args:
+            graph_execution_config: The graph execution configuration
+
+        Returns:
+            List of node output names to retain
+        """
+        if CommonValidators.is_empty(graph_execution_config):
+            return []
+
+        node_output_names_to_retain = CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+            graph_execution_config, 'nodeOutputNamesToRetain', []
+        )
+
+        if not CommonValidators.is_list(node_output_names_to_retain):
+            return []
+
+        return node_output_names_to_retain
+
     @staticmethod
     def get_external_input_names_from_graph_initialization_config(graph_initialization_config: Optional[Dict]) -> List[str]:
         """
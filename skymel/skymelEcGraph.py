@@ -1,10 +1,14 @@
+import asyncio
 import time
-from typing import Dict, List, Optional, Set, Any, Union
+from typing import Dict, List, Optional, Set, Tuple, Any, Union
 from .commonValidators import CommonValidators
 from .commonHashUtils import CommonHashUtils
 from .commonGraphAlgorithms import CommonGraphAlgorithms
 from .skymelECGraphUtils import SkymelECGraphUtils
 from .skymelECGraphNode import SkymelECGraphNode
+from .skymelECGraphNodeForFusedDataProcessing import SkymelECGraphNodeForFusedDataProcessing
+from .skymelECGraphResourceLimiter import SkymelECGraphResourceLimiter
+from .skymelHttpClientPool import SkymelHttpClientPool
 
 
 class SkymelECGraph:
@@ -44,10 +48,22 @@ class SkymelECGraph:
             CommonValidators.is_callable_method(initialization_config['errorCallback'])):
             self.error_callback = initialization_config['errorCallback']
         
+        # Graph-scoped resource capacities, shared by the clones of this graph; the process-wide limiter always applies
+        # as well
+        self.resource_limiter = None
+        if CommonValidators.is_non_empty_dict_and_has_key(initialization_config, 'resourceCapacities'):
+            self.resource_limiter = SkymelECGraphResourceLimiter(initialization_config['resourceCapacities'])
+        
+        # Graph-scoped pool of keep-alive HTTP sessions for external API call nodes, closed on dispose
+        self.http_client_pool = SkymelHttpClientPool.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                initialization_config, 'httpClientPoolConfig', None))
+        
         self.graph_last_modified_timestamp = time.time() * 1000  # Convert to milliseconds
         self.set_graph_id(graph_id)
         
         # Execution-related attributes
+        self.fused_node_id_to_object = None
         self.execution_graph_of_nodes = None
         self.external_input_names_to_values_dict = None
         self.graph_execution_config = None
@@ -291,6 +307,20 @@ class SkymelECGraph:
             True if execution succeeded, False otherwise
         """
         self.set_graph_execution_config(graph_execution_config)
+        if not SkymelECGraphUtils.get_fuse_data_processing_node_chains_from_graph_execution_config(graph_execution_config):
+            return await self.execute_graph_nodes(graph_execution_config, measure_execution_time)
+        
+        # Fused chains only replace their nodes for the duration of this execution; the graph itself is unchanged
+        unfused_node_id_to_object = self.node_id_to_object
+        self.node_id_to_object = self.get_fused_node_id_to_object(
+            self.get_set_of_node_ids_to_keep_unfused(graph_execution_config))
+        try:
+            return await self.execute_graph_nodes(graph_execution_config, measure_execution_time)
+        finally:
+            self.node_id_to_object = unfused_node_id_to_object
+
+    async def execute_graph_nodes(self, graph_execution_config: Optional[Dict], measure_execution_time: bool) -> bool:
+        """Execute the nodes of the graph in topological order."""
         execution_order = await self.get_graph_node_execution_order(store_last_executed_graph_of_nodes=True)
         
         executed_external_graphs = set()
@@ -305,7 +335,15 @@ class SkymelECGraph:
         is_graph_valid = await self.is_graph_valid()
         if not is_graph_valid:
             raise RuntimeError("Graph is not valid. Most likely due to missing dependencies.")
-        
+
+        self.connect_streaming_chunk_consumer_nodes(self.get_last_executed_graph_of_nodes())
+
+        node_id_to_remaining_consumer_count = None
+        node_ids_to_retain = None
+        if SkymelECGraphUtils.get_release_intermediate_node_results_from_graph_execution_config(graph_execution_config):
+            node_id_to_remaining_consumer_count = self.get_node_id_to_consumer_count(self.get_last_executed_graph_of_nodes())
+            node_ids_to_retain = self.get_set_of_node_ids_to_retain(graph_execution_config)
+
         overall_execution_succeeded = True
         for current_node_id in execution_order:
             if current_node_id in external_node_ids:
@@ -328,18 +366,21 @@ class SkymelECGraph:
             input_names = node.get_node_input_names()
             
             if input_names is None or len(input_names) == 0:
-                run_status = await node.execute(self, None, measure_execution_time)
+                run_status = await self.execute_node_within_resource_limits(node, None, measure_execution_time)
             else:
                 graph_node_input_names = node.get_node_input_names()
                 graph_node_input_values = self.get_executed_graph_node_outputs(graph_node_input_names, executed_nodes)
-                run_status = await node.execute(self, graph_node_input_values, measure_execution_time)
+                run_status = await self.execute_node_within_resource_limits(node, graph_node_input_values, measure_execution_time)
             
             if run_status is False:
                 overall_execution_succeeded = False
                 break
-            
+
             executed_nodes.add(current_node_id)
-        
+
+            if node_id_to_remaining_consumer_count is not None:
+                self.release_results_of_fully_consumed_parent_nodes(node, node_id_to_remaining_consumer_count, node_ids_to_retain)
+
         if overall_execution_succeeded and self.success_callback is not None:
             await self.success_callback(self)
         
@@ -348,6 +389,196 @@ class SkymelECGraph:
         
         return overall_execution_succeeded
 
+    def get_set_of_node_ids_to_keep_unfused(self, graph_execution_config: Optional[Dict]) -> Set[str]:
+        """Get the node IDs whose results are requested through `nodeOutputNamesToRetain` and so may not be fused
+        away as intermediate stages."""
+        output = set()
+        for node_output_name in SkymelECGraphUtils.get_node_output_names_to_retain_from_graph_execution_config(graph_execution_config):
+            node_id = SkymelECGraphNode.get_node_id_from_output_name(node_output_name)
+            if node_id is not None:
+                output.add(node_id)
+        return output
+
+    def fuse_data_processing_node_chains(self, node_ids_to_keep_unfused: Optional[Set[str]] = None) -> List[str]:
+        """
+        Replace every linear chain of data processing nodes in the graph with a single fused node.
+
+        This rewrites the graph permanently, e.g. right after loading it. Executions with `fuseDataProcessingNodeChains`
+        set fuse chains for themselves without changing the graph (see `get_fused_node_id_to_object`).
+
+        Args:
+            node_ids_to_keep_unfused: IDs of nodes whose own results must stay available after execution; these
+                can only end a chain
+
+        Returns:
+            List of the node IDs of the fused nodes created
+        """
+        node_id_to_object, fused_node_ids = self.build_fused_node_id_to_object(node_ids_to_keep_unfused)
+        if len(fused_node_ids) > 0:
+            self.node_id_to_object = node_id_to_object
+            self.graph_last_modified_timestamp = time.time() * 1000
+        return fused_node_ids
+
+    def get_fused_node_id_to_object(self, node_ids_to_keep_unfused: Optional[Set[str]] = None) -> Dict:
+        """
+        Get a copy of the graph's node map with every linear chain of data processing nodes replaced by a fused node.
+
+        The copy is kept and reused for as long as the graph's nodes and the nodes to keep unfused stay the same.
+
+        Args:
+            node_ids_to_keep_unfused: IDs of nodes whose own results must stay available after execution
+
+        Returns:
+            Dictionary mapping node IDs to nodes, fused nodes included
+        """
+        fused_node_map_key = (frozenset(node_ids_to_keep_unfused or ()),
+                              tuple((node_id, id(node)) for node_id, node in self.node_id_to_object.items()))
+        if self.fused_node_id_to_object is None or self.fused_node_id_to_object[0] != fused_node_map_key:
+            self.fused_node_id_to_object = (fused_node_map_key,
+                                            self.build_fused_node_id_to_object(node_ids_to_keep_unfused)[0])
+        return self.fused_node_id_to_object[1]
+
+    def build_fused_node_id_to_object(self, node_ids_to_keep_unfused: Optional[Set[str]] = None) -> Tuple[Dict, List[str]]:
+        """
+        Build a copy of the graph's node map with every linear chain of data processing nodes replaced by a fused node.
+
+        A node is fused with its parent if it derives its inputs from that parent only and is the parent's only
+        consumer. The fused node takes the node ID of the last node in the chain, so downstream input names stay
+        valid; the other nodes of the chain are left out of the copy and run as stages of the fused node.
+
+        Args:
+            node_ids_to_keep_unfused: IDs of nodes whose own results must stay available after execution; these
+                can only end a chain
+
+        Returns:
+            The node map copy, and the list of the node IDs of the fused nodes created
+        """
+        node_ids_to_keep_unfused = node_ids_to_keep_unfused or set()
+        execution_dependency_graph = self.get_execution_dependency_graph()
+
+        def is_fusible_node_id(node_id):
+            return SkymelECGraphNodeForFusedDataProcessing.is_fusible_stage_node(self.node_id_to_object.get(node_id, None))
+
+        def get_fused_child_node_id(node_id):
+            if node_id in node_ids_to_keep_unfused or not is_fusible_node_id(node_id):
+                return None
+            child_node_ids = execution_dependency_graph.get(node_id, None) or set()
+            if len(child_node_ids) != 1:
+                return None
+            child_node_id = next(iter(child_node_ids))
+            if not is_fusible_node_id(child_node_id):
+                return None
+            if self.node_id_to_object[child_node_id].get_node_ids_from_which_this_node_derives_inputs() != [node_id]:
+                return None
+            return child_node_id
+
+        node_id_to_fused_child_node_id = {}
+        for node_id in execution_dependency_graph:
+            child_node_id = get_fused_child_node_id(node_id)
+            if child_node_id is not None:
+                node_id_to_fused_child_node_id[node_id] = child_node_id
+
+        node_id_to_object = dict(self.node_id_to_object)
+        fused_child_node_ids = set(node_id_to_fused_child_node_id.values())
+        fused_node_ids = []
+        for node_id in node_id_to_fused_child_node_id:
+            if node_id in fused_child_node_ids:
+                continue
+
+            stage_nodes = [self.node_id_to_object[node_id]]
+            while node_id in node_id_to_fused_child_node_id:
+                node_id = node_id_to_fused_child_node_id[node_id]
+                stage_nodes.append(self.node_id_to_object[node_id])
+
+            for stage_node in stage_nodes[:-1]:
+                del node_id_to_object[stage_node.get_node_id()]
+            fused_node = SkymelECGraphNodeForFusedDataProcessing(stage_nodes)
+            node_id_to_object[fused_node.get_node_id()] = fused_node
+            fused_node_ids.append(fused_node.get_node_id())
+
+        return node_id_to_object, fused_node_ids
+
+    def get_http_client_pool(self) -> Optional[SkymelHttpClientPool]:
+        """Get the graph-scoped HTTP client pool, if the graph defines one."""
+        return self.http_client_pool
+
+    def get_resource_limiter(self) -> Optional[SkymelECGraphResourceLimiter]:
+        """Get the graph-scoped resource limiter, if the graph defines resource capacities."""
+        return self.resource_limiter
+
+    async def execute_node_within_resource_limits(self, node: SkymelECGraphNode, input_values: Optional[Dict],
+                                                  measure_execution_time: bool = True) -> bool:
+        """Execute a node once the graph-scoped and process-wide limiters grant the resources it declares."""
+        node_resources = node.get_node_resources()
+        if CommonValidators.is_empty(node_resources):
+            return await node.execute(self, input_values, measure_execution_time)
+
+        process_wide_limiter = SkymelECGraphResourceLimiter.get_process_wide_limiter()
+        if self.resource_limiter is None:
+            async with process_wide_limiter.hold(node_resources):
+                return await node.execute(self, input_values, measure_execution_time)
+
+        async with self.resource_limiter.hold(node_resources):
+            async with process_wide_limiter.hold(node_resources):
+                return await node.execute(self, input_values, measure_execution_time)
+
+    def connect_streaming_chunk_consumer_nodes(self, execution_dependency_graph: Optional[Dict]):
+        """Register, on every node, the child nodes which accept streamed chunks of its outputs."""
+        if CommonValidators.is_empty(execution_dependency_graph):
+            return
+
+        for node_id in execution_dependency_graph:
+            producer_node = self.node_id_to_object.get(node_id, None)
+            if not self.is_skymel_ec_graph_node_instance(producer_node):
+                continue
+
+            child_node_ids = execution_dependency_graph[node_id] or set()
+            streaming_chunk_consumer_nodes = []
+            for child_node_id in child_node_ids:
+                child_node = self.node_id_to_object.get(child_node_id, None)
+                if self.is_skymel_ec_graph_node_instance(child_node) and child_node.is_streaming_input_capable():
+                    streaming_chunk_consumer_nodes.append(child_node)
+            producer_node.set_streaming_chunk_consumer_nodes(streaming_chunk_consumer_nodes)
+
+    @staticmethod
+    def get_node_id_to_consumer_count(execution_dependency_graph: Optional[Dict]) -> Dict[str, int]:
+        """Count, for every node in the execution dependency graph, how many nodes consume its outputs."""
+        output = {}
+        if CommonValidators.is_empty(execution_dependency_graph):
+            return output
+
+        for node_id in execution_dependency_graph:
+            child_node_ids = execution_dependency_graph[node_id]
+            output[node_id] = 0 if child_node_ids is None else len(child_node_ids)
+        return output
+
+    def get_set_of_node_ids_to_retain(self, graph_execution_config: Optional[Dict]) -> Set[str]:
+        """Get the node IDs whose results must survive execution: leaf nodes and explicitly requested outputs."""
+        output = set(CommonGraphAlgorithms.get_list_of_leaf_node_ids(self.get_last_executed_graph_of_nodes()))
+
+        for node_output_name in SkymelECGraphUtils.get_node_output_names_to_retain_from_graph_execution_config(graph_execution_config):
+            node_id = SkymelECGraphNode.get_node_id_from_output_name(node_output_name)
+            if node_id is not None:
+                output.add(node_id)
+        return output
+
+    def release_results_of_fully_consumed_parent_nodes(self, consumer_node: SkymelECGraphNode,
+                                                       node_id_to_remaining_consumer_count: Dict[str, int],
+                                                       node_ids_to_retain: Set[str]):
+        """Decrement the remaining consumer counts of the parents of a node which has just run, releasing the
+        results of parents that no other node still needs."""
+        for parent_node_id in consumer_node.get_node_ids_from_which_this_node_derives_inputs():
+            if parent_node_id not in node_id_to_remaining_consumer_count:
+                continue
+
+            node_id_to_remaining_consumer_count[parent_node_id] -= 1
+            if node_id_to_remaining_consumer_count[parent_node_id] > 0 or parent_node_id in node_ids_to_retain:
+                continue
+
+            parent_node = self.node_id_to_object.get(parent_node_id, None)
+            if self.is_skymel_ec_graph_node_instance(parent_node):
+                parent_node.release_last_execution_result()
+
     def get_executed_graph_node_outputs(self, list_of_desired_graph_node_output_names: List[str], set_of_executed_nodes: Set[str]) -> Dict:
         """Get outputs from executed graph nodes."""
         output = {}
@@ -474,8 +705,70 @@ class SkymelECGraph:
         
         return output_nodes if output_nodes else []
 
+    def clone(self) -> 'SkymelECGraph':
+        """
+        Create a graph with the same configuration and cloned nodes, ready for an independent execution.
+        
+        Nodes and nested graphs are cloned, sharing their configuration with this graph's. The clone gets its own
+        graph-scoped HTTP client pool, if configured, and a new graph ID unless the initialization config sets one.
+        The graph-scoped resource limiter is shared, so that ``resourceCapacities`` bound the concurrent executions
+        of all clones of one graph together.
+        
+        Returns:
+            The cloned graph
+        """
+        cloned_graph = self.__class__.__new__(self.__class__)
+        cloned_graph.__dict__.update(self.__dict__)
+        if not (CommonValidators.is_non_empty_dict_and_has_key(self.initialization_config, 'graphId') and
+                CommonValidators.is_non_empty_string(self.initialization_config['graphId'])):
+            cloned_graph.set_graph_id(CommonHashUtils.generate_unique_id())
+        
+        cloned_graph.node_id_to_object = {}
+        for node in self.node_id_to_object.values():
+            cloned_node = node.clone()
+            cloned_node_id = (cloned_node.get_graph_id() if self.is_skymel_ec_graph_instance(cloned_node)
+                              else cloned_node.get_node_id())
+            cloned_graph.node_id_to_object[cloned_node_id] = cloned_node
+        
+        if self.external_input_names is not None:
+            cloned_graph.external_input_names = set(self.external_input_names)
+        cloned_graph.http_client_pool = SkymelHttpClientPool.from_config(
+            CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                self.initialization_config, 'httpClientPoolConfig', None))
+        
+        cloned_graph.graph_last_modified_timestamp = time.time() * 1000
+        cloned_graph.fused_node_id_to_object = None
+        cloned_graph.execution_graph_of_nodes = None
+        cloned_graph.external_input_names_to_values_dict = None
+        cloned_graph.graph_execution_config = None
+        return cloned_graph
+
+    async def warm_up(self, parent_graph=None) -> bool:
+        """
+        Warm up every node of the graph concurrently, so that the first execution does not pay one-time costs.
+        
+        External API call nodes import their transports and open connections to their endpoints, with nodes calling
+        the same host sharing one warm-up; every node runs its warm-up subroutine, if any, and nested graphs warm up
+        their own nodes. Warming up is best-effort: failures are logged by the nodes and reported, not raised.
+        
+        Args:
+            parent_graph: Graph this graph is nested in, if any
+            
+        Returns:
+            True if every node warmed up successfully, False otherwise
+        """
+        if CommonValidators.is_empty(self.node_id_to_object):
+            return True
+        
+        warm_up_results = await asyncio.gather(*[node.warm_up(self) for node in self.node_id_to_object.values()],
+                                               return_exceptions=True)
+        return all(warm_up_result is True for warm_up_result in warm_up_results)
+
     async def dispose(self) -> bool:
         """Dispose of the graph and clean up resources."""
+        if self.http_client_pool is not None:
+            await self.http_client_pool.close()
+        
         if CommonValidators.is_empty(self.node_id_to_object):
             return True
         
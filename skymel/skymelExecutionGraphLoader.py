@@ -1,6 +1,9 @@
+import collections
+import copy
 import json
 from typing import Dict, Optional, Union
 from .commonValidators import CommonValidators
+from .commonHashUtils import CommonHashUtils
 from .skymelECGraphUtils import SkymelECGraphUtils
 from .skymelEcGraph import SkymelECGraph
 from .skymelECGraphNode import SkymelECGraphNode
@@ -11,8 +14,16 @@ from .skymelECGraphNodeForExternalApiCall import SkymelECGraphNodeForExternalApi
 class SkymelExecutionGraphLoader:
     """
     Loader class for creating SkymelECGraph instances from JSON configurations.
+    
+    Graphs loaded with ``use_template_cache`` are cloned from a template graph cached under the canonical hash of
+    their JSON configuration, so reloading the same configuration skips parsing it and constructing its nodes.
     """
     
+    _graph_template_key_to_template = collections.OrderedDict()
+    _max_graph_template_count = 128
+    graph_template_cache_hit_count = 0
+    graph_template_cache_miss_count = 0
+    
     def __init__(self):
         raise RuntimeError("Cannot instantiate this class. It has purely static methods, " +
                          "please call them using class-name scope, such as " +
@@ -45,12 +56,13 @@ class SkymelExecutionGraphLoader:
         return None
 
     @staticmethod
-    def load_graph_from_json_object(json_object: Dict) -> Optional[SkymelECGraph]:
+    def load_graph_from_json_object(json_object: Dict, use_template_cache: bool = False) -> Optional[SkymelECGraph]:
         """
         Load a graph from a JSON object.
         
         Args:
             json_object: JSON object containing graph configuration
+            use_template_cache: Whether to clone the graph from a cached template of the same configuration
             
         Returns:
             SkymelECGraph instance or None if loading failed
@@ -58,8 +70,69 @@ class SkymelExecutionGraphLoader:
         if CommonValidators.is_empty(json_object):
             return None
         
+        if use_template_cache:
+            return SkymelExecutionGraphLoader.load_graph_from_template_cache(json_object)
         return SkymelExecutionGraphLoader.get_loaded_graph_and_children_nodes_from_dict(json_object)
 
+    @staticmethod
+    def get_graph_template_key(json_object: Dict) -> Optional[str]:
+        """
+        Get the key a graph configuration's template is cached under: the canonical hash of the configuration.
+        
+        Returns:
+            The key, or None if the configuration holds values which are not JSON-serializable, such as callables
+        """
+        try:
+            return CommonHashUtils.generate_canonical_json_hash(json_object)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def load_graph_from_template_cache(json_object: Dict) -> Optional[SkymelECGraph]:
+        """
+        Load a graph as a clone of the cached template graph of its configuration.
+        
+        On the first load of a configuration, a private copy of it is loaded into a template graph which is cached
+        under the configuration's canonical hash; the least recently used template is evicted beyond
+        ``_max_graph_template_count`` templates. Every load returns a fresh clone of the template, sharing its node
+        configurations. Configurations which cannot be hashed are loaded without the cache.
+        
+        Args:
+            json_object: JSON object containing graph configuration
+            
+        Returns:
+            SkymelECGraph instance or None if loading failed
+        """
+        graph_template_key = SkymelExecutionGraphLoader.get_graph_template_key(json_object)
+        if graph_template_key is None:
+            return SkymelExecutionGraphLoader.get_loaded_graph_and_children_nodes_from_dict(json_object)
+        
+        graph_template_key_to_template = SkymelExecutionGraphLoader._graph_template_key_to_template
+        graph_template = graph_template_key_to_template.get(graph_template_key, None)
+        if graph_template is not None:
+            graph_template_key_to_template.move_to_end(graph_template_key)
+            SkymelExecutionGraphLoader.graph_template_cache_hit_count += 1
+            return graph_template.clone()
+        
+        SkymelExecutionGraphLoader.graph_template_cache_miss_count += 1
+        # The template keeps a private copy, so that later changes to the caller's object cannot alter it
+        graph_template = SkymelExecutionGraphLoader.get_loaded_graph_and_children_nodes_from_dict(
+            copy.deepcopy(json_object))
+        if graph_template is None:
+            return None
+        
+        graph_template_key_to_template[graph_template_key] = graph_template
+        while len(graph_template_key_to_template) > SkymelExecutionGraphLoader._max_graph_template_count:
+            graph_template_key_to_template.popitem(last=False)
+        return graph_template.clone()
+
+    @staticmethod
+    def clear_graph_template_cache():
+        """Drop every cached graph template."""
+        SkymelExecutionGraphLoader._graph_template_key_to_template.clear()
+        SkymelExecutionGraphLoader.graph_template_cache_hit_count = 0
+        SkymelExecutionGraphLoader.graph_template_cache_miss_count = 0
+
     @staticmethod
     def get_loaded_graph_and_children_nodes_from_dict(graph_and_children_nodes_details: Dict) -> Optional[SkymelECGraph]:
         """
@@ -0,0 +1,211 @@
+import asyncio
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from .commonValidators import CommonValidators
+from .skymelApiEndpointMetrics import SkymelApiEndpointMetrics
+
+
+class SkymelHttpClientPool:
+    """
+    Pool of keep-alive ``aiohttp.ClientSession`` objects, one per endpoint host and event loop.
+
+    Sessions are created on first use and reused by every later request to the same host, so repeated API calls skip
+    TCP and TLS setup. Each session owns a ``TCPConnector`` with the pool's connection limits and DNS cache, and traces
+    connection setup and reuse for ``SkymelApiEndpointMetrics``.
+
+    One pool is shared by the whole process (see ``get_process_wide_pool``); a graph may own its own pool through the
+    ``httpClientPoolConfig`` key of its initialization config, which is closed when the graph is disposed. Config
+    keys are ``limit``, ``limitPerHost``, ``dnsCacheTtlSeconds`` and ``keepaliveTimeoutSeconds``.
+    """
+
+    _process_wide_pool = None
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 32, dns_cache_ttl_seconds: int = 300,
+                 keepalive_timeout_seconds: float = 30.0):
+        """
+        Initialize an HTTP client pool.
+
+        Args:
+            limit: Maximum number of open connections per host session
+            limit_per_host: Maximum number of open connections to the same host, port and scheme
+            dns_cache_ttl_seconds: How long resolved host addresses are cached
+            keepalive_timeout_seconds: How long idle connections are kept open
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.keepalive_timeout_seconds = keepalive_timeout_seconds
+
+        self._event_loop_to_host_key_to_session = weakref.WeakKeyDictionary()
+        self._event_loop_to_host_key_to_warm_up_task = weakref.WeakKeyDictionary()
+        self.session_create_count = 0
+        self.session_reuse_count = 0
+
+    @staticmethod
+    def from_config(http_client_pool_config: Optional[Dict]) -> Optional['SkymelHttpClientPool']:
+        """
+        Create a pool from an ``httpClientPoolConfig`` config dictionary.
+
+        Returns:
+            The pool, or None if no pool is configured
+        """
+        if not CommonValidators.is_dict(http_client_pool_config):
+            return None
+
+        def get_value(key_name, default_value):
+            return CommonValidators.get_key_value_from_dict_or_return_default_on_key_not_found(
+                http_client_pool_config, key_name, default_value)
+
+        return SkymelHttpClientPool(
+            limit=get_value('limit', 100),
+            limit_per_host=get_value('limitPerHost', 32),
+            dns_cache_ttl_seconds=get_value('dnsCacheTtlSeconds', 300),
+            keepalive_timeout_seconds=get_value('keepaliveTimeoutSeconds', 30.0)
+        )
+
+    @staticmethod
+    def get_process_wide_pool() -> 'SkymelHttpClientPool':
+        """Get the pool shared by every node in this process."""
+        if SkymelHttpClientPool._process_wide_pool is None:
+            SkymelHttpClientPool._process_wide_pool = SkymelHttpClientPool()
+        return SkymelHttpClientPool._process_wide_pool
+
+    @staticmethod
+    async def close_process_wide_pool():
+        """Close the sessions of the process-wide pool; a fresh pool is created on next use."""
+        if SkymelHttpClientPool._process_wide_pool is not None:
+            process_wide_pool = SkymelHttpClientPool._process_wide_pool
+            SkymelHttpClientPool._process_wide_pool = None
+            await process_wide_pool.close()
+
+    @staticmethod
+    def get_host_key(url: str) -> str:
+        """Get the key under which sessions for a URL are pooled: its scheme, host and port."""
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    def create_session(self) -> Any:
+        """Create a session whose connector applies the pool's limits."""
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("aiohttp is required for HTTP requests. Install with: pip install aiohttp")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl_seconds,
+            keepalive_timeout=self.keepalive_timeout_seconds
+        )
+        return aiohttp.ClientSession(connector=connector,
+                                     trace_configs=[SkymelApiEndpointMetrics.create_trace_config()])
+
+    def get_session(self, url: str) -> Any:
+        """
+        Get the pooled session for the host of a URL, creating it if needed.
+
+        Must be called from a running event loop; sessions are never shared between event loops.
+
+        Args:
+            url: URL the session will be used for
+
+        Returns:
+            An open ``aiohttp.ClientSession``
+        """
+        event_loop = asyncio.get_running_loop()
+        host_key_to_session = self._event_loop_to_host_key_to_session.get(event_loop, None)
+        if host_key_to_session is None:
+            host_key_to_session = {}
+            self._event_loop_to_host_key_to_session[event_loop] = host_key_to_session
+
+        host_key = self.get_host_key(url)
+        session = host_key_to_session.get(host_key, None)
+        if session is not None and not session.closed:
+            self.session_reuse_count += 1
+            return session
+
+        session = self.create_session()
+        host_key_to_session[host_key] = session
+        self.session_create_count += 1
+        return session
+
+    async def warm_up_connections(self, url: str, connection_count: int = 1, headers: Optional[Dict[str, str]] = None,
+                                  method: str = 'HEAD', timeout_seconds: Optional[float] = 10.0) -> bool:
+        """
+        Open keep-alive connections to the host of a URL ahead of the first request.
+
+        Sends ``connection_count`` concurrent requests with ``method`` to the URL and discards the replies, whatever
+        their status, so that their connections (DNS lookup, TCP and TLS handshakes done) stay idle in the pool.
+        Concurrent warm-ups of the same host on one event loop share a single round of requests.
+
+        Args:
+            url: URL the warm-up requests are sent to
+            connection_count: Number of connections to open, at most the per-host connection limit
+            headers: Headers sent with the warm-up requests, e.g. for authentication
+            method: HTTP method of the warm-up requests
+            timeout_seconds: Time limit for each warm-up request
+
+        Returns:
+            True if every warm-up request was answered, False otherwise
+        """
+        event_loop = asyncio.get_running_loop()
+        host_key_to_warm_up_task = self._event_loop_to_host_key_to_warm_up_task.get(event_loop, None)
+        if host_key_to_warm_up_task is None:
+            host_key_to_warm_up_task = {}
+            self._event_loop_to_host_key_to_warm_up_task[event_loop] = host_key_to_warm_up_task
+
+        host_key = self.get_host_key(url)
+        warm_up_task = host_key_to_warm_up_task.get(host_key, None)
+        if warm_up_task is None:
+            warm_up_task = asyncio.ensure_future(self.send_warm_up_requests(
+                url, min(max(1, connection_count), self.limit_per_host), headers, method, timeout_seconds))
+            host_key_to_warm_up_task[host_key] = warm_up_task
+            warm_up_task.add_done_callback(lambda _: host_key_to_warm_up_task.pop(host_key, None))
+        # Shielded so that a cancelled caller does not cancel the warm-up shared with other callers
+        return await asyncio.shield(warm_up_task)
+
+    async def send_warm_up_requests(self, url: str, connection_count: int, headers: Optional[Dict[str, str]],
+                                    method: str, timeout_seconds: Optional[float]) -> bool:
+        import aiohttp
+
+        session = self.get_session(url)
+        timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+
+        async def send_warm_up_request() -> bool:
+            try:
+                async with session.request(method, url, headers=headers, timeout=timeout) as response:
+                    await response.read()
+                return True
+            except Exception:
+                return False
+
+        warm_up_results = await asyncio.gather(*[send_warm_up_request() for _ in range(connection_count)])
+        return all(warm_up_results)
+
+    async def close(self):
+        """Close every session of the running event loop and drop the sessions of other event loops."""
+        try:
+            running_event_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_event_loop = None
+
+        for event_loop, host_key_to_session in list(self._event_loop_to_host_key_to_session.items()):
+            if event_loop is running_event_loop:
+                for session in host_key_to_session.values():
+                    if not session.closed:
+                        await session.close()
+            host_key_to_session.clear()
+        self._event_loop_to_host_key_to_session = weakref.WeakKeyDictionary()
+        self._event_loop_to_host_key_to_warm_up_task = weakref.WeakKeyDictionary()
+
+    def get_pool_statistics(self) -> Dict[str, int]:
+        """Get the number of sessions created and the number of times a pooled session was reused."""
+        return {
+            'session_create_count': self.session_create_count,
+            'session_reuse_count': self.session_reuse_count,
+            'open_session_count': sum(
+                1 for host_key_to_session in self._event_loop_to_host_key_to_session.values()
+                for session in host_key_to_session.values() if not session.closed)
+        }
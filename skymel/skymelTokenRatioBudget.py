@@ -0,0 +1,47 @@
+class SkymelTokenRatioBudget:
+    """
+    Token budget capping extra work, such as retries or hedged attempts, to a fraction of the regular work.
+
+    Every unit of regular work deposits ``budget_ratio`` tokens (up to ``max_tokens``) and every unit of extra work
+    spends one token, so extra work stays below roughly ``budget_ratio`` of the regular work. When tokens run out, extra
+    work is denied until regular work has earned new tokens.
+
+    Subclasses name what is budgeted, and each subclass keeps its own process-wide budget (see
+    ``get_process_wide_budget``).
+    """
+
+    _process_wide_budget = None
+
+    def __init__(self, budget_ratio: float = 0.1, max_tokens: float = 10.0):
+        """
+        Initialize a token budget.
+
+        Args:
+            budget_ratio: Tokens deposited per unit of regular work, i.e. the fraction of extra work allowed
+            max_tokens: Maximum number of tokens saved up for bursts of extra work
+        """
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.available_tokens = max_tokens
+        self.spent_token_count = 0
+        self.denied_spend_count = 0
+
+    @classmethod
+    def get_process_wide_budget(cls) -> 'SkymelTokenRatioBudget':
+        """Get the budget of this class shared by the whole process, creating it with the default settings if needed."""
+        if cls.__dict__.get('_process_wide_budget', None) is None:
+            cls._process_wide_budget = cls()
+        return cls._process_wide_budget
+
+    def deposit(self):
+        """Deposit the tokens earned by one unit of regular work."""
+        self.available_tokens = min(self.max_tokens, self.available_tokens + self.budget_ratio)
+
+    def try_spend(self) -> bool:
+        """Take one token for a unit of extra work, if the budget allows it."""
+        if self.available_tokens < 1.0:
+            self.denied_spend_count += 1
+            return False
+        self.available_tokens -= 1.0
+        self.spent_token_count += 1
+        return True
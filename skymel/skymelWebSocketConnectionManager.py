@@ -0,0 +1,279 @@
+import asyncio
+import inspect
+import json
+import uuid
+import weakref
+from typing import Any, Dict, Optional
+
+from .commonValidators import CommonValidators
+from .skymelApiEndpointMetrics import SkymelApiCallTrace
+
+
+class SkymelWebSocketConnection:
+    """
+    One persistent WebSocket shared by concurrent requests.
+
+    Every request is sent with a unique request ID under ``request_id_key`` and resolved by the reply carrying the same
+    ID. A reply without an ID can only be matched while a single request is pending; if more requests are pending, it
+    cannot be attributed safely, so every pending request fails instead of possibly receiving another request's reply.
+    If the socket drops, pending requests fail and the next request reconnects.
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]], connection_manager: 'SkymelWebSocketConnectionManager',
+                 request_id_key: Optional[str] = None):
+        """
+        Initialize a connection; the socket is opened by the first request.
+
+        Args:
+            url: WebSocket URL
+            headers: Headers sent with the opening handshake, e.g. for authentication
+            connection_manager: Manager holding the connection settings
+            request_id_key: Payload key carrying the request ID, or None to use the manager's key
+        """
+        self.url = url
+        self.headers = headers or {}
+        self.connection_manager = connection_manager
+        self.request_id_key = request_id_key or connection_manager.request_id_key
+
+        self.websocket = None
+        self.reader_task = None
+        self.connect_lock = asyncio.Lock()
+        self.request_id_to_future = {}
+
+        self.connect_count = 0
+        self.request_count = 0
+
+    def is_connected(self) -> bool:
+        return self.websocket is not None and self.reader_task is not None and not self.reader_task.done()
+
+    async def connect(self):
+        """Open the socket if it is not open, retrying with exponential backoff."""
+        async with self.connect_lock:
+            if self.is_connected():
+                return
+
+            last_exception = None
+            for attempt in range(self.connection_manager.max_reconnect_attempts + 1):
+                try:
+                    self.websocket = await self.connection_manager.open_websocket(self.url, self.headers)
+                    break
+                except Exception as e:
+                    last_exception = e
+                    if attempt < self.connection_manager.max_reconnect_attempts:
+                        await asyncio.sleep(self.connection_manager.reconnect_backoff_seconds * (2 ** attempt))
+            else:
+                raise ConnectionError(f"Could not connect to {self.url}: {str(last_exception)}")
+
+            self.connect_count += 1
+            self.reader_task = asyncio.ensure_future(self.read_replies(self.websocket))
+
+    async def read_replies(self, websocket):
+        """Resolve pending requests with the replies received on the socket until it closes."""
+        request_id_key = self.request_id_key
+        closing_exception = None
+        try:
+            async for message in websocket:
+                try:
+                    reply = json.loads(message)
+                except (TypeError, ValueError):
+                    reply = {'response': message}
+
+                future = None
+                if isinstance(reply, dict) and reply.get(request_id_key, None) is not None:
+                    # Replies to requests which have already timed out are dropped
+                    future = self.request_id_to_future.pop(reply.pop(request_id_key), None)
+                elif len(self.request_id_to_future) == 1:
+                    _, future = self.request_id_to_future.popitem()
+                elif len(self.request_id_to_future) > 1:
+                    self.fail_pending_requests(ValueError(
+                        f"Reply from {self.url} carries no '{request_id_key}' while "
+                        f"{len(self.request_id_to_future)} requests are pending, so it cannot be correlated"))
+
+                if future is not None and not future.done():
+                    future.set_result((reply, message))
+        except Exception as e:
+            closing_exception = e
+        finally:
+            if self.websocket is websocket:
+                self.websocket = None
+            self.fail_pending_requests(ConnectionError(
+                f"WebSocket connection to {self.url} closed" +
+                (f": {str(closing_exception)}" if closing_exception is not None else "")))
+
+    def fail_pending_requests(self, exception: Exception):
+        for future in self.request_id_to_future.values():
+            if not future.done():
+                future.set_exception(exception)
+        self.request_id_to_future = {}
+
+    async def request(self, payload: Dict[str, Any], timeout_seconds: Optional[float] = None,
+                      call_trace: Optional[SkymelApiCallTrace] = None) -> Dict[str, Any]:
+        """
+        Send a payload and wait for its reply.
+
+        Args:
+            payload: JSON-serializable request payload; it is not modified
+            timeout_seconds: Time to wait for the reply, or None to wait indefinitely
+            call_trace: Trace to fill in with the connection setup, the reply time and the message sizes, if any
+
+        Returns:
+            The reply, without the request ID added to correlate it
+        """
+        if call_trace is not None:
+            call_trace.connection_reused = self.is_connected()
+            if not call_trace.connection_reused:
+                call_trace.mark_connect_start()
+        await self.connect()
+        if call_trace is not None and not call_trace.connection_reused:
+            call_trace.mark_connect_end()
+
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self.request_id_to_future[request_id] = future
+        self.request_count += 1
+
+        try:
+            websocket = self.websocket
+            if websocket is None:
+                raise ConnectionError(f"WebSocket connection to {self.url} closed")
+            message = json.dumps({**payload, self.request_id_key: request_id})
+            await websocket.send(message)
+            reply, reply_message = await asyncio.wait_for(future, timeout=timeout_seconds)
+            if call_trace is not None:
+                call_trace.mark_first_byte()
+                call_trace.bytes_sent += len(message.encode('utf-8'))
+                call_trace.bytes_received += len(reply_message) if isinstance(reply_message, bytes) else \
+                    len(reply_message.encode('utf-8'))
+            return reply
+        finally:
+            self.request_id_to_future.pop(request_id, None)
+
+    async def close(self):
+        """Close the socket and fail any pending requests."""
+        websocket = self.websocket
+        self.websocket = None
+        if websocket is not None:
+            await websocket.close()
+        if self.reader_task is not None:
+            await asyncio.gather(self.reader_task, return_exceptions=True)
+            self.reader_task = None
+
+
+class SkymelWebSocketConnectionManager:
+    """
+    Keeps one persistent, authenticated WebSocket open per endpoint URL, header set and event loop.
+
+    Heartbeats are WebSocket pings sent every ``heartbeat_interval_seconds``; a connection whose pong does not arrive
+    within ``heartbeat_timeout_seconds`` is closed and transparently reopened by the next request.
+
+    One manager is shared by the whole process (see ``get_process_wide_manager``), so every external API call node
+    targeting the same endpoint, e.g. the agent-creation nodes of many ``SkymelAgent`` runs, shares one handshake.
+    """
+
+    _process_wide_manager = None
+
+    def __init__(self,
+                 request_id_key: str = 'requestId',
+                 heartbeat_interval_seconds: Optional[float] = 20.0,
+                 heartbeat_timeout_seconds: Optional[float] = 20.0,
+                 open_timeout_seconds: Optional[float] = 10.0,
+                 max_reconnect_attempts: int = 3,
+                 reconnect_backoff_seconds: float = 0.5):
+        """
+        Initialize a connection manager.
+
+        Args:
+            request_id_key: Default payload key carrying the request ID, echoed back by the backend in its reply
+            heartbeat_interval_seconds: Interval between pings, or None to disable heartbeats
+            heartbeat_timeout_seconds: Time to wait for a pong before the connection is considered dead
+            open_timeout_seconds: Time limit for the opening handshake
+            max_reconnect_attempts: Number of further attempts when opening a connection fails
+            reconnect_backoff_seconds: Delay before the first reconnection attempt; doubled on every further attempt
+        """
+        self.request_id_key = request_id_key
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self.open_timeout_seconds = open_timeout_seconds
+        self.max_reconnect_attempts = max(0, int(max_reconnect_attempts))
+        self.reconnect_backoff_seconds = reconnect_backoff_seconds
+
+        self._event_loop_to_connection_key_to_connection = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def get_process_wide_manager() -> 'SkymelWebSocketConnectionManager':
+        """Get the manager shared by every node in this process."""
+        if SkymelWebSocketConnectionManager._process_wide_manager is None:
+            SkymelWebSocketConnectionManager._process_wide_manager = SkymelWebSocketConnectionManager()
+        return SkymelWebSocketConnectionManager._process_wide_manager
+
+    @staticmethod
+    async def close_process_wide_manager():
+        """Close the connections of the process-wide manager; a fresh manager is created on next use."""
+        if SkymelWebSocketConnectionManager._process_wide_manager is not None:
+            process_wide_manager = SkymelWebSocketConnectionManager._process_wide_manager
+            SkymelWebSocketConnectionManager._process_wide_manager = None
+            await process_wide_manager.close()
+
+    async def open_websocket(self, url: str, headers: Dict[str, str]) -> Any:
+        """Open a WebSocket, passing the headers under the keyword the installed websockets version expects."""
+        try:
+            import websockets
+        except ImportError:
+            raise ImportError("websockets is required for WebSocket connections. Install with: pip install websockets")
+
+        connect_parameters = inspect.signature(websockets.connect).parameters
+        headers_keyword = 'additional_headers' if 'additional_headers' in connect_parameters else 'extra_headers'
+        return await websockets.connect(url, open_timeout=self.open_timeout_seconds,
+                                        ping_interval=self.heartbeat_interval_seconds,
+                                        ping_timeout=self.heartbeat_timeout_seconds,
+                                        **{headers_keyword: headers})
+
+    def get_connection(self, url: str, headers: Optional[Dict[str, str]] = None,
+                       request_id_key: Optional[str] = None) -> SkymelWebSocketConnection:
+        """
+        Get the connection for a URL, header set and request ID key on the running event loop, creating it if needed.
+
+        Args:
+            url: WebSocket URL
+            headers: Headers sent with the opening handshake
+            request_id_key: Payload key carrying the request ID, or None to use the manager's key
+
+        Returns:
+            The shared connection; it is opened by its first request
+        """
+        event_loop = asyncio.get_running_loop()
+        connection_key_to_connection = self._event_loop_to_connection_key_to_connection.get(event_loop, None)
+        if connection_key_to_connection is None:
+            connection_key_to_connection = {}
+            self._event_loop_to_connection_key_to_connection[event_loop] = connection_key_to_connection
+
+        request_id_key = request_id_key or self.request_id_key
+        connection_key = (url, tuple(sorted((headers or {}).items())), request_id_key)
+        connection = connection_key_to_connection.get(connection_key, None)
+        if connection is None:
+            connection = SkymelWebSocketConnection(url, headers, self, request_id_key)
+            connection_key_to_connection[connection_key] = connection
+        return connection
+
+    async def request(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                      timeout_seconds: Optional[float] = None,
+                      call_trace: Optional[SkymelApiCallTrace] = None,
+                      request_id_key: Optional[str] = None) -> Dict[str, Any]:
+        """Send a payload over the shared connection for a URL, header set and request ID key, and wait for its reply."""
+        if not CommonValidators.is_dict(payload):
+            raise ValueError("WebSocket request payload must be a dictionary.")
+        return await self.get_connection(url, headers, request_id_key).request(payload, timeout_seconds, call_trace)
+
+    async def close(self):
+        """Close every connection of the running event loop and drop the connections of other event loops."""
+        try:
+            running_event_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_event_loop = None
+
+        for event_loop, connection_key_to_connection in list(self._event_loop_to_connection_key_to_connection.items()):
+            if event_loop is running_event_loop:
+                for connection in connection_key_to_connection.values():
+                    await connection.close()
+            connection_key_to_connection.clear()
+        self._event_loop_to_connection_key_to_connection = weakref.WeakKeyDictionary()
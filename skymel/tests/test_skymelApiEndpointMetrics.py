@@ -0,0 +1,80 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelApiEndpointMetrics import SkymelApiEndpointMetrics, SkymelLogBucketedHistogram
+from ..skymelApiStubBackend import SkymelApiStubBackend
+from ..skymelECGraphNodeForExternalApiCall import SkymelECGraphNodeForExternalApiCall
+from ..skymelHttpClientPool import SkymelHttpClientPool
+from ..skymelWebSocketConnectionManager import SkymelWebSocketConnectionManager
+
+
+class TestSkymelApiEndpointMetrics(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        SkymelApiEndpointMetrics.reset_all_endpoint_metrics()
+
+    async def asyncTearDown(self):
+        await SkymelHttpClientPool.close_process_wide_pool()
+        await SkymelWebSocketConnectionManager.close_process_wide_manager()
+        SkymelApiEndpointMetrics.reset_all_endpoint_metrics()
+
+    def make_api_call_node(self, endpoint_url: str, extra_config: dict = None) -> SkymelECGraphNodeForExternalApiCall:
+        node_config = {
+            'nodeId': 'stub',
+            'nodeInputNames': ['external.value'],
+            'nodeOutputNames': ['echo'],
+            'nodeSubroutine': 'process_data',
+            'endpointUrl': endpoint_url,
+            'nodeInputNameToBackendInputNameMap': {'external.value': 'value'},
+            'maxRetries': 0
+        }
+        node_config.update(extra_config or {})
+        return SkymelECGraphNodeForExternalApiCall(node_config)
+
+    def test_histogram_buckets_values_logarithmically(self):
+        histogram = SkymelLogBucketedHistogram(min_value=1.0, max_value=1024.0, buckets_per_doubling=1)
+        self.assertListEqual(histogram.bucket_upper_bounds, [2.0 ** exponent for exponent in range(11)])
+        for value in [0.5, 3.0, 3.5, 100.0, 5000.0]:
+            histogram.record(value)
+        self.assertListEqual(histogram.bucket_counts, [1, 0, 2, 0, 0, 0, 0, 1, 0, 0, 1])
+        self.assertEqual(histogram.get_percentile(50), 4.0)
+        # Percentiles beyond the last bucket are clamped to the largest value seen
+        self.assertEqual(histogram.get_percentile(100), 5000.0)
+        self.assertIsNone(SkymelLogBucketedHistogram().get_percentile(50))
+
+    async def test_http_calls_from_several_nodes_are_aggregated_per_endpoint(self):
+        async with SkymelApiStubBackend(latency_ms=1, response_payload_bytes=100) as stub_backend:
+            endpoint_url = f"{stub_backend.base_url}/json"
+            nodes = [self.make_api_call_node(endpoint_url) for _ in range(2)]
+            for value in range(3):
+                for node in nodes:
+                    self.assertTrue(await node.execute(None, {'external.value': value}))
+
+            endpoint_statistics = nodes[0].get_api_statistics()['endpoint_metrics']
+            self.assertEqual(endpoint_statistics['call_count'], 6)
+            self.assertEqual(endpoint_statistics['error_count'], 0)
+            self.assertEqual(endpoint_statistics['connection_create_count'], 1)
+            self.assertEqual(endpoint_statistics['connection_reuse_count'], 5)
+            self.assertEqual(endpoint_statistics['connect_ms']['count'], 1)
+            self.assertEqual(endpoint_statistics['time_to_first_byte_ms']['count'], 6)
+            self.assertEqual(sum(endpoint_statistics['total_ms']['bucket_counts']), 6)
+            self.assertGreater(endpoint_statistics['bytes_received'], 600)
+            self.assertGreater(endpoint_statistics['bytes_sent'], 0)
+            self.assertDictEqual(SkymelApiEndpointMetrics.get_all_endpoint_statistics()[endpoint_url],
+                                 endpoint_statistics)
+
+    async def test_websocket_calls_count_the_handshake_once(self):
+        async with SkymelApiStubBackend(latency_ms=1) as stub_backend:
+            websocket_config = {'isEndpointWebSocketUrl': True, 'usePersistentWebSocketConnection': True}
+            node = self.make_api_call_node(f"{stub_backend.base_url}/ws", websocket_config)
+            self.assertTrue(await node.execute(None, {'external.value': 0}))
+            self.assertListEqual(await asyncio.gather(*[
+                self.make_api_call_node(node.endpoint_url, websocket_config).execute(
+                    None, {'external.value': value}) for value in range(1, 4)]), [True] * 3)
+
+            endpoint_statistics = node.get_endpoint_metrics().get_endpoint_statistics()
+            self.assertEqual(endpoint_statistics['call_count'], 4)
+            self.assertEqual(endpoint_statistics['connection_create_count'], 1)
+            self.assertEqual(endpoint_statistics['connection_reuse_count'], 3)
+            self.assertEqual(endpoint_statistics['connect_ms']['count'], 1)
+            self.assertGreater(endpoint_statistics['bytes_sent'], 0)
+            self.assertGreater(endpoint_statistics['bytes_received'], 0)
@@ -0,0 +1,57 @@
+import random
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelApiEndpointRateLimiter import SkymelApiEndpointRateLimiter
+
+
+class TestSkymelApiEndpointRateLimiter(IsolatedAsyncioTestCase):
+    async def release_calls(self, limiter: SkymelApiEndpointRateLimiter, latencies_seconds: list):
+        for latency_seconds in latencies_seconds:
+            await limiter.acquire()
+            await limiter.release(200, latency_seconds)
+
+    async def test_variable_latency_does_not_shrink_the_concurrency_limit(self):
+        limiter = SkymelApiEndpointRateLimiter(initial_concurrency=8, decrease_cooldown_seconds=0.0)
+        random_generator = random.Random(0)
+        # Healthy responses spread between 5 and 40 ms, with one unusually fast response among them
+        latencies_seconds = [random_generator.uniform(0.005, 0.040) for _ in range(200)]
+        latencies_seconds[20] = 0.001
+        await self.release_calls(limiter, latencies_seconds)
+
+        limiter_statistics = limiter.get_limiter_statistics()
+        self.assertEqual(limiter_statistics['slow_call_count'], 0)
+        self.assertEqual(limiter_statistics['decrease_count'], 0)
+        self.assertGreater(limiter_statistics['concurrency_limit'], 8)
+        self.assertGreater(limiter_statistics['baseline_latency_seconds'], 0.015)
+        self.assertLess(limiter_statistics['baseline_latency_seconds'], 0.030)
+
+    async def test_latency_spike_shrinks_the_limit_and_a_lasting_shift_becomes_the_baseline(self):
+        limiter = SkymelApiEndpointRateLimiter(initial_concurrency=16, decrease_cooldown_seconds=0.0,
+                                               latency_window_size=20)
+        random_generator = random.Random(1)
+        await self.release_calls(limiter, [random_generator.uniform(0.010, 0.020) for _ in range(20)])
+        self.assertEqual(limiter.get_limiter_statistics()['decrease_count'], 0)
+
+        concurrency_limit = limiter.concurrency_limit
+        await self.release_calls(limiter, [0.5])
+        self.assertEqual(limiter.get_limiter_statistics()['slow_call_count'], 1)
+        self.assertEqual(limiter.concurrency_limit, concurrency_limit * 0.5)
+
+        # Once most of the window is slower, the endpoint's new latency is no longer counted as slow
+        await self.release_calls(limiter, [random_generator.uniform(0.100, 0.200) for _ in range(40)])
+        slow_call_count = limiter.get_limiter_statistics()['slow_call_count']
+        await self.release_calls(limiter, [random_generator.uniform(0.100, 0.200) for _ in range(20)])
+        self.assertEqual(limiter.get_limiter_statistics()['slow_call_count'], slow_call_count)
+
+    async def test_no_call_is_slow_before_enough_latencies_are_recorded(self):
+        limiter = SkymelApiEndpointRateLimiter(decrease_cooldown_seconds=0.0, minimum_latency_samples=5)
+        await self.release_calls(limiter, [0.001, 0.1, 0.001, 0.1])
+        self.assertIsNone(limiter.get_baseline_latency_seconds())
+        self.assertEqual(limiter.get_limiter_statistics()['slow_call_count'], 0)
+
+    def test_from_config_reads_the_baseline_settings(self):
+        limiter = SkymelApiEndpointRateLimiter.from_config({'baselineLatencyPercentile': 90, 'latencyWindowSize': 50,
+                                                            'minimumLatencySamples': 5})
+        self.assertEqual(limiter.baseline_latency_percentile, 90)
+        self.assertEqual(limiter.recent_latencies_seconds.maxlen, 50)
+        self.assertEqual(limiter.minimum_latency_samples, 5)
@@ -0,0 +1,75 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelApiStubBackend import SkymelApiStubBackend
+from ..skymelECGraphNodeForExternalApiCall import SkymelECGraphNodeForExternalApiCall
+from ..skymelHttpClientPool import SkymelHttpClientPool
+from ..skymelWebSocketConnectionManager import SkymelWebSocketConnectionManager
+
+
+class TestSkymelApiStubBackend(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await SkymelHttpClientPool.close_process_wide_pool()
+        await SkymelWebSocketConnectionManager.close_process_wide_manager()
+
+    def make_api_call_node(self, endpoint_url: str, extra_config: dict = None) -> SkymelECGraphNodeForExternalApiCall:
+        node_config = {
+            'nodeId': 'stub',
+            'nodeInputNames': ['external.value'],
+            'nodeOutputNames': ['echo'],
+            'nodeSubroutine': 'process_data',
+            'endpointUrl': endpoint_url,
+            'nodeInputNameToBackendInputNameMap': {'external.value': 'value'},
+            'maxRetries': 0
+        }
+        node_config.update(extra_config or {})
+        return SkymelECGraphNodeForExternalApiCall(node_config)
+
+    async def test_http_sse_and_websocket_endpoints_answer_and_count_connections(self):
+        async with SkymelApiStubBackend(latency_ms=1, response_payload_bytes=16) as stub_backend:
+            http_node = self.make_api_call_node(f"{stub_backend.base_url}/json")
+            for value in range(3):
+                self.assertTrue(await http_node.execute(None, {'external.value': value}))
+            self.assertDictEqual(http_node.get_last_execution_result()['echo'], {'value': 2})
+            self.assertEqual(len(http_node.get_last_execution_result()['padding']), 16)
+
+            sse_node = self.make_api_call_node(f"{stub_backend.base_url}/sse", {'streamResponseConfig': {'format': 'sse'}})
+            self.assertTrue(await sse_node.execute(None, {'external.value': 'prompt'}))
+            self.assertEqual(sse_node.get_last_execution_result()['text'], 'token 0 token 1 token 2 token 3 token 4 ')
+
+            websocket_nodes = [self.make_api_call_node(f"{stub_backend.base_url}/ws", {'isEndpointWebSocketUrl': True,
+                                                                                     'usePersistentWebSocketConnection': True})
+                               for _ in range(4)]
+            self.assertListEqual(await asyncio.gather(*[node.execute(None, {'external.value': value})
+                                                        for value, node in enumerate(websocket_nodes)]), [True] * 4)
+            self.assertListEqual([node.get_last_execution_result()['echo']['value'] for node in websocket_nodes],
+                                 [0, 1, 2, 3])
+
+            stub_statistics = stub_backend.get_stub_statistics()
+            self.assertEqual(stub_statistics['request_count'], 8)
+            # One pooled keep-alive connection for /json and /sse, one persistent WebSocket
+            self.assertEqual(stub_statistics['connection_count'], 2)
+
+    async def test_injected_errors_fail_requests(self):
+        async with SkymelApiStubBackend.from_config({'latencyMs': 0, 'errorRate': 1.0, 'errorStatus': 500}) as stub_backend:
+            node = self.make_api_call_node(f"{stub_backend.base_url}/json")
+            self.assertFalse(await node.execute(None, {'external.value': 1}))
+            self.assertEqual(node.get_api_statistics()['last_status_code'], 500)
+            self.assertEqual(stub_backend.get_stub_statistics()['error_count'], 1)
+
+    async def test_injected_websocket_errors_fail_requests_of_nodes_configured_with_the_error_key(self):
+        async with SkymelApiStubBackend.from_config({'latencyMs': 0, 'errorRate': 1.0}) as stub_backend:
+            for use_persistent_websocket_connection in (False, True):
+                node = self.make_api_call_node(f"{stub_backend.base_url}/ws", {
+                    'isEndpointWebSocketUrl': True, 'webSocketErrorKey': 'error',
+                    'usePersistentWebSocketConnection': use_persistent_websocket_connection
+                })
+                self.assertFalse(await node.execute(None, {'external.value': 1}))
+                self.assertEqual(node.get_api_statistics()['last_status_code'], 503)
+
+            streaming_node = self.make_api_call_node(f"{stub_backend.base_url}/ws", {
+                'isEndpointWebSocketUrl': True, 'webSocketErrorKey': 'error',
+                'streamResponseConfig': {'endMarkerKey': 'done'}
+            })
+            self.assertFalse(await streaming_node.execute(None, {'external.value': 1}))
+            self.assertEqual(stub_backend.get_stub_statistics()['error_count'], 3)
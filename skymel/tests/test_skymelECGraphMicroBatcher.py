@@ -0,0 +1,150 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelECGraphMicroBatcher import SkymelECGraphMicroBatcher
+from ..skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
+
+
+class DoublingNode(SkymelECGraphNodeForDataProcessing):
+    received_batch_sizes = []
+
+    def process_data(self, input_data):
+        return {'doubler.value': input_data['external.value'] * 2}
+
+    def process_data_batch(self, list_of_input_data):
+        DoublingNode.received_batch_sizes.append(len(list_of_input_data))
+        return super().process_data_batch(list_of_input_data)
+
+
+class ScalingNode(SkymelECGraphNodeForDataProcessing):
+    def process_data(self, input_data):
+        return {'scaler.value': input_data['external.value'] * self.data_processing_config['factor']}
+
+
+def make_scaling_node(factor: int) -> ScalingNode:
+    return ScalingNode({
+        'nodeId': 'scaler',
+        'nodeSubroutine': 'process_data',
+        'nodeOutputNames': ['value'],
+        'dataProcessingConfig': {
+            'factor': factor,
+            'outputFormattingEnabled': False,
+            'microBatching': {'enabled': True, 'maxBatchSize': 8, 'maxBatchWaitMs': 20}
+        }
+    })
+
+
+class TestSkymelECGraphMicroBatcher(IsolatedAsyncioTestCase):
+    async def test_submit_flushes_full_batches_and_scatters_results_in_order(self):
+        batch_sizes = []
+
+        def process_batch(items):
+            batch_sizes.append(len(items))
+            return [item * 10 for item in items]
+
+        micro_batcher = SkymelECGraphMicroBatcher(process_batch, max_batch_size=4, max_batch_wait_ms=1000)
+        results = await asyncio.gather(*[micro_batcher.submit(item) for item in range(8)])
+        self.assertListEqual(results, [item * 10 for item in range(8)])
+        self.assertListEqual(batch_sizes, [4, 4])
+
+    async def test_submit_flushes_partial_batch_after_max_wait(self):
+        micro_batcher = SkymelECGraphMicroBatcher(lambda items: [item + 1 for item in items], max_batch_size=100,
+                                                  max_batch_wait_ms=1)
+        self.assertListEqual(await asyncio.gather(micro_batcher.submit(1), micro_batcher.submit(2)), [2, 3])
+        self.assertDictEqual(micro_batcher.get_batching_statistics(),
+                             {'processed_batch_count': 1, 'processed_item_count': 2, 'average_batch_size': 2.0})
+
+    async def test_batch_flushed_by_the_timer_stays_referenced_while_processed(self):
+        async def process_batch(items):
+            await asyncio.sleep(0.02)
+            return [item + 1 for item in items]
+
+        micro_batcher = SkymelECGraphMicroBatcher(process_batch, max_batch_size=100, max_batch_wait_ms=1)
+        first_caller = asyncio.ensure_future(micro_batcher.submit(1))
+        await asyncio.sleep(0.01)
+        self.assertIsNone(micro_batcher.flush_timer_task)
+        self.assertEqual(len(micro_batcher.flush_tasks), 1)
+
+        # An item submitted while the timer's batch is processed starts a batch of its own
+        self.assertEqual(await micro_batcher.submit(2), 3)
+        self.assertEqual(await first_caller, 2)
+        self.assertEqual(micro_batcher.get_batching_statistics()['processed_batch_count'], 2)
+        await asyncio.sleep(0.001)
+        self.assertEqual(len(micro_batcher.flush_tasks), 0)
+
+    async def test_batch_failure_is_raised_to_every_waiting_caller(self):
+        def failing_process_batch(items):
+            raise ValueError("backend down")
+
+        micro_batcher = SkymelECGraphMicroBatcher(failing_process_batch, max_batch_size=2)
+        results = await asyncio.gather(micro_batcher.submit(1), micro_batcher.submit(2), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    async def test_cancelling_the_caller_that_filled_the_batch_does_not_cancel_the_batch(self):
+        async def process_batch(items):
+            await asyncio.sleep(0.02)
+            return [item * 10 for item in items]
+
+        micro_batcher = SkymelECGraphMicroBatcher(process_batch, max_batch_size=2, max_batch_wait_ms=1000)
+        first_caller = asyncio.ensure_future(micro_batcher.submit(1))
+        await asyncio.sleep(0)
+        filling_caller = asyncio.ensure_future(micro_batcher.submit(2))
+        await asyncio.sleep(0.005)
+        filling_caller.cancel()
+
+        self.assertEqual(await asyncio.wait_for(first_caller, timeout=1.0), 10)
+        self.assertTrue(filling_caller.cancelled())
+
+    async def test_cancelled_flush_cancels_every_waiting_caller(self):
+        async def process_batch(items):
+            await asyncio.sleep(1)
+            return items
+
+        micro_batcher = SkymelECGraphMicroBatcher(process_batch, max_batch_size=100, max_batch_wait_ms=1000)
+        callers = [asyncio.ensure_future(micro_batcher.submit(item)) for item in range(2)]
+        await asyncio.sleep(0)
+        flush_task = asyncio.ensure_future(micro_batcher.flush())
+        await asyncio.sleep(0.005)
+        flush_task.cancel()
+
+        results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=1.0)
+        self.assertTrue(all(isinstance(result, asyncio.CancelledError) for result in results))
+
+    async def test_data_processing_nodes_in_concurrent_executions_share_one_batch(self):
+        DoublingNode.received_batch_sizes = []
+        nodes = [DoublingNode({
+            'nodeId': 'doubler',
+            'nodeSubroutine': 'process_data',
+            'nodeOutputNames': ['value'],
+            'dataProcessingConfig': {
+                'outputFormattingEnabled': False,
+                'microBatching': {'enabled': True, 'maxBatchSize': 8, 'maxBatchWaitMs': 50}
+            }
+        }) for _ in range(5)]
+
+        statuses = await asyncio.gather(
+            *[node.execute(None, {'external.value': index}) for index, node in enumerate(nodes)])
+        self.assertListEqual(statuses, [True] * 5)
+        self.assertListEqual(DoublingNode.received_batch_sizes, [5])
+        for index, node in enumerate(nodes):
+            self.assertDictEqual(node.get_last_execution_result(), {'doubler.value': index * 2})
+
+    async def test_batches_are_processed_by_the_batch_callable_submitted_with_their_first_item(self):
+        micro_batcher = SkymelECGraphMicroBatcher(max_batch_size=2, max_batch_wait_ms=1000)
+        self.assertListEqual(await asyncio.gather(
+            micro_batcher.submit(1, lambda items: [item + 1 for item in items]),
+            micro_batcher.submit(2, lambda items: [item + 100 for item in items])), [2, 3])
+        self.assertListEqual(await asyncio.gather(
+            micro_batcher.submit(1, lambda items: [item * 10 for item in items]), micro_batcher.submit(2)), [10, 20])
+
+    async def test_differently_configured_nodes_with_the_same_id_do_not_share_batches(self):
+        nodes = [make_scaling_node(2), make_scaling_node(3), make_scaling_node(2), make_scaling_node(3)]
+        nodes.append(nodes[1].clone())
+        self.assertEqual(nodes[0].get_micro_batch_group_key(), nodes[2].get_micro_batch_group_key())
+        self.assertNotEqual(nodes[0].get_micro_batch_group_key(), nodes[1].get_micro_batch_group_key())
+
+        statuses = await asyncio.gather(*[node.execute(None, {'external.value': 1}) for node in nodes])
+        self.assertListEqual(statuses, [True] * 5)
+        self.assertListEqual([node.get_last_execution_result()['scaler.value'] for node in nodes], [2, 3, 2, 3, 3])
+        self.assertEqual(nodes[0].get_micro_batcher().get_batching_statistics()['processed_item_count'], 2)
+        self.assertEqual(nodes[1].get_micro_batcher().get_batching_statistics()['processed_item_count'], 3)
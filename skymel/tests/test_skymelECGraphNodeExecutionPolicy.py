@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelECGraphNode import SkymelECGraphNode
+from ..skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
+from ..skymelECGraphNodeExecutionPolicy import SkymelECGraphNodeExecutionPolicy
+
+
+def make_flaky_node(number_of_failures: int, exception_class, node_execution_policy: dict) -> SkymelECGraphNode:
+    call_count = 0
+
+    async def flaky_subroutine():
+        nonlocal call_count
+        call_count += 1
+        if call_count <= number_of_failures:
+            raise exception_class(f"failure {call_count}")
+        return {'flaky.calls': call_count}
+
+    return SkymelECGraphNode({
+        'nodeId': 'flaky',
+        'nodeOutputNames': ['calls'],
+        'nodeSubroutine': flaky_subroutine,
+        'nodeExecutionPolicy': node_execution_policy
+    })
+
+
+class TestSkymelECGraphNodeExecutionPolicy(IsolatedAsyncioTestCase):
+    def test_from_config_returns_none_without_config(self):
+        self.assertIsNone(SkymelECGraphNodeExecutionPolicy.from_config(None))
+        self.assertIsNone(SkymelECGraphNodeExecutionPolicy.from_config({}))
+
+    def test_is_retryable_exception_matches_class_names_and_classes_including_base_classes(self):
+        policy = SkymelECGraphNodeExecutionPolicy(retryable_exception_types=['OSError', ValueError])
+        self.assertTrue(policy.is_retryable_exception(ConnectionResetError()))
+        self.assertTrue(policy.is_retryable_exception(ValueError()))
+        self.assertFalse(policy.is_retryable_exception(KeyError()))
+
+    async def test_execute_retries_retryable_failures_until_success(self):
+        node = make_flaky_node(2, ConnectionError, {'maxRetries': 3, 'retryBackoffSeconds': 0.001})
+        self.assertTrue(await node.execute(None))
+        self.assertDictEqual(node.get_last_execution_result(), {'flaky.calls': 3})
+        self.assertEqual(node.execution_retry_count, 2)
+
+    async def test_execute_does_not_retry_non_retryable_failures(self):
+        node = make_flaky_node(1, KeyError, {'maxRetries': 3, 'retryBackoffSeconds': 0.001,
+                                             'retryableExceptionTypes': ['ConnectionError']})
+        self.assertFalse(await node.execute(None))
+        self.assertEqual(node.execution_retry_count, 0)
+
+    async def test_execute_times_out_slow_attempts(self):
+        async def slow_subroutine():
+            await asyncio.sleep(1)
+            return {'slow.done': True}
+
+        node = SkymelECGraphNode({
+            'nodeId': 'slow',
+            'nodeOutputNames': ['done'],
+            'nodeSubroutine': slow_subroutine,
+            'nodeExecutionPolicy': {'timeoutSeconds': 0.01, 'maxRetries': 1, 'retryBackoffSeconds': 0.001}
+        })
+        self.assertFalse(await node.execute(None))
+        self.assertEqual(node.execution_retry_count, 1)
+
+    async def test_timed_out_thread_offloaded_data_processing_stages_are_not_retried(self):
+        stage_threads_started = 0
+        stage_threads_finished = threading.Event()
+
+        class SlowDataProcessingNode(SkymelECGraphNodeForDataProcessing):
+            def process_data(self, input_data):
+                nonlocal stage_threads_started
+                stage_threads_started += 1
+                time.sleep(0.05)
+                stage_threads_finished.set()
+                return {'slow.done': True}
+
+        node = SlowDataProcessingNode({
+            'nodeId': 'slow',
+            'nodeOutputNames': ['done'],
+            'nodeSubroutine': 'process_data',
+            'nodeExecutionPolicy': {'timeoutSeconds': 0.01, 'maxRetries': 2, 'retryBackoffSeconds': 0.001}
+        })
+        self.assertFalse(await node.execute(None, {'external.value': 1}))
+        self.assertEqual(node.execution_retry_count, 0)
+        # The abandoned thread runs to completion, but no second execution of the stages was started
+        await asyncio.to_thread(stage_threads_finished.wait, 1.0)
+        self.assertEqual(stage_threads_started, 1)
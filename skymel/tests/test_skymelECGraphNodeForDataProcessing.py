@@ -0,0 +1,120 @@
+import io
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import numpy as np
+
+from ..skymelECGraphNode import SkymelECGraphNode
+from ..skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
+
+
+def make_data_processing_node(data_processing_config: dict) -> SkymelECGraphNodeForDataProcessing:
+    return SkymelECGraphNodeForDataProcessing({
+        'nodeId': 'processor',
+        'nodeSubroutine': 'process_data',
+        'nodeOutputNames': ['items'],
+        'dataProcessingConfig': data_processing_config
+    })
+
+
+class TestSkymelECGraphNodeForDataProcessing(TestCase):
+    def test_standard_output_format_copies_sequences_and_attaches_processing_stats(self):
+        node = make_data_processing_node({})
+        output = node.format_output_data((1, 2, 3))
+        self.assertListEqual(output['items'], [1, 2, 3])
+        self.assertEqual(output['count'], 3)
+        self.assertEqual(output['processing_stats']['node_id'], 'processor')
+
+    def test_columnar_output_format_keeps_numpy_arrays_without_copying(self):
+        node = make_data_processing_node({'outputFormat': 'columnar'})
+        array = np.arange(10)
+        output = node.format_output_data(array)
+        self.assertIs(output['items'], array)
+        self.assertEqual(output['count'], 10)
+        self.assertNotIn('processing_stats', output)
+        self.assertNotIn('metadata', output)
+        self.assertEqual(node.get_last_output_processing_stats()['node_id'], 'processor')
+
+    def test_columnar_output_format_converts_numbers_and_records_to_typed_columns(self):
+        node = make_data_processing_node({'outputFormat': 'columnar'})
+        numeric_output = node.format_output_data([1.5, 2.5])
+        self.assertEqual(numeric_output['items'].dtype, np.float64)
+
+        record_output = node.format_output_data([{'label': 'a', 'score': 0.1}, {'label': 'b', 'score': 0.9}])
+        np.testing.assert_array_equal(record_output['items']['score'], np.array([0.1, 0.9]))
+        np.testing.assert_array_equal(record_output['items']['label'], np.array(['a', 'b']))
+        self.assertEqual(record_output['count'], 2)
+
+        mixed_items = ['a', 1]
+        self.assertIs(node.format_output_data(mixed_items)['items'], mixed_items)
+
+    def test_columnar_output_format_returns_ragged_sequences_unchanged(self):
+        node = make_data_processing_node({'outputFormat': 'columnar'})
+        for ragged_items in [[1, [2, 3]], [{'v': [1, 2]}, {'v': [1]}], [{'v': None}, {'v': 1}]]:
+            self.assertIs(node.format_output_data(ragged_items)['items'], ragged_items)
+
+
+class ChunkSummingDataProcessingNode(SkymelECGraphNodeForDataProcessing):
+    def process_data_stream(self, input_chunks, input_data):
+        async def sum_chunks():
+            async for input_chunk in input_chunks:
+                yield int(np.sum(input_chunk))
+        return sum_chunks()
+
+
+class TestSkymelECGraphNodeForDataProcessingStreaming(IsolatedAsyncioTestCase):
+    async def test_streaming_processes_input_in_chunks_and_pushes_output_chunks_to_consumers(self):
+        node = ChunkSummingDataProcessingNode({
+            'nodeId': 'summer',
+            'nodeInputNames': ['external.values'],
+            'nodeOutputNames': ['sums'],
+            'nodeSubroutine': 'process_data',
+            'dataProcessingConfig': {'streaming': {'enabled': True, 'chunkSize': 4, 'maxBufferedChunks': 1}}
+        })
+        received_chunks = []
+
+        async def consumer_chunk_subroutine(producer_node_id, chunk):
+            received_chunks.append((producer_node_id, chunk))
+
+        consumer = SkymelECGraphNode({
+            'nodeId': 'consumer',
+            'nodeInputNames': ['summer.sums'],
+            'nodeSubroutine': lambda input_values: input_values,
+            'nodeStreamingInputChunkSubroutine': consumer_chunk_subroutine
+        })
+        node.set_streaming_chunk_consumer_nodes([consumer])
+
+        self.assertTrue(await node.execute(None, {'external.values': np.arange(10)}))
+        self.assertListEqual(node.get_last_execution_result()['items'], [6, 22, 17])
+        self.assertListEqual(received_chunks, [('summer', 6), ('summer', 22), ('summer', 17)])
+
+    async def test_streaming_reads_file_like_inputs_and_can_skip_aggregation(self):
+        node = make_data_processing_node({'streaming': {'enabled': True, 'chunkSize': 3,
+                                                        'streamInputName': 'external.document',
+                                                        'aggregateOutputChunks': False}})
+        node.process_data = lambda chunk: chunk.upper()
+
+        self.assertTrue(await node.execute(None, {'external.document': io.BytesIO(b'abcdefgh')}))
+        self.assertEqual(node.get_last_execution_result()['result'], 3)
+
+
+class TestSkymelECGraphNodeInputSchema(TestCase):
+    def test_input_schema_reports_structured_errors_per_input(self):
+        node = make_data_processing_node({'inputSchema': {
+            'external.image': {'type': 'ndarray', 'dtype': 'float32', 'shape': [None, 2]},
+            'external.prompt': {'type': 'str'},
+            'external.temperature': {'type': 'float', 'required': False}
+        }})
+
+        valid_input = {'external.image': np.zeros((5, 2), dtype=np.float32), 'external.prompt': 'hi'}
+        self.assertTrue(node.validate_input_data(valid_input))
+        self.assertListEqual(node.get_last_input_validation_errors(), [])
+
+        self.assertFalse(node.validate_input_data({'external.image': np.zeros((5, 3), dtype=np.int64),
+                                                   'external.temperature': True}))
+        errors = [(error['input_name'], error['error']) for error in node.get_last_input_validation_errors()]
+        self.assertListEqual(errors, [('external.image', 'dtype'), ('external.image', 'shape'),
+                                      ('external.prompt', 'missing'), ('external.temperature', 'type')])
+
+    def test_input_schema_rejects_unknown_types_at_construction(self):
+        with self.assertRaises(RuntimeError):
+            make_data_processing_node({'inputSchema': {'external.value': {'type': 'tensor'}}})
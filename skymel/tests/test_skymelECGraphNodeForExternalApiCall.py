@@ -0,0 +1,607 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from unittest import IsolatedAsyncioTestCase
+
+import numpy as np
+from aiohttp import web
+from websockets.asyncio.server import serve
+
+from ..skymelECGraphNode import SkymelECGraphNode
+from ..skymelECGraphNodeForExternalApiCall import SkymelECGraphNodeForExternalApiCall
+from ..skymelEcGraph import SkymelECGraph
+from ..skymelApiCircuitBreaker import SkymelApiCircuitBreaker
+from ..skymelApiEndpointRateLimiter import SkymelApiEndpointRateLimiter
+from ..skymelApiResponseCache import SkymelApiResponseCache
+from ..skymelApiRetryBudget import SkymelApiRetryBudget
+from ..skymelHttpClientPool import SkymelHttpClientPool
+from ..skymelWebSocketConnectionManager import SkymelWebSocketConnectionManager
+from .. import skymel_modelio_pb2
+
+
+class LocalApiServerTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.received_payloads = []
+        self.client_ports = set()
+
+        self.received_content_encodings = []
+
+        async def handle_echo(request):
+            self.received_content_encodings.append(request.headers.get('Content-Encoding', None))
+            payload = await request.json()
+            await asyncio.sleep(0.01)
+            self.received_payloads.append(payload)
+            self.client_ports.add(request.transport.get_extra_info('peername')[1])
+            return web.json_response({'echo.value': payload.get('value')})
+
+        async def handle_throttled(request):
+            self.received_payloads.append(await request.json())
+            return web.Response(status=429, text='slow down', headers={'Retry-After': '1'})
+
+        self.flaky_backend_is_down = True
+
+        async def handle_flaky(request):
+            payload = await request.json()
+            self.received_payloads.append(payload)
+            if self.flaky_backend_is_down:
+                return web.Response(status=500, text='backend down')
+            return web.json_response({'echo.value': payload.get('value')})
+
+        self.first_streamed_chunk_received = asyncio.Event()
+
+        async def handle_sse(request):
+            payload = await request.json()
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            await response.write(f'data: {{"echo.value": "{payload["value"]}"}}\n\n'.encode())
+            # The rest of the stream is only sent once the client has seen the first chunk
+            await asyncio.wait_for(self.first_streamed_chunk_received.wait(), timeout=5)
+            await response.write(b': keep-alive comment\n\ndata: {"echo.value":\ndata: "!"}\n\ndata: [DONE]\n\n')
+            return response
+
+        async def handle_ndjson(request):
+            payload = await request.json()
+            response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+            await response.prepare(request)
+            for token in payload['value'].split(' '):
+                await response.write((json.dumps({'echo.value': token + ' '}) + '\n').encode())
+            await response.write(b'{"done": true}\n')
+            return response
+
+        self.received_protobuf_request_ids = []
+
+        async def handle_protobuf(request):
+            inference_request = skymel_modelio_pb2.InferenceRequest()
+            inference_request.ParseFromString(await request.read())
+            self.received_protobuf_request_ids.append(inference_request.request_id)
+            graph_input = inference_request.graph_output[0]
+            features = graph_input.float_outputs[0]
+            inference_response = skymel_modelio_pb2.InferenceResponse(request_id=inference_request.request_id)
+            graph_output = inference_response.graph_output.add()
+            graph_output.float_outputs.add(node_name='echo.doubled',
+                                           output_flat_array=[2 * value for value in features.output_flat_array],
+                                           array_shape=features.array_shape)
+            graph_output.int32_outputs.add(node_name='echo.imageSize',
+                                           output_flat_array=[len(inference_request.images[0].image_bytes)])
+            graph_output.string_outputs.add(node_name='echo.label',
+                                            output_strings=graph_input.string_outputs[0].output_strings)
+            return web.Response(body=inference_response.SerializeToString(), content_type='application/x-protobuf')
+
+        async def handle_batch(request):
+            payload = await request.json()
+            self.received_payloads.append(payload)
+            if 'inputs' in payload:
+                return web.json_response({'outputs': [{'echo.value': inputs['value']} for inputs in payload['inputs']]})
+            return web.json_response({'echo.value': [2 * value for value in payload['value']], 'model': 'v1'})
+
+        # Responses (status, headers) returned before the unstable endpoint starts succeeding
+        self.unstable_failure_responses = []
+
+        async def handle_unstable(request):
+            payload = await request.json()
+            self.received_payloads.append(payload)
+            if len(self.unstable_failure_responses) > 0:
+                status, headers = self.unstable_failure_responses.pop(0)
+                return web.Response(status=status, text='failure', headers=headers)
+            return web.json_response({'echo.value': payload.get('value')})
+
+        application = web.Application()
+        application.router.add_post('/echo', handle_echo)
+        application.router.add_post('/unstable', handle_unstable)
+        application.router.add_post('/batch', handle_batch)
+        application.router.add_post('/protobuf', handle_protobuf)
+        application.router.add_post('/sse', handle_sse)
+        application.router.add_post('/ndjson', handle_ndjson)
+        application.router.add_post('/throttled', handle_throttled)
+        application.router.add_post('/flaky', handle_flaky)
+        self.runner = web.AppRunner(application)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def asyncTearDown(self):
+        await SkymelHttpClientPool.close_process_wide_pool()
+        await self.runner.cleanup()
+
+    def make_api_call_node(self, extra_config: dict = None) -> SkymelECGraphNodeForExternalApiCall:
+        node_config = {
+            'nodeId': 'echo',
+            'nodeInputNames': ['external.value'],
+            'nodeOutputNames': ['value'],
+            'nodeSubroutine': 'process_data',
+            'endpointUrl': f"{self.base_url}/echo",
+            'nodeInputNameToBackendInputNameMap': {'external.value': 'value'},
+            'maxRetries': 0
+        }
+        node_config.update(extra_config or {})
+        return SkymelECGraphNodeForExternalApiCall(node_config)
+
+
+class TestSkymelECGraphNodeForExternalApiCall(LocalApiServerTestCase):
+    async def test_http_requests_reuse_one_pooled_keep_alive_connection(self):
+        node = self.make_api_call_node()
+        for value in range(3):
+            self.assertTrue(await node.execute(None, {'external.value': value}))
+            self.assertEqual(node.get_last_execution_result()['echo.value'], value)
+
+        pool_statistics = SkymelHttpClientPool.get_process_wide_pool().get_pool_statistics()
+        self.assertEqual(pool_statistics['session_create_count'], 1)
+        self.assertEqual(pool_statistics['session_reuse_count'], 2)
+        self.assertEqual(len(self.client_ports), 1)
+
+    async def test_large_payloads_are_serialized_once_and_compressed(self):
+        node = self.make_api_call_node({'payloadSerializationConfig': {'compression': 'gzip',
+                                                                       'compressionThresholdBytes': 1024}})
+        for value in ['small', 'x' * 4096]:
+            self.assertTrue(await node.execute(None, {'external.value': value}))
+            self.assertEqual(node.get_last_execution_result()['echo.value'], value)
+        self.assertListEqual(self.received_content_encodings, [None, 'gzip'])
+
+        processing_metadata = node.get_last_execution_result()['metadata']
+        self.assertGreater(processing_metadata['request_payload_size'], 4096)
+        self.assertLess(processing_metadata['request_body_size'], 1024)
+        self.assertIsNone(node.last_serialized_request_payload)
+
+    async def test_protobuf_transport_sends_packed_tensors_and_raw_image_bytes(self):
+        node = self.make_api_call_node({
+            'endpointUrl': f"{self.base_url}/protobuf",
+            'nodeInputNames': ['external.features', 'external.image', 'external.label'],
+            'nodeInputNameToBackendInputNameMap': {'external.features': 'features', 'external.image': 'image',
+                                                   'external.label': 'label'},
+            'protobufTransportConfig': {'imageInputNames': ['image']}
+        })
+        features = np.arange(6, dtype=np.float32).reshape(2, 3)
+        self.assertTrue(await node.execute(None, {'external.features': features, 'external.image': b'\x89PNG' * 8,
+                                                  'external.label': 'cat'}))
+
+        result = node.get_last_execution_result()
+        np.testing.assert_array_equal(result['echo.doubled'], features * 2)
+        self.assertEqual(result['echo.imageSize'], 32)
+        self.assertEqual(result['echo.label'], 'cat')
+
+    async def test_protobuf_responses_are_cached_and_requests_still_carry_a_request_id(self):
+        node = self.make_api_call_node({
+            'endpointUrl': f"{self.base_url}/protobuf",
+            'nodeInputNames': ['external.features', 'external.image', 'external.label'],
+            'nodeInputNameToBackendInputNameMap': {'external.features': 'features', 'external.image': 'image',
+                                                   'external.label': 'label'},
+            'protobufTransportConfig': {'imageInputNames': ['image']},
+            'responseCacheConfig': {'ttlSeconds': 60, 'cacheName': 'protobuf_test'}
+        })
+        input_values = {'external.features': np.ones(3, dtype=np.float32), 'external.image': b'\x89PNG',
+                        'external.label': 'dog'}
+        request_payload = node.build_request_payload(node.map_node_inputs_to_backend_inputs(input_values))
+        self.assertEqual(node.get_response_cache_key(request_payload),
+                         node.get_response_cache_key(dict(request_payload)))
+        self.assertEqual(node.get_request_coalescing_key(request_payload),
+                         node.get_request_coalescing_key(dict(request_payload)))
+
+        for _ in range(2):
+            self.assertTrue(await node.execute(None, input_values))
+            self.assertEqual(node.get_last_execution_result()['echo.label'], 'dog')
+        self.assertEqual(len(self.received_protobuf_request_ids), 1)
+        self.assertEqual(len(self.received_protobuf_request_ids[0]), 32)
+        self.assertEqual(node.get_response_cache().get_cache_statistics()['memory_hit_count'], 1)
+        SkymelApiResponseCache.close_shared_caches()
+
+    async def test_concurrent_calls_are_batched_into_one_request_and_split_back(self):
+        nodes = [self.make_api_call_node({'endpointUrl': f"{self.base_url}/batch",
+                                          'requestBatchingConfig': {'maxBatchWaitMs': 20}}) for _ in range(8)]
+        self.assertListEqual(await asyncio.gather(*[node.execute(None, {'external.value': value})
+                                                    for value, node in enumerate(nodes)]), [True] * 8)
+        self.assertListEqual([node.get_last_execution_result()['echo.value'] for node in nodes], list(range(8)))
+        self.assertEqual(len(self.received_payloads), 1)
+        self.assertEqual(nodes[0].get_api_statistics()['request_batching']['average_batch_size'], 8)
+        for node in nodes:
+            api_statistics = node.get_api_statistics()
+            self.assertEqual(api_statistics['successful_calls'], 1)
+            self.assertEqual(api_statistics['success_rate'], 1.0)
+            self.assertEqual(api_statistics['last_status_code'], 200)
+
+        column_nodes = [self.make_api_call_node({'endpointUrl': f"{self.base_url}/batch",
+                                                 'requestBatchingConfig': {'inputLayout': 'columns',
+                                                                           'batchInputKey': None,
+                                                                           'outputLayout': 'columns',
+                                                                           'batchOutputKey': None}})
+                        for _ in range(3)]
+        await asyncio.gather(*[node.execute(None, {'external.value': value}) for value, node in enumerate(column_nodes)])
+        self.assertListEqual([node.get_last_execution_result()['echo.value'] for node in column_nodes], [0, 2, 4])
+        self.assertEqual(column_nodes[2].get_last_execution_result()['model'], 'v1')
+        self.assertEqual(len(self.received_payloads), 2)
+
+    async def test_retries_honour_retry_after_and_skip_non_retryable_errors(self):
+        node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/unstable", 'maxRetries': 3,
+                                        'retryDelay': 0.001})
+        self.unstable_failure_responses = [(503, {'Retry-After': '0.2'})]
+        start_time = time.monotonic()
+        self.assertTrue(await node.execute(None, {'external.value': 1}))
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.2)
+        self.assertEqual(len(self.received_payloads), 2)
+
+        self.unstable_failure_responses = [(400, {}), (400, {})]
+        self.assertFalse(await node.execute(None, {'external.value': 2}))
+        self.assertEqual(len(self.received_payloads), 3)
+
+        self.unstable_failure_responses = [(503, {'Retry-After': '3600'})]
+        self.assertFalse(await node.execute(None, {'external.value': 3}))
+        self.assertEqual(len(self.received_payloads), 4)
+
+        statistics = node.get_api_statistics()
+        self.assertEqual(statistics['retried_attempt_count'], 1)
+        self.assertEqual(statistics['failed_calls'], 2)
+
+    async def test_execution_policy_retries_do_not_multiply_the_node_retries(self):
+        execution_policy = {'maxRetries': 2, 'retryBackoffSeconds': 0.001}
+        node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/unstable", 'maxRetries': 2,
+                                        'retryDelay': 0.001, 'nodeExecutionPolicy': execution_policy})
+        self.unstable_failure_responses = [(500, {})] * 20
+        self.assertFalse(await node.execute(None, {'external.value': 1}))
+        self.assertEqual(len(self.received_payloads), 3)
+
+        policy_only_node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/unstable",
+                                                    'nodeExecutionPolicy': execution_policy})
+        self.assertFalse(await policy_only_node.execute(None, {'external.value': 2}))
+        self.assertEqual(len(self.received_payloads), 6)
+        self.assertEqual(policy_only_node.execution_retry_count, 2)
+
+        self.unstable_failure_responses = [(400, {})] * 20
+        self.assertFalse(await policy_only_node.execute(None, {'external.value': 3}))
+        self.assertEqual(len(self.received_payloads), 7)
+
+        circuit_breaker_node = self.make_api_call_node({
+            'endpointUrl': f"{self.base_url}/unstable", 'nodeExecutionPolicy': execution_policy,
+            'circuitBreakerConfig': {'minimumCallCount': 1, 'failureRateThreshold': 0.5, 'openDurationSeconds': 60}})
+        self.unstable_failure_responses = [(500, {})] * 20
+        self.assertFalse(await circuit_breaker_node.execute(None, {'external.value': 4}))
+        self.assertEqual(circuit_breaker_node.get_last_execution_status(), 'circuit_open')
+        self.assertEqual(len(self.received_payloads), 8)
+        self.assertEqual(circuit_breaker_node.execution_retry_count, 1)
+        self.assertFalse(await circuit_breaker_node.execute(None, {'external.value': 5}))
+        self.assertEqual(len(self.received_payloads), 8)
+        self.assertEqual(circuit_breaker_node.execution_retry_count, 1)
+        SkymelApiCircuitBreaker.configure_endpoint_circuit_breaker(f"{self.base_url}/unstable", None)
+
+    async def test_retries_stop_when_the_retry_budget_is_spent(self):
+        SkymelApiRetryBudget.configure_process_wide_budget(retry_budget_ratio=0.0, max_tokens=1.0)
+        try:
+            node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/unstable", 'maxRetries': 3,
+                                            'retryDelay': 0.001})
+            self.unstable_failure_responses = [(500, {})] * 8
+            self.assertFalse(await node.execute(None, {'external.value': 1}))
+            self.assertEqual(len(self.received_payloads), 2)
+            self.assertEqual(SkymelApiRetryBudget.get_process_wide_budget().denied_retry_count, 1)
+        finally:
+            SkymelApiRetryBudget.configure_process_wide_budget(retry_budget_ratio=0.1)
+
+    async def test_identical_concurrent_requests_are_coalesced_into_one_backend_call(self):
+        self.assertFalse(self.make_api_call_node().coalesce_identical_requests)
+        nodes = [self.make_api_call_node({'coalesceIdenticalRequests': True}) for _ in range(4)]
+        statuses = await asyncio.gather(*[node.execute(None, {'external.value': 5}) for node in nodes])
+        self.assertListEqual(statuses, [True] * 4)
+        self.assertEqual(len(self.received_payloads), 1)
+        for node in nodes:
+            self.assertEqual(node.get_api_statistics()['successful_calls'], 1)
+            self.assertEqual(node.get_api_statistics()['last_status_code'], 200)
+
+        results = [node.get_last_execution_result() for node in nodes]
+        results[0]['echo.value'] = 'modified'
+        self.assertEqual(results[1]['echo.value'], 5)
+
+        await asyncio.gather(*[node.execute(None, {'external.value': value}) for value, node in enumerate(nodes)])
+        self.assertEqual(len(self.received_payloads), 5)
+
+    async def test_payload_is_encoded_once_for_the_keys_and_the_body_and_not_compressed_on_cache_hits(self):
+        node = self.make_api_call_node({'coalesceIdenticalRequests': True,
+                                        'responseCacheConfig': {'ttlSeconds': 60, 'cacheName': 'encoding_test'}})
+        payload_serializer = node.payload_serializer
+        dumps_count = 0
+        encode_body_count = 0
+        original_dumps, original_encode_body = payload_serializer.dumps, payload_serializer.encode_body
+
+        def counting_dumps(payload):
+            nonlocal dumps_count
+            dumps_count += 1
+            return original_dumps(payload)
+
+        def counting_encode_body(body, content_type):
+            nonlocal encode_body_count
+            encode_body_count += 1
+            return original_encode_body(body, content_type)
+
+        payload_serializer.dumps = counting_dumps
+        payload_serializer.encode_body = counting_encode_body
+        for _ in range(2):
+            self.assertTrue(await node.execute(None, {'external.value': 7}))
+            self.assertEqual(node.get_last_execution_result()['echo.value'], 7)
+        self.assertEqual(len(self.received_payloads), 1)
+        self.assertEqual(dumps_count, 2)
+        self.assertEqual(encode_body_count, 1)
+        self.assertNotIn('request_body_size', node.get_last_execution_result()['metadata'])
+        SkymelApiResponseCache.close_shared_caches()
+
+    async def test_cached_responses_are_served_from_memory_and_from_disk_after_a_restart(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            response_cache_config = {'ttlSeconds': 60, 'cacheName': 'echo_test',
+                                     'sqlitePath': os.path.join(cache_directory, 'cache.sqlite')}
+            node = self.make_api_call_node({'responseCacheConfig': response_cache_config})
+            for _ in range(2):
+                self.assertTrue(await node.execute(None, {'external.value': 3}))
+            self.assertEqual(len(self.received_payloads), 1)
+            self.assertEqual(node.get_response_cache().get_cache_statistics()['memory_hit_count'], 1)
+            self.assertEqual(node.get_api_statistics()['successful_calls'], 2)
+            self.assertEqual(node.get_api_statistics()['success_rate'], 1.0)
+
+            SkymelApiResponseCache.close_shared_caches()
+            restarted_node = self.make_api_call_node({'responseCacheConfig': response_cache_config})
+            self.assertTrue(await restarted_node.execute(None, {'external.value': 3}))
+            self.assertEqual(restarted_node.get_last_execution_result()['echo.value'], 3)
+            self.assertEqual(len(self.received_payloads), 1)
+            self.assertEqual(restarted_node.get_response_cache().get_cache_statistics()['disk_hit_count'], 1)
+
+            opted_out_node = self.make_api_call_node({'responseCacheConfig': {**response_cache_config, 'enabled': False}})
+            self.assertTrue(await opted_out_node.execute(None, {'external.value': 3}))
+            self.assertEqual(len(self.received_payloads), 2)
+            SkymelApiResponseCache.close_shared_caches()
+
+    async def test_rate_limited_calls_are_spaced_by_the_token_bucket(self):
+        rate_limit_config = {'requestsPerSecond': 20, 'burst': 1}
+        nodes = [self.make_api_call_node({'rateLimitConfig': rate_limit_config}) for _ in range(3)]
+        start_time = time.monotonic()
+        statuses = await asyncio.gather(*[node.execute(None, {'external.value': value})
+                                          for value, node in enumerate(nodes)])
+        self.assertListEqual(statuses, [True] * 3)
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.09)
+        self.assertIs(nodes[0].get_endpoint_rate_limiter(), nodes[2].get_endpoint_rate_limiter())
+        SkymelApiEndpointRateLimiter.configure_endpoint_limiter(f"{self.base_url}/echo", None)
+
+    async def test_throttled_calls_shrink_the_endpoint_concurrency_limit(self):
+        node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/throttled",
+                                        'rateLimitConfig': {'initialConcurrency': 8, 'minConcurrency': 2}})
+        self.assertFalse(await node.execute(None, {'external.value': 1}))
+
+        limiter_statistics = node.get_api_statistics()['rate_limiter']
+        self.assertEqual(limiter_statistics['concurrency_limit'], 4)
+        self.assertEqual(limiter_statistics['throttled_call_count'], 1)
+        self.assertEqual(limiter_statistics['calls_in_flight'], 0)
+        SkymelApiEndpointRateLimiter.configure_endpoint_limiter(f"{self.base_url}/throttled", None)
+
+    async def test_open_circuit_breaker_fails_fast_then_probes_and_closes(self):
+        circuit_breaker_config = {'minimumCallCount': 2, 'failureRateThreshold': 0.5, 'openDurationSeconds': 0.2}
+        node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/flaky",
+                                        'circuitBreakerConfig': circuit_breaker_config})
+        for value in range(2):
+            self.assertFalse(await node.execute(None, {'external.value': value}))
+            self.assertEqual(node.get_last_execution_status(), 'failed')
+        self.assertEqual(node.get_endpoint_circuit_breaker().get_state(), SkymelApiCircuitBreaker.OPEN)
+
+        self.assertFalse(await node.execute(None, {'external.value': 2}))
+        self.assertEqual(node.get_last_execution_status(), 'circuit_open')
+        self.assertEqual(len(self.received_payloads), 2)
+
+        fallback_node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/flaky",
+                                                 'circuitBreakerConfig': {'fallbackOutputs': {'echo.value': None}}})
+        self.assertTrue(await fallback_node.execute(None, {'external.value': 3}))
+        self.assertEqual(fallback_node.get_last_execution_status(), 'circuit_open_fallback')
+        self.assertIsNone(fallback_node.get_last_execution_result()['echo.value'])
+        self.assertEqual(len(self.received_payloads), 2)
+
+        self.flaky_backend_is_down = False
+        await asyncio.sleep(0.25)
+        self.assertTrue(await node.execute(None, {'external.value': 4}))
+        self.assertEqual(node.get_last_execution_status(), 'succeeded')
+        self.assertEqual(node.get_endpoint_circuit_breaker().get_state(), SkymelApiCircuitBreaker.CLOSED)
+        SkymelApiCircuitBreaker.configure_endpoint_circuit_breaker(f"{self.base_url}/flaky", None)
+
+    async def test_sse_response_is_streamed_as_partial_outputs_before_it_completes(self):
+        node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/sse", 'streamResponseConfig': {'format': 'sse'}})
+        partial_outputs = []
+        async for node_outputs in node.stream_outputs({'external.value': 'hi'}):
+            partial_outputs.append(node_outputs)
+            self.first_streamed_chunk_received.set()
+        self.assertListEqual(partial_outputs, [{'echo.value': 'hi'}, {'echo.value': '!'}])
+        self.assertIsNotNone(node.get_api_statistics()['last_time_to_first_chunk_ms'])
+
+    async def test_streamed_calls_are_bounded_by_the_execution_policy_timeout(self):
+        node = self.make_api_call_node({'endpointUrl': f"{self.base_url}/sse", 'streamResponseConfig': {'format': 'sse'},
+                                        'nodeExecutionPolicy': {'timeoutSeconds': 0.2, 'maxRetries': 2}})
+        start_time = time.monotonic()
+        self.assertFalse(await node.execute(None, {'external.value': 'hi'}))
+        self.assertLess(time.monotonic() - start_time, 2.0)
+        self.assertEqual(node.execution_retry_count, 0)
+        # Lets the backend finish the abandoned stream
+        self.first_streamed_chunk_received.set()
+
+    async def test_cancelled_streamed_call_waiting_for_the_rate_limiter_hands_back_the_probe_slot(self):
+        endpoint_url = f"{self.base_url}/sse"
+        node = self.make_api_call_node({'endpointUrl': endpoint_url, 'streamResponseConfig': {'format': 'sse'},
+                                        'circuitBreakerConfig': {'openDurationSeconds': 0.01},
+                                        'rateLimitConfig': {'initialConcurrency': 1, 'maxConcurrency': 1}})
+        endpoint_circuit_breaker = node.get_endpoint_circuit_breaker()
+        endpoint_rate_limiter = node.get_endpoint_rate_limiter()
+        try:
+            endpoint_circuit_breaker.open()
+            await asyncio.sleep(0.02)
+            self.assertEqual(endpoint_circuit_breaker.get_state(), SkymelApiCircuitBreaker.HALF_OPEN)
+
+            await endpoint_rate_limiter.acquire()
+            execution_task = asyncio.ensure_future(node.execute(None, {'external.value': 'hi'}))
+            await asyncio.sleep(0.05)
+            self.assertEqual(endpoint_circuit_breaker.probe_calls_in_flight, 1)
+            execution_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await execution_task
+            await endpoint_rate_limiter.release(None, None)
+
+            self.assertEqual(endpoint_circuit_breaker.probe_calls_in_flight, 0)
+            self.assertEqual(endpoint_rate_limiter.calls_in_flight, 0)
+            endpoint_circuit_breaker.before_call()
+        finally:
+            SkymelApiCircuitBreaker.configure_endpoint_circuit_breaker(endpoint_url, None)
+            SkymelApiEndpointRateLimiter.configure_endpoint_limiter(endpoint_url, None)
+
+    async def test_ndjson_chunks_are_forwarded_downstream_and_aggregated(self):
+        forwarded_chunks = []
+
+        async def collect_chunk(producer_node_id, chunk):
+            forwarded_chunks.append(chunk['echo.value'])
+
+        graph = SkymelECGraph({'graphId': 'api', 'externalInputNames': ['external.value']})
+        graph.add_node(self.make_api_call_node({'endpointUrl': f"{self.base_url}/ndjson",
+                                                'streamResponseConfig': {'format': 'ndjson'}}))
+        graph.add_node(SkymelECGraphNode({'nodeId': 'display', 'nodeInputNames': ['echo.value'],
+                                          'nodeOutputNames': ['text'],
+                                          'nodeSubroutine': lambda inputs: {'display.text': inputs['echo.value']},
+                                          'nodeStreamingInputChunkSubroutine': collect_chunk}))
+        self.assertTrue(await graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 'a b c'}}))
+        self.assertListEqual(forwarded_chunks, ['a ', 'b ', 'c '])
+        self.assertEqual(graph.get_node_by_id('display').get_last_execution_result()['display.text'], 'a b c ')
+
+    async def test_graph_scoped_pool_is_used_by_its_nodes_and_closed_on_dispose(self):
+        graph = SkymelECGraph({'graphId': 'api', 'externalInputNames': ['external.value'],
+                               'httpClientPoolConfig': {'limitPerHost': 4}})
+        graph.add_node(self.make_api_call_node())
+        self.assertTrue(await graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 7}}))
+
+        graph_pool = graph.get_http_client_pool()
+        self.assertEqual(graph_pool.get_pool_statistics()['open_session_count'], 1)
+        self.assertEqual(SkymelHttpClientPool.get_process_wide_pool().get_pool_statistics()['session_create_count'], 0)
+
+        await graph.dispose()
+        self.assertEqual(graph_pool.get_pool_statistics()['open_session_count'], 0)
+
+
+class TestSkymelWebSocketConnectionManager(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.handshake_count = 0
+        self.connections = []
+
+        async def handle_connection(websocket):
+            self.handshake_count += 1
+            self.connections.append(websocket)
+
+            async def reply(request):
+                if 'stream' in request:
+                    for token in request['stream']:
+                        await websocket.send(json.dumps({'echo.value': token}))
+                    await websocket.send(json.dumps({'done': True}))
+                    return
+                if 'uncorrelated' in request:
+                    await asyncio.sleep(0.05)
+                    await websocket.send(json.dumps({'echo.value': request['uncorrelated']}))
+                    return
+                # Later requests are answered first, so replies arrive out of order
+                await asyncio.sleep(0.05 / (1 + request['value']))
+                await websocket.send(json.dumps({**{key: request[key] for key in ('requestId', 'correlationId')
+                                                    if key in request},
+                                                 'echo.value': request['value'],
+                                                 'authorization': websocket.request.headers.get('Authorization')}))
+
+            reply_tasks = [asyncio.ensure_future(reply(json.loads(message))) async for message in websocket]
+            await asyncio.gather(*reply_tasks, return_exceptions=True)
+
+        self.server = await serve(handle_connection, '127.0.0.1', 0)
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        self.connection_manager = SkymelWebSocketConnectionManager(heartbeat_interval_seconds=1)
+
+    async def asyncTearDown(self):
+        await self.connection_manager.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def make_websocket_node(self, extra_config: dict = None) -> SkymelECGraphNodeForExternalApiCall:
+        node_config = {
+            'nodeId': 'echo',
+            'nodeInputNames': ['external.value'],
+            'nodeOutputNames': ['value'],
+            'nodeSubroutine': 'process_data',
+            'endpointUrl': self.url,
+            'isEndpointWebSocketUrl': True,
+            'apiKey': 'secret',
+            'nodeInputNameToBackendInputNameMap': {'external.value': 'value'},
+            'usePersistentWebSocketConnection': True,
+            'maxRetries': 0
+        }
+        node_config.update(extra_config or {})
+        node = SkymelECGraphNodeForExternalApiCall(node_config)
+        node.set_websocket_connection_manager(self.connection_manager)
+        return node
+
+    async def test_concurrent_requests_share_one_handshake_and_are_correlated_by_request_id(self):
+        nodes = [self.make_websocket_node() for _ in range(5)]
+        statuses = await asyncio.gather(*[node.execute(None, {'external.value': value})
+                                          for value, node in enumerate(nodes)])
+        self.assertListEqual(statuses, [True] * 5)
+        for value, node in enumerate(nodes):
+            result = node.get_last_execution_result()
+            self.assertEqual(result['echo.value'], value)
+            self.assertEqual(result['authorization'], 'Bearer secret')
+            self.assertNotIn('requestId', result)
+        self.assertEqual(self.handshake_count, 1)
+
+    async def test_requests_reconnect_after_the_connection_drops(self):
+        node = self.make_websocket_node()
+        self.assertTrue(await node.execute(None, {'external.value': 1}))
+        await self.connections[0].close()
+        await asyncio.sleep(0.05)
+
+        self.assertTrue(await node.execute(None, {'external.value': 2}))
+        self.assertEqual(node.get_last_execution_result()['echo.value'], 2)
+        self.assertEqual(self.handshake_count, 2)
+
+    async def test_persistent_connection_is_opt_in(self):
+        node = self.make_websocket_node({'usePersistentWebSocketConnection': False})
+        self.assertTrue(await node.execute(None, {'external.value': 1}))
+        self.assertTrue(await node.execute(None, {'external.value': 2}))
+        self.assertEqual(self.handshake_count, 2)
+        self.assertFalse(SkymelECGraphNodeForExternalApiCall({
+            'nodeId': 'echo', 'nodeSubroutine': 'process_data', 'endpointUrl': self.url, 'isEndpointWebSocketUrl': True
+        }).use_persistent_websocket_connection)
+
+    async def test_request_id_key_is_configurable_per_node(self):
+        nodes = [self.make_websocket_node({'webSocketRequestIdKey': 'correlationId'}) for _ in range(3)]
+        statuses = await asyncio.gather(*[node.execute(None, {'external.value': value})
+                                          for value, node in enumerate(nodes)])
+        self.assertListEqual(statuses, [True] * 3)
+        self.assertListEqual([node.get_last_execution_result()['echo.value'] for node in nodes], [0, 1, 2])
+        self.assertNotIn('correlationId', nodes[0].get_last_execution_result())
+
+    async def test_uncorrelated_replies_fail_when_several_requests_are_pending(self):
+        extra_config = {'nodeInputNameToBackendInputNameMap': {'external.value': 'uncorrelated'}}
+        single_node = self.make_websocket_node(extra_config)
+        self.assertTrue(await single_node.execute(None, {'external.value': 'alone'}))
+        self.assertEqual(single_node.get_last_execution_result()['echo.value'], 'alone')
+
+        nodes = [self.make_websocket_node(extra_config) for _ in range(2)]
+        statuses = await asyncio.gather(*[node.execute(None, {'external.value': value})
+                                          for value, node in enumerate(nodes)])
+        self.assertListEqual(statuses, [False, False])
+        self.assertIn('cannot be correlated', nodes[0].last_error_message)
+
+    async def test_multi_frame_replies_are_streamed_until_the_end_marker(self):
+        node = self.make_websocket_node({'nodeInputNameToBackendInputNameMap': {'external.value': 'stream'},
+                                         'streamResponseConfig': {'enabled': True}})
+        self.assertTrue(await node.execute(None, {'external.value': ['x', 'y', 'z']}))
+        self.assertEqual(node.get_last_execution_result()['echo.value'], 'xyz')
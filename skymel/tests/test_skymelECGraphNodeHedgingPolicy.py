@@ -0,0 +1,94 @@
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelECGraphNode import SkymelECGraphNode
+from ..skymelECGraphNodeHedgingPolicy import SkymelECGraphNodeHedgeBudget, SkymelECGraphNodeHedgingPolicy
+
+
+class TestSkymelECGraphNodeHedgingPolicy(IsolatedAsyncioTestCase):
+    def test_get_hedge_delay_seconds_needs_minimum_samples_and_uses_percentile(self):
+        policy = SkymelECGraphNodeHedgingPolicy(hedge_after_percentile=95, minimum_timing_samples=20)
+        self.assertIsNone(policy.get_hedge_delay_seconds([10.0] * 19))
+        timings = [float(milliseconds) for milliseconds in range(1, 101)]
+        self.assertAlmostEqual(policy.get_hedge_delay_seconds(timings), 0.095)
+
+    async def test_slow_attempt_is_hedged_and_loser_is_cancelled(self):
+        call_count = 0
+        cancelled_attempts = 0
+
+        async def tail_latency_subroutine():
+            nonlocal call_count, cancelled_attempts
+            call_count += 1
+            try:
+                await asyncio.sleep(5 if call_count == 1 else 0.001)
+            except asyncio.CancelledError:
+                cancelled_attempts += 1
+                raise
+            return {'remote.attempt': call_count}
+
+        node = SkymelECGraphNode({
+            'nodeId': 'remote',
+            'nodeOutputNames': ['attempt'],
+            'nodeSubroutine': tail_latency_subroutine,
+            'nodeHedgingPolicy': {'hedgeAfterPercentile': 95, 'minimumTimingSamples': 20}
+        })
+        node.get_node_hedging_policy().hedge_budget = SkymelECGraphNodeHedgeBudget(hedge_budget_ratio=0.05)
+        node.execution_timings_milliseconds.extend([10.0] * 20)
+
+        start_time = time.time()
+        self.assertTrue(await node.execute(None))
+        await asyncio.sleep(0)
+        self.assertLess(time.time() - start_time, 1.0)
+        self.assertDictEqual(node.get_last_execution_result(), {'remote.attempt': 2})
+        self.assertEqual(node.hedged_attempt_count, 1)
+        self.assertEqual(cancelled_attempts, 1)
+
+    async def test_exhausted_hedge_budget_prevents_hedging(self):
+        hedge_budget = SkymelECGraphNodeHedgeBudget(hedge_budget_ratio=0.0, max_tokens=0.0)
+        policy = SkymelECGraphNodeHedgingPolicy(minimum_timing_samples=1, hedge_budget=hedge_budget)
+
+        async def slow_attempt():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        self.assertEqual(await policy.run(slow_attempt, [1.0]), 'done')
+        self.assertEqual(hedge_budget.hedged_attempt_count, 0)
+        self.assertEqual(hedge_budget.denied_hedge_count, 1)
+
+    async def test_streaming_subroutines_are_neither_hedged_nor_retried(self):
+        call_count = 0
+        received_chunks = []
+
+        async def streaming_subroutine():
+            nonlocal call_count
+            call_count += 1
+            yield 'a'
+            await asyncio.sleep(0.05)
+            yield 'b'
+            raise ConnectionError("stream broken")
+
+        async def consumer_chunk_subroutine(producer_node_id, chunk):
+            received_chunks.append(chunk)
+
+        node = SkymelECGraphNode({
+            'nodeId': 'remote',
+            'nodeOutputNames': ['text'],
+            'nodeSubroutine': streaming_subroutine,
+            'nodeHedgingPolicy': {'hedgeAfterPercentile': 95, 'minimumTimingSamples': 20},
+            'nodeExecutionPolicy': {'maxRetries': 2, 'retryBackoffSeconds': 0.001}
+        })
+        node.get_node_hedging_policy().hedge_budget = SkymelECGraphNodeHedgeBudget(hedge_budget_ratio=0.05)
+        node.execution_timings_milliseconds.extend([1.0] * 20)
+        node.set_streaming_chunk_consumer_nodes([SkymelECGraphNode({
+            'nodeId': 'consumer',
+            'nodeSubroutine': lambda input_values: input_values,
+            'nodeStreamingInputChunkSubroutine': consumer_chunk_subroutine
+        })])
+
+        self.assertTrue(node.is_streaming_subroutine())
+        self.assertFalse(await node.execute(None))
+        self.assertEqual(call_count, 1)
+        self.assertListEqual(received_chunks, ['a', 'b'])
+        self.assertEqual(node.hedged_attempt_count, 0)
+        self.assertEqual(node.execution_retry_count, 0)
@@ -0,0 +1,277 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelApiEndpointMetrics import SkymelApiEndpointMetrics
+from ..skymelApiStubBackend import SkymelApiStubBackend
+from ..skymelECGraphNode import SkymelECGraphNode
+from ..skymelECGraphNodeForDataProcessing import SkymelECGraphNodeForDataProcessing
+from ..skymelECGraphNodeForExternalApiCall import SkymelECGraphNodeForExternalApiCall
+from ..skymelECGraphNodeForFusedDataProcessing import SkymelECGraphNodeForFusedDataProcessing
+from ..skymelEcGraph import SkymelECGraph
+from ..skymelECGraphResourceLimiter import SkymelECGraphResourceLimiter
+from ..skymelHttpClientPool import SkymelHttpClientPool
+from ..skymelWebSocketConnectionManager import SkymelWebSocketConnectionManager
+
+
+def make_linear_chain_graph(number_of_nodes: int) -> SkymelECGraph:
+    graph = SkymelECGraph({'graphId': 'chain', 'externalInputNames': ['external.value']})
+    previous_output_name = 'external.value'
+    for index in range(number_of_nodes):
+        node_id = f'stage{index}'
+
+        async def node_subroutine(input_values, input_name=previous_output_name, output_name=f'{node_id}.value'):
+            return {output_name: input_values[input_name] + 1}
+
+        graph.add_node(SkymelECGraphNode({
+            'nodeId': node_id,
+            'nodeInputNames': [previous_output_name],
+            'nodeOutputNames': ['value'],
+            'nodeSubroutine': node_subroutine
+        }))
+        previous_output_name = f'{node_id}.value'
+    return graph
+
+
+class IncrementingDataProcessingNode(SkymelECGraphNodeForDataProcessing):
+    def process_data(self, input_data):
+        return {f'{self.node_id}.value': input_data[self.node_input_names[0]] + 1}
+
+
+def make_data_processing_chain_graph(number_of_nodes: int) -> SkymelECGraph:
+    graph = SkymelECGraph({'graphId': 'pipeline', 'externalInputNames': ['external.value']})
+    previous_output_name = 'external.value'
+    for index in range(number_of_nodes):
+        graph.add_node(IncrementingDataProcessingNode({
+            'nodeId': f'stage{index}',
+            'nodeInputNames': [previous_output_name],
+            'nodeOutputNames': ['value'],
+            'nodeSubroutine': 'process_data'
+        }))
+        previous_output_name = f'stage{index}.value'
+    return graph
+
+
+class TestSkymelECGraph(IsolatedAsyncioTestCase):
+    async def test_execute_graph_keeps_all_node_results_by_default(self):
+        graph = make_linear_chain_graph(3)
+        self.assertTrue(await graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 0}}))
+        for node_id in ['stage0', 'stage1', 'stage2']:
+            self.assertIsNotNone(graph.get_last_execution_result_from_node(node_id))
+        self.assertDictEqual(graph.get_last_execution_result(), {'chain.stage2.value': 3})
+
+    async def test_execute_graph_releases_intermediate_results_and_retains_leaf_and_requested_outputs(self):
+        graph = make_linear_chain_graph(4)
+        self.assertTrue(await graph.execute_graph({
+            'externalInputNamesToValuesDict': {'external.value': 0},
+            'releaseIntermediateNodeResults': True,
+            'nodeOutputNamesToRetain': ['stage1.value']
+        }))
+        self.assertIsNone(graph.get_last_execution_result_from_node('stage0'))
+        self.assertDictEqual(graph.get_last_execution_result_from_node('stage1'), {'stage1.value': 2})
+        self.assertIsNone(graph.get_last_execution_result_from_node('stage2'))
+        self.assertDictEqual(graph.get_last_execution_result(), {'chain.stage3.value': 4})
+
+    async def test_async_generator_subroutine_streams_chunks_to_streaming_consumers_and_aggregates_result(self):
+        graph = SkymelECGraph({'graphId': 'streaming', 'externalInputNames': ['external.prompt']})
+        received_chunks = []
+
+        async def producer_subroutine(input_values):
+            for token in ['Hello', ', ', 'world']:
+                yield {'producer.text': token}
+
+        async def consumer_chunk_subroutine(producer_node_id, chunk):
+            received_chunks.append((producer_node_id, chunk['producer.text']))
+
+        async def consumer_subroutine(input_values):
+            return {'consumer.length': len(input_values['producer.text'])}
+
+        graph.add_node(SkymelECGraphNode({
+            'nodeId': 'producer',
+            'nodeInputNames': ['external.prompt'],
+            'nodeOutputNames': ['text'],
+            'nodeSubroutine': producer_subroutine
+        }))
+        graph.add_node(SkymelECGraphNode({
+            'nodeId': 'consumer',
+            'nodeInputNames': ['producer.text'],
+            'nodeOutputNames': ['length'],
+            'nodeSubroutine': consumer_subroutine,
+            'nodeStreamingInputChunkSubroutine': consumer_chunk_subroutine
+        }))
+
+        self.assertTrue(await graph.execute_graph({'externalInputNamesToValuesDict': {'external.prompt': 'hi'}}))
+        self.assertListEqual(received_chunks, [('producer', 'Hello'), ('producer', ', '), ('producer', 'world')])
+        self.assertDictEqual(graph.get_last_execution_result_from_node('producer'), {'producer.text': 'Hello, world'})
+        self.assertDictEqual(graph.get_last_execution_result(), {'streaming.consumer.length': 12})
+
+    async def test_resource_tags_cap_concurrent_node_dispatch_across_graph_executions(self):
+        SkymelECGraphResourceLimiter.set_process_wide_resource_capacity('test.cpu', 2)
+        self.addCleanup(SkymelECGraphResourceLimiter.set_process_wide_resource_capacity, 'test.cpu', None)
+        concurrently_running_nodes = 0
+        max_concurrently_running_nodes = 0
+
+        async def node_subroutine(input_values):
+            nonlocal concurrently_running_nodes, max_concurrently_running_nodes
+            concurrently_running_nodes += 1
+            max_concurrently_running_nodes = max(max_concurrently_running_nodes, concurrently_running_nodes)
+            await asyncio.sleep(0.01)
+            concurrently_running_nodes -= 1
+            return {'worker.done': True}
+
+        graphs = []
+        for _ in range(6):
+            graph = SkymelECGraph({'graphId': 'limited', 'externalInputNames': ['external.value']})
+            graph.add_node(SkymelECGraphNode({
+                'nodeId': 'worker',
+                'nodeInputNames': ['external.value'],
+                'nodeOutputNames': ['done'],
+                'nodeSubroutine': node_subroutine,
+                'resources': {'test.cpu': 1}
+            }))
+            graphs.append(graph)
+
+        execution_statuses = await asyncio.gather(
+            *[graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 1}}) for graph in graphs])
+        self.assertListEqual(execution_statuses, [True] * 6)
+        self.assertEqual(max_concurrently_running_nodes, 2)
+        self.assertEqual(SkymelECGraphResourceLimiter.get_process_wide_limiter().get_units_in_use('test.cpu'), 0)
+
+    async def test_graph_scoped_resource_capacities_bound_concurrent_executions_of_graph_clones(self):
+        concurrently_running_nodes = 0
+        max_concurrently_running_nodes = 0
+
+        async def node_subroutine(input_values):
+            nonlocal concurrently_running_nodes, max_concurrently_running_nodes
+            concurrently_running_nodes += 1
+            max_concurrently_running_nodes = max(max_concurrently_running_nodes, concurrently_running_nodes)
+            await asyncio.sleep(0.01)
+            concurrently_running_nodes -= 1
+            return {'worker.done': True}
+
+        template_graph = SkymelECGraph({'graphId': 'limited', 'externalInputNames': ['external.value'],
+                                        'resourceCapacities': {'test.gpu': 3}})
+        template_graph.add_node(SkymelECGraphNode({
+            'nodeId': 'worker',
+            'nodeInputNames': ['external.value'],
+            'nodeOutputNames': ['done'],
+            'nodeSubroutine': node_subroutine,
+            'resources': {'test.gpu': 1}
+        }))
+        graphs = [template_graph.clone() for _ in range(8)]
+        self.assertIs(graphs[0].get_resource_limiter(), template_graph.get_resource_limiter())
+
+        execution_statuses = await asyncio.gather(
+            *[graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 1}}) for graph in graphs])
+        self.assertListEqual(execution_statuses, [True] * 8)
+        self.assertEqual(max_concurrently_running_nodes, 3)
+        self.assertEqual(template_graph.get_resource_limiter().get_units_in_use('test.gpu'), 0)
+
+    async def test_execute_graph_fuses_data_processing_node_chains_with_the_same_result(self):
+        unfused_graph = make_data_processing_chain_graph(4)
+        self.assertTrue(await unfused_graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 0}}))
+
+        graph = make_data_processing_chain_graph(4)
+        stage_nodes = [graph.get_node_by_id(f'stage{index}') for index in range(4)]
+        self.assertTrue(await graph.execute_graph({
+            'externalInputNamesToValuesDict': {'external.value': 0},
+            'fuseDataProcessingNodeChains': True,
+            'nodeOutputNamesToRetain': ['stage1.value']
+        }))
+
+        # The graph keeps its nodes; the fused chains only replace them for the execution
+        self.assertListEqual(sorted(graph.get_list_of_all_node_ids()), ['stage0', 'stage1', 'stage2', 'stage3'])
+        self.assertListEqual([graph.get_node_by_id(f'stage{index}') for index in range(4)], stage_nodes)
+        fused_node_id_to_object = graph.get_fused_node_id_to_object({'stage1'})
+        self.assertListEqual(sorted(fused_node_id_to_object.keys()), ['stage1', 'stage3'])
+        fused_node = fused_node_id_to_object['stage3']
+        self.assertIsInstance(fused_node, SkymelECGraphNodeForFusedDataProcessing)
+        self.assertListEqual(fused_node.get_stage_nodes(), stage_nodes[2:])
+        self.assertEqual(graph.get_last_execution_result()['pipeline.stage3.value'],
+                         unfused_graph.get_last_execution_result()['pipeline.stage3.value'])
+        self.assertEqual(graph.get_last_execution_result_from_node('stage1')['stage1.value'], 2)
+        self.assertListEqual(sorted(fused_node.get_last_stage_timings_milliseconds().keys()), ['stage2', 'stage3'])
+        for stage_node in stage_nodes:
+            self.assertEqual(stage_node.processed_data_count, 1)
+            self.assertEqual(len(stage_node.execution_timings_milliseconds), 1)
+
+    async def test_fused_stages_validate_their_own_input_schemas(self):
+        graph = make_data_processing_chain_graph(3)
+        graph.add_node(IncrementingDataProcessingNode({
+            'nodeId': 'stage2',
+            'nodeInputNames': ['stage1.value'],
+            'nodeOutputNames': ['value'],
+            'nodeSubroutine': 'process_data',
+            'dataProcessingConfig': {'inputSchema': {'stage1.value': {'type': 'str'}}}
+        }))
+        self.assertListEqual(graph.fuse_data_processing_node_chains(), ['stage2'])
+        self.assertListEqual(graph.get_list_of_all_node_ids(), ['stage2'])
+
+        self.assertFalse(await graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 0}}))
+        last_stage_node = graph.get_node_by_id('stage2').get_stage_nodes()[2]
+        self.assertEqual(last_stage_node.get_last_input_validation_errors()[0]['input_name'], 'stage1.value')
+
+    async def test_warm_up_opens_endpoint_connections_and_runs_node_warm_up_subroutines(self):
+        warmed_up_node_ids = []
+
+        async def warm_up_subroutine():
+            warmed_up_node_ids.append('local')
+
+        SkymelApiEndpointMetrics.reset_all_endpoint_metrics()
+        try:
+            async with SkymelApiStubBackend(latency_ms=1) as stub_backend:
+                graph = SkymelECGraph({'graphId': 'warm', 'externalInputNames': ['external.value']})
+                http_nodes = [SkymelECGraphNodeForExternalApiCall({
+                    'nodeId': f'http{index}',
+                    'nodeInputNames': ['external.value'],
+                    'nodeSubroutine': 'process_data',
+                    'endpointUrl': f"{stub_backend.base_url}/json",
+                    'warmUpConfig': {'connectionCount': 2}
+                }) for index in range(2)]
+                websocket_node = SkymelECGraphNodeForExternalApiCall({
+                    'nodeId': 'socket',
+                    'nodeInputNames': ['external.value'],
+                    'nodeSubroutine': 'process_data',
+                    'endpointUrl': f"{stub_backend.base_url}/ws",
+                    'isEndpointWebSocketUrl': True,
+                    'usePersistentWebSocketConnection': True
+                })
+                for node in http_nodes + [websocket_node]:
+                    graph.add_node(node)
+                graph.add_node(SkymelECGraphNode({
+                    'nodeId': 'local',
+                    'nodeInputNames': ['external.value'],
+                    'nodeSubroutine': lambda input_values: {'local.defaultOutput': input_values['external.value']},
+                    'nodeWarmUpSubroutine': warm_up_subroutine
+                }))
+
+                self.assertTrue(await graph.warm_up())
+                self.assertListEqual(warmed_up_node_ids, ['local'])
+                self.assertListEqual(await asyncio.gather(*[node.execute(graph, {'external.value': index})
+                                                            for index, node in enumerate(http_nodes + [websocket_node])]),
+                                     [True] * 3)
+
+                # Every call found its connection already open
+                for node in [http_nodes[0], websocket_node]:
+                    endpoint_statistics = node.get_endpoint_metrics().get_endpoint_statistics()
+                    self.assertEqual(endpoint_statistics['connection_create_count'], 0)
+                    self.assertEqual(endpoint_statistics['connection_reuse_count'], endpoint_statistics['call_count'])
+                self.assertEqual(http_nodes[0].get_endpoint_metrics().call_count, 2)
+        finally:
+            await SkymelHttpClientPool.close_process_wide_pool()
+            await SkymelWebSocketConnectionManager.close_process_wide_manager()
+            SkymelApiEndpointMetrics.reset_all_endpoint_metrics()
+
+    async def test_warm_up_reports_failing_nodes(self):
+        def failing_warm_up_subroutine():
+            raise RuntimeError("model file missing")
+
+        graph = SkymelECGraph({'graphId': 'warm', 'externalInputNames': ['external.value']})
+        node = SkymelECGraphNode({
+            'nodeId': 'local',
+            'nodeInputNames': ['external.value'],
+            'nodeSubroutine': lambda input_values: {},
+            'nodeWarmUpSubroutine': failing_warm_up_subroutine
+        })
+        graph.add_node(node)
+        self.assertFalse(await graph.warm_up())
+        self.assertListEqual(node.get_logged_node_errors(), ["Warm-up of node local failed: model file missing"])
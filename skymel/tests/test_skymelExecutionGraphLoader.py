@@ -0,0 +1,76 @@
+from unittest import IsolatedAsyncioTestCase
+
+from ..skymelApiStubBackend import SkymelApiStubBackend
+from ..skymelECGraphNode import SkymelECGraphNode
+from ..skymelExecutionGraphLoader import SkymelExecutionGraphLoader
+from ..skymelHttpClientPool import SkymelHttpClientPool
+
+
+def make_graph_json(endpoint_url: str) -> dict:
+    return {
+        'graphType': 'base',
+        'graphInitializationConfig': {'graphId': 'workflow', 'externalInputNames': ['external.value'],
+                                      'httpClientPoolConfig': {'limitPerHost': 4}},
+        'children': [{
+            'nodeType': 'externalApiCaller',
+            'nodeInitializationConfig': {
+                'nodeId': 'echo',
+                'nodeInputNames': ['external.value'],
+                'nodeOutputNames': ['echo'],
+                'nodeSubroutine': 'process_data',
+                'endpointUrl': endpoint_url,
+                'nodeInputNameToBackendInputNameMap': {'external.value': 'value'},
+                'maxRetries': 0
+            }
+        }]
+    }
+
+
+class TestSkymelExecutionGraphLoader(IsolatedAsyncioTestCase):
+    def setUp(self):
+        SkymelExecutionGraphLoader.clear_graph_template_cache()
+
+    def tearDown(self):
+        SkymelExecutionGraphLoader.clear_graph_template_cache()
+
+    async def asyncTearDown(self):
+        await SkymelHttpClientPool.close_process_wide_pool()
+
+    async def test_template_cache_returns_independent_clones_of_one_template(self):
+        async with SkymelApiStubBackend(latency_ms=1) as stub_backend:
+            graph_json = make_graph_json(f"{stub_backend.base_url}/json")
+            first_graph = SkymelExecutionGraphLoader.load_graph_from_json_object(graph_json, use_template_cache=True)
+            # Key order does not matter, and the template is not affected by later changes to the caller's object
+            reordered_graph_json = dict(reversed(list(make_graph_json(f"{stub_backend.base_url}/json").items())))
+            graph_json['children'][0]['nodeInitializationConfig']['endpointUrl'] = 'http://invalid.invalid/json'
+            second_graph = SkymelExecutionGraphLoader.load_graph_from_json_object(reordered_graph_json,
+                                                                                  use_template_cache=True)
+            self.assertEqual(SkymelExecutionGraphLoader.graph_template_cache_miss_count, 1)
+            self.assertEqual(SkymelExecutionGraphLoader.graph_template_cache_hit_count, 1)
+
+            first_node = first_graph.get_node_by_id('echo')
+            second_node = second_graph.get_node_by_id('echo')
+            self.assertIsNot(first_node, second_node)
+            self.assertIs(first_node.node_input_name_to_backend_input_name_map,
+                          second_node.node_input_name_to_backend_input_name_map)
+            self.assertIsNot(first_graph.get_http_client_pool(), second_graph.get_http_client_pool())
+
+            self.assertTrue(await first_graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 1}}))
+            self.assertTrue(await second_graph.execute_graph({'externalInputNamesToValuesDict': {'external.value': 2}}))
+            self.assertDictEqual(first_node.get_last_execution_result()['echo'], {'value': 1})
+            self.assertDictEqual(second_node.get_last_execution_result()['echo'], {'value': 2})
+            self.assertEqual(first_node.get_api_statistics()['api_call_count'], 1)
+            self.assertEqual(len(first_node.execution_timings_milliseconds), 1)
+            await first_graph.dispose()
+            await second_graph.dispose()
+
+    def test_configurations_with_callables_are_loaded_without_the_cache(self):
+        graph_json = {
+            'graphType': 'base',
+            'graphInitializationConfig': {'graphId': 'local'},
+            'children': [{'nodeType': 'base', 'nodeInitializationConfig': {
+                'nodeId': 'constant', 'nodeSubroutine': lambda: {'constant.defaultOutput': 1}}}]
+        }
+        graph = SkymelExecutionGraphLoader.load_graph_from_json_object(graph_json, use_template_cache=True)
+        self.assertIsInstance(graph.get_node_by_id('constant'), SkymelECGraphNode)
+        self.assertEqual(SkymelExecutionGraphLoader.graph_template_cache_miss_count, 0)
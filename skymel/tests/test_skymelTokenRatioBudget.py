@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from ..skymelApiRetryBudget import SkymelApiRetryBudget
+from ..skymelECGraphNodeHedgingPolicy import SkymelECGraphNodeHedgeBudget
+from ..skymelTokenRatioBudget import SkymelTokenRatioBudget
+
+
+class TestSkymelTokenRatioBudget(TestCase):
+    def test_extra_work_is_capped_to_the_ratio_of_regular_work(self):
+        budget = SkymelTokenRatioBudget(budget_ratio=0.5, max_tokens=1.0)
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        budget.deposit()
+        self.assertFalse(budget.try_spend())
+        budget.deposit()
+        self.assertTrue(budget.try_spend())
+        self.assertEqual(budget.spent_token_count, 2)
+        self.assertEqual(budget.denied_spend_count, 2)
+
+    def test_retry_and_hedge_budgets_share_the_implementation_but_not_the_process_wide_budget(self):
+        retry_budget = SkymelApiRetryBudget.get_process_wide_budget()
+        hedge_budget = SkymelECGraphNodeHedgeBudget.get_process_wide_budget()
+        self.assertIsInstance(retry_budget, SkymelApiRetryBudget)
+        self.assertIsInstance(hedge_budget, SkymelECGraphNodeHedgeBudget)
+        self.assertIs(SkymelApiRetryBudget.get_process_wide_budget(), retry_budget)
+        self.assertEqual(retry_budget.retry_budget_ratio, 0.1)
+        self.assertEqual(hedge_budget.hedge_budget_ratio, 0.05)
+
+        retry_budget = SkymelApiRetryBudget(retry_budget_ratio=0.0, max_tokens=1.0)
+        self.assertTrue(retry_budget.try_spend_retry())
+        self.assertFalse(retry_budget.try_spend_retry())
+        self.assertEqual((retry_budget.retry_count, retry_budget.denied_retry_count), (1, 1))